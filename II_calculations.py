@@ -1,5 +1,23 @@
 from borehole_class import Borehole
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from function_for_II_calculations import kh,ki,kmui
+from stress_engine import ki_analytic
+
+# Способы вычисления k_i: таблица 7.7 или интегрирование решения Буссинеска
+KI_ENGINES = {"table": ki, "analytic": ki_analytic}
+# способы, которые принимают массив глубин и считают его одним вызовом
+KI_VECTORISED = {"analytic"}
+
+
+def ki_engine(engine: str):
+    try:
+        return KI_ENGINES[engine]
+    except KeyError:
+        allowed = ", ".join(KI_ENGINES)
+        raise ValueError(f"Неизвестный способ расчёта k_i: {engine!r}. Допустимо: {allowed}") from None
 
 
 def full_displacment(sth: float, sp: float) -> float:
@@ -12,85 +30,190 @@ def disp_sth(borehole: Borehole, Hc: float, H:float) -> float:
     Суммарная толщина слоёв в пределах глубины Hc (от устья вниз).
     Если Hc > общей мощности, берём всю скважину.
     """
+    return sum(sth_layers(borehole=borehole, Hc=Hc, H=H), 0.0)
+
+
+def sth_layers(borehole: Borehole, Hc: float, H: float) -> List[float]:
+    """Вклад каждого слоя скважины в sth (0 для слоёв вне зоны оттаивания)."""
     if Hc < 0:
         raise ValueError("Hc должно быть ≥ 0.")
 
-    sth = 0.0
+    out = [0.0] * len(borehole.layers)
     remaining = Hc
     sigmai=0
     curenztop =borehole.z_top
 
-    for layer in borehole.layers:  # порядок = нумерация: 0-й, 1-й, 2-й...
+    for i, layer in enumerate(borehole.layers):  # порядок = нумерация: 0-й, 1-й, 2-й...
         if remaining <= 0:
             break
-        curenzbottom =curenztop- layer.thickness
-        if curenzbottom>=H:
-            sigmai += layer.soil.gamma_kNm3*layer.thickness
-            curenztop = curenzbottom
-            continue
-        take = min(layer.thickness, remaining)  # часть слоя, попадающая в Hc
-        if  H<curenztop:
-            sigmai += layer.soil.gamma_kNm3*(curenztop-H)
-            take -= curenztop-H
+        out[i], remaining, sigmai, curenztop = sth_step(
+            layer.soil, layer.thickness, H, remaining, sigmai, curenztop
+        )
 
-        sigmai += take / 2 * layer.soil.gamma_kNm3
-        sth += take*(layer.soil.Ath+layer.soil.mth*sigmai)
-        remaining -= take
-        curenztop = curenzbottom
-        sigmai += take / 2 * layer.soil.gamma_kNm3
+    return out
 
 
-    return sth
+def sth_step(
+    soil, thickness: float, H: float, remaining: float, sigmai: float, curenztop: float
+) -> Tuple[float, float, float, float]:
+    """Один слой в расчёте sth.
 
+    Принимает состояние перед слоем (остаток Hc, напряжение sigmai, отметка
+    верха слоя) и возвращает вклад слоя и состояние после него.
+    """
+    return sth_step_partials(soil, thickness, H, remaining, sigmai, curenztop)[:4]
 
-def disp_sp(borehole: Borehole, F: float, a: float, b: float, Hc: float, H: float) -> float:
-    sp = 0.0
 
-    # Целевая «сжимаемая» зона по абсолютным отметкам: от H - Hc (ниже) до H (подошва)
-    target_bottom = H - Hc   # более низкая (более «глубокая», численно меньше при оси z вверх)
-    target_top = H           # подошва фундамента
+def sth_step_partials(
+    soil, thickness: float, H: float, remaining: float, sigmai: float, curenztop: float
+) -> Tuple[float, float, float, float, Tuple[float, float, float, float]]:
+    """``sth_step`` и частные производные для слоя.
 
-    curenztop = borehole.z_top  # верх первой толщи по абсолютной отметке
-
-    for layer in borehole.layers:  # 0-й, 1-й, 2-й...
-        curenzbottom = curenztop - layer.thickness  # вниз по z
+    Пятый элемент — (∂вклада/∂Ath, ∂вклада/∂mth, pre, post), где pre и
+    post — толщины слоя, вес которых входит в sigmai середины самого слоя
+    и в sigmai всех слоёв ниже.
+    """
+    curenzbottom =curenztop- thickness
+    if curenzbottom>=H:
+        sigmai += soil.gamma_kNm3*thickness
+        return 0.0, remaining, sigmai, curenzbottom, (0.0, 0.0, 0.0, thickness)
+    take = min(thickness, remaining)  # часть слоя, попадающая в Hc
+    above = 0.0
+    if  H<curenztop:
+        above = curenztop-H
+        sigmai += soil.gamma_kNm3*above
+        take -= above
+
+    sigmai += take / 2 * soil.gamma_kNm3
+    value = take*(soil.Ath+soil.mth*sigmai)
+    partials = (take, take * sigmai, above + take / 2, above + take)
+    remaining -= take
+    sigmai += take / 2 * soil.gamma_kNm3
+    return value, remaining, sigmai, curenzbottom, partials
+
+
+def disp_sp(
+    borehole: Borehole, F: float, a: float, b: float, Hc: float, H: float, engine: str = "table"
+) -> float:
+    terms, p0, khcalc = sp_terms(borehole, F=F, a=a, b=b, Hc=Hc, H=H, engine=engine)
+    return sum(terms, 0.0) * p0 * b * khcalc
+
+
+def sp_terms(
+    borehole: Borehole, F: float, a: float, b: float, Hc: float, H: float, engine: str = "table"
+) -> Tuple[List[float], float, float]:
+    """Послойные слагаемые sp без множителя p0·b·kh, а также p0 и kh."""
+    ki_func = ki_engine(engine)
+    terms = [0.0] * len(borehole.layers)
+
+    # Сначала отрезки слоёв в зоне, затем k_i сразу на всех их границах
+    segments = sp_segments(borehole, Hc=Hc, H=H)
+    ki_at = ki_values(engine, ki_func, a, b, [d for _, _, depths in segments for d in depths])
+    for i, soil, (d_top, d_bottom) in segments:
+        kmuicalc = segment_kmui(soil, d_top, d_bottom, b)
+        terms[i] = sp_term(soil, kmuicalc, ki_at[d_top], ki_at[d_bottom])
 
-        # Пересечение слоя [curenzbottom, curenztop] с зоной [target_bottom, target_top]
-        overlap_top = min(curenztop, target_top)
-        overlap_bottom = max(curenzbottom, target_bottom)
-        take = overlap_top - overlap_bottom  # толщина части слоя, попавшей в Hc (>=0, если есть пересечение)
+    # Нагрузка и коэффициент kh по полной Hc от подошвы
+    p0 = F / (a * b)
+    khcalc = kh(z=Hc, b=b)
+    return terms, p0, khcalc
 
-        if take > 1e-12:
-            # Глубины от подошвы (0 на отметке H, положительно вниз)
-            d_top = H - overlap_top         # верх отрезка в глубинах
-            d_bottom = H - overlap_bottom   # низ отрезка в глубинах
-            d_mid = 0.5 * (d_top + d_bottom)
 
-            # Коэффициенты: ki — перв/послед на границах, kmui — в середине
-            kmuicalc = kmui(z=d_mid, b=b, soil_type=layer.soil.soil_type.value)
-            ki_top = ki(a=a, b=b, z=d_top)
-            ki_bottom = ki(a=a, b=b, z=d_bottom)
+def sp_segments(
+    borehole: Borehole, Hc: float, H: float
+) -> List[Tuple[int, object, Tuple[float, float]]]:
+    """Отрезки слоёв в сжимаемой зоне: (номер слоя, грунт, (глубина верха, глубина низа))."""
+    # Целевая «сжимаемая» зона по абсолютным отметкам: от H - Hc (ниже) до H (подошва)
+    target_bottom = H - Hc   # более низкая (более «глубокая», численно меньше при оси z вверх)
 
-            sp += layer.soil.mth * kmuicalc * (ki_bottom - ki_top)
+    curenztop = borehole.z_top  # верх первой толщи по абсолютной отметке
 
-        # Переходим к следующему слою
-        curenztop = curenzbottom
+    segments = []
+    for i, layer in enumerate(borehole.layers):  # 0-й, 1-й, 2-й...
+        depths, curenztop = sp_segment(layer.thickness, curenztop, H, target_bottom)
+        if depths is not None:
+            segments.append((i, layer.soil, depths))
 
         # Оптимизация: если уже прошли ниже target_bottom, дальше пересечений не будет
         if curenztop <= target_bottom:
             break
+    return segments
 
-    # Нагрузка и коэффициент kh по полной Hc от подошвы
-    p0 = F / (a * b)
-    khcalc = kh(z=Hc, b=b)
-    sp = sp * p0 * b * khcalc
-    return sp
 
+def ki_values(engine: str, ki_func, a: float, b: float, depths: List[float]) -> Dict[float, float]:
+    """k_i на глубинах ``depths`` (словарь глубина → k_i).
+
+    Граница слоя общая у соседних отрезков, поэтому каждая глубина
+    считается один раз; векторные способы — одним вызовом на все глубины.
+    """
+    unique = list(dict.fromkeys(depths))
+    if engine in KI_VECTORISED:
+        return dict(zip(unique, ki_func(a, b, np.asarray(unique, dtype=float)).tolist()))
+    return {z: ki_func(a=a, b=b, z=z) for z in unique}
 
 
-def disp_calculation(borehole: Borehole, Hc: float,H: float,F: float, a: float, b: float) -> float:
+def sp_segment(
+    thickness: float, curenztop: float, H: float, target_bottom: float
+) -> Tuple[Optional[Tuple[float, float]], float]:
+    """Глубины (от подошвы) верха и низа части слоя в сжимаемой зоне и отметка низа слоя.
+
+    Если слой не пересекает зону, вместо глубин возвращается None.
+    """
+    target_top = H           # подошва фундамента
+    curenzbottom = curenztop - thickness  # вниз по z
+
+    # Пересечение слоя [curenzbottom, curenztop] с зоной [target_bottom, target_top]
+    overlap_top = min(curenztop, target_top)
+    overlap_bottom = max(curenzbottom, target_bottom)
+    take = overlap_top - overlap_bottom  # толщина части слоя, попавшей в Hc (>=0, если есть пересечение)
+
+    if take <= 1e-12:
+        return None, curenzbottom
+
+    # Глубины от подошвы (0 на отметке H, положительно вниз)
+    d_top = H - overlap_top         # верх отрезка в глубинах
+    d_bottom = H - overlap_bottom   # низ отрезка в глубинах
+    return (d_top, d_bottom), curenzbottom
+
+
+def segment_kmui(soil, d_top: float, d_bottom: float, b: float) -> float:
+    """kmui отрезка слоя — в его середине."""
+    d_mid = 0.5 * (d_top + d_bottom)
+    return kmui(z=d_mid, b=b, soil_type=soil.soil_type.value)
+
+
+def sp_term(soil, kmuicalc: float, ki_top: float, ki_bottom: float) -> float:
+    """Слагаемое sp отрезка слоя по kmui и k_i на его границах."""
+    return soil.mth * kmuicalc * (ki_bottom - ki_top)
+
+
+def sp_step(
+    soil,
+    thickness: float,
+    curenztop: float,
+    a: float,
+    b: float,
+    H: float,
+    target_bottom: float,
+    ki_func=ki,
+) -> Tuple[float, float]:
+    """Слагаемое sp для одного слоя и отметка низа слоя."""
+    depths, curenzbottom = sp_segment(thickness, curenztop, H, target_bottom)
+    if depths is None:
+        return 0.0, curenzbottom
+    d_top, d_bottom = depths
+    ki_top = ki_func(a=a, b=b, z=d_top)
+    ki_bottom = ki_func(a=a, b=b, z=d_bottom)
+    kmuicalc = segment_kmui(soil, d_top, d_bottom, b)
+    return sp_term(soil, kmuicalc, ki_top, ki_bottom), curenzbottom
+
+
+
+def disp_calculation(
+    borehole: Borehole, Hc: float,H: float,F: float, a: float, b: float, engine: str = "table"
+) -> float:
     sth=disp_sth(borehole=borehole,Hc=Hc, H=H)
-    sp=disp_sp(borehole=borehole, F=F, a=a, b=b,Hc=Hc,H=H)
+    sp=disp_sp(borehole=borehole, F=F, a=a, b=b,Hc=Hc,H=H, engine=engine)
     print(sth, sp)
     s= full_displacment(sth, sp)
     return s
\ No newline at end of file
@@ -124,3 +124,36 @@ class Table2D:
         v0 = self._interp1d(rg, col0, row_key, clamp=clamp)
         v1 = self._interp1d(rg, col1, row_key, clamp=clamp)
         return v0 + t * (v1 - v0)
+
+    def lookup_grad(self, row_key: Number, col_key: Number, *, clamp: bool=True) -> Tuple[Number, Number, Number]:
+        """
+        Билинейная интерполяция вместе с частными производными.
+        Возвращает (значение, d/d row_key, d/d col_key). Внутри ячейки
+        интерполянт линеен по каждой оси, поэтому производные точные;
+        на узлах берётся наклон левой ячейки, за краями сетки (clamp) — 0.
+        """
+        rg, cg, V = self.row_grid, self.col_grid, self.values
+
+        if col_key <= cg[0]:
+            j0, j1, t, dt = 0, 0, 0.0, 0.0
+        elif col_key >= cg[-1]:
+            j0, j1, t, dt = len(cg)-1, len(cg)-1, 0.0, 0.0
+        else:
+            j1 = bisect_left(cg, col_key)
+            j0 = j1 - 1
+            c0, c1 = cg[j0], cg[j1]
+            t = 0.0 if c1 == c0 else (col_key - c0) / (c1 - c0)
+            dt = 0.0 if c1 == c0 else 1.0 / (c1 - c0)
+
+        def interp_grad(j: int) -> Tuple[Number, Number]:
+            column = [V[i][j] for i in range(len(rg))]
+            value = self._interp1d(rg, column, row_key, clamp=clamp)
+            if row_key <= rg[0] or row_key >= rg[-1]:
+                return value, 0.0
+            i = bisect_left(rg, row_key)
+            x0, x1 = rg[i-1], rg[i]
+            return value, 0.0 if x1 == x0 else (column[i] - column[i-1]) / (x1 - x0)
+
+        v0, d0 = interp_grad(j0)
+        v1, d1 = interp_grad(j1)
+        return v0 + t * (v1 - v0), d0 + t * (d1 - d0), dt * (v1 - v0)
@@ -0,0 +1,184 @@
+"""Потоковый импорт грунтов и скважин из CSV.
+
+Файлы читаются построчно через ``csv.reader``: в памяти одновременно
+находятся только текущая строка и собираемая скважина.  Разделитель
+(``;``, ``,`` или табуляция) определяется по заголовку; при разделителе,
+отличном от запятой, допускается десятичная запятая.
+
+Грунты (``iter_soils``) — столбцы ``code, name, soil_type, rho, Ath, mth``;
+тип задаётся именем (``LOAM``) или значением (``суглинки``) ``SoilType``.
+
+Слои (``iter_boreholes``) — столбцы ``borehole, z_top, soil, thickness``;
+слои одной скважины идут подряд сверху вниз, ``z_top`` повторяется в
+каждой строке скважины.
+
+Ошибки формата сообщаются ``CsvImportError`` с номером строки файла.
+"""
+from __future__ import annotations
+
+import csv
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from borehole_class import Borehole, SoilLike
+from grunt_class import PermafrostSoil, SoilType
+
+SOIL_COLUMNS: Tuple[str, ...] = ("code", "name", "soil_type", "rho", "Ath", "mth")
+LAYER_COLUMNS: Tuple[str, ...] = ("borehole", "z_top", "soil", "thickness")
+
+_SOIL_TYPES: Dict[str, SoilType] = {}
+for _st in SoilType:
+    _SOIL_TYPES[_st.name.casefold()] = _st
+    _SOIL_TYPES[_st.value.casefold()] = _st
+
+
+class CsvImportError(ValueError):
+    """Ошибка в строке импортируемого файла."""
+
+    def __init__(self, path: str, line: int, message: str) -> None:
+        super().__init__(f"{path}, строка {line}: {message}")
+        self.path = path
+        self.line = line
+
+
+def _detect_delimiter(header: str) -> str:
+    for delimiter in (";", "\t", ","):
+        if delimiter in header:
+            return delimiter
+    return ","
+
+
+def _rows(
+    path: str, columns: Sequence[str], required: Sequence[str]
+) -> Iterator[Tuple[int, List[str], List[int], bool]]:
+    """Строки файла: (номер строки, поля, индексы столбцов, десятичная запятая)."""
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        first = fh.readline()
+        delimiter = _detect_delimiter(first)
+        header = next(csv.reader([first], delimiter=delimiter), [])
+        header = [name.strip().casefold() for name in header]
+        indices: List[int] = []
+        for name in columns:
+            key = name.casefold()
+            if key in header:
+                indices.append(header.index(key))
+            elif name in required:
+                raise CsvImportError(path, 1, f"нет столбца {name!r}")
+            else:
+                indices.append(-1)
+        decimal_comma = delimiter != ","
+        reader = csv.reader(fh, delimiter=delimiter)
+        for row in reader:
+            if not row or not any(row):
+                continue
+            # reader.line_num считает строки после заголовка
+            yield reader.line_num + 1, row, indices, decimal_comma
+
+
+def _field(row: List[str], index: int) -> str:
+    if index < 0 or index >= len(row):
+        return ""
+    return row[index].strip()
+
+
+def _number(path: str, line: int, name: str, text: str, decimal_comma: bool) -> float:
+    if decimal_comma:
+        text = text.replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        if not text:
+            raise CsvImportError(path, line, f"не задано значение {name}") from None
+        raise CsvImportError(path, line, f"{name}: ожидалось число, получено {text!r}") from None
+
+
+def iter_soils(path: str) -> Iterator[PermafrostSoil]:
+    """Грунты из файла по мере чтения; повторы кода отбрасываются.
+
+    Повтор с теми же параметрами пропускается, с другими — считается
+    ошибкой.
+    """
+    seen: Dict[str, Tuple[PermafrostSoil, int]] = {}
+    for line, row, idx, decimal_comma in _rows(path, SOIL_COLUMNS, SOIL_COLUMNS[:4]):
+        code = _field(row, idx[0])
+        type_text = _field(row, idx[2])
+        soil_type = _SOIL_TYPES.get(type_text.casefold())
+        if soil_type is None:
+            raise CsvImportError(path, line, f"неизвестный тип грунта {type_text!r}")
+        rho = _number(path, line, "rho", _field(row, idx[3]), decimal_comma)
+        Ath_text = _field(row, idx[4])
+        mth_text = _field(row, idx[5])
+        try:
+            soil = PermafrostSoil(
+                code=code,
+                name=_field(row, idx[1]),
+                soil_type=soil_type,
+                rho=rho,
+                Ath=_number(path, line, "Ath", Ath_text, decimal_comma) if Ath_text else None,
+                mth=_number(path, line, "mth", mth_text, decimal_comma) if mth_text else None,
+            )
+        except CsvImportError:
+            raise
+        except ValueError as exc:
+            raise CsvImportError(path, line, str(exc)) from None
+        previous = seen.get(code)
+        if previous is not None:
+            if previous[0] != soil:
+                raise CsvImportError(
+                    path, line, f"грунт {code!r} уже задан в строке {previous[1]} с другими параметрами"
+                )
+            continue
+        seen[code] = (soil, line)
+        yield soil
+
+
+def iter_boreholes(path: str, soils: Mapping[str, SoilLike]) -> Iterator[Borehole]:
+    """Скважины из файла слоёв; каждая выдаётся, как только прочитана целиком."""
+    current: Optional[Borehole] = None
+    finished = set()
+    for line, row, idx, decimal_comma in _rows(path, LAYER_COLUMNS, LAYER_COLUMNS):
+        code = _field(row, idx[0])
+        if not code:
+            raise CsvImportError(path, line, "не задан код скважины")
+        z_top = _number(path, line, "z_top", _field(row, idx[1]), decimal_comma)
+        if current is None or current.code != code:
+            if current is not None:
+                finished.add(current.code)
+                yield current
+            if code in finished:
+                raise CsvImportError(path, line, f"слои скважины {code!r} должны идти подряд")
+            current = Borehole(code=code, z_top=z_top)
+        elif z_top != current.z_top:
+            raise CsvImportError(
+                path, line, f"z_top скважины {code!r} отличается от заданного ранее ({current.z_top:g})"
+            )
+        soil_code = _field(row, idx[2])
+        soil = soils.get(soil_code)
+        if soil is None:
+            raise CsvImportError(path, line, f"неизвестный грунт {soil_code!r}")
+        thickness = _number(path, line, "thickness", _field(row, idx[3]), decimal_comma)
+        try:
+            current.add(soil, thickness)
+        except ValueError as exc:
+            raise CsvImportError(path, line, str(exc)) from None
+    if current is not None:
+        yield current
+
+
+def import_soils(path: str, manager) -> int:
+    """Загружает грунты в ``SoilManager`` одним пакетом; возвращает их число."""
+    soils = list(iter_soils(path))
+    manager.add_many(soils)
+    return len(soils)
+
+
+def find_borehole(
+    path: str, soils: Mapping[str, SoilLike], code: Optional[str] = None
+) -> Optional[Borehole]:
+    """Первая скважина с кодом ``code`` (или первая в файле).
+
+    Чтение прекращается, как только скважина найдена.
+    """
+    for borehole in iter_boreholes(path, soils):
+        if code is None or borehole.code == code:
+            return borehole
+    return None
@@ -0,0 +1,196 @@
+"""Осадки группы фундаментов с учётом влияния соседей.
+
+Каждый фундамент считается как одиночный (``disp_sth`` + ``disp_sp``), а
+затем к его ``sp`` добавляется вклад соседних фундаментов: дополнительное
+напряжение по вертикали под центром фундамента от нагрузки соседа
+находится методом угловых точек (``stress_engine``) и интегрируется по тем
+же слоям сжимаемой зоны, что и собственное ``sp``.
+
+Соседи ищутся по равномерной сетке с шагом, равным радиусу влияния:
+для фундамента просматриваются только 3×3 ячейки вокруг него, поэтому
+затраты растут как O(n·k), где k — среднее число соседей, а не O(n²).
+Вклад всех пар по всем границам слоёв считается векторно порциями.
+
+Фундаменты ориентированы по осям: сторона ``a`` вдоль X, ``b`` вдоль Y.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from borehole_class import Borehole
+from function_for_II_calculations import kh, kmui
+from prefix_cache import PrefixEngine
+from stress_engine import corner_stress_integral
+
+
+@dataclass(slots=True, kw_only=True)
+class Footing:
+    """Фундамент a×b с центром в точке (x, y) плана."""
+
+    x: float
+    y: float
+    a: float
+    b: float
+    F: float
+    borehole: Borehole
+    H: float
+    Hc: float
+    name: str = ""
+
+
+@dataclass(slots=True)
+class GroupResult:
+    own: np.ndarray          # осадка одиночного фундамента
+    added: np.ndarray        # добавка sp от соседей
+    neighbours: np.ndarray   # число соседей в радиусе влияния
+    pairs: int               # число учтённых пар
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.own + self.added
+
+
+def _profile(footing: Footing) -> Tuple[np.ndarray, np.ndarray]:
+    """Границы слоёв в сжимаемой зоне (глубины от подошвы) и веса mth·kmui."""
+    H, Hc, b = footing.H, footing.Hc, footing.b
+    target_bottom = H - Hc
+    depths: List[float] = []
+    weights: List[float] = []
+    top = footing.borehole.z_top
+    for layer in footing.borehole.layers:
+        bottom = top - layer.thickness
+        overlap_top = min(top, H)
+        overlap_bottom = max(bottom, target_bottom)
+        if overlap_top - overlap_bottom > 1e-12:
+            d_top, d_bottom = H - overlap_top, H - overlap_bottom
+            if not depths or depths[-1] != d_top:
+                if depths:
+                    weights.append(0.0)  # разрыв между слоями не даёт вклада
+                depths.append(d_top)
+            depths.append(d_bottom)
+            mu = kmui(z=0.5 * (d_top + d_bottom), b=b, soil_type=layer.soil.soil_type.value)
+            weights.append(layer.soil.mth * mu)
+        top = bottom
+        if top <= target_bottom:
+            break
+    return np.asarray(depths, dtype=float), np.asarray(weights, dtype=float)
+
+
+def _rect_integral(x1, x2, y1, y2, Z) -> np.ndarray:
+    """∫₀^Z σz/p dz в начале координат от прямоугольника [x1,x2]×[y1,y2]."""
+
+    def corner(x, y):
+        ax, ay = np.abs(x), np.abs(y)
+        ok = (ax > 0) & (ay > 0)
+        value = corner_stress_integral(np.where(ok, ax, 1.0), np.where(ok, ay, 1.0), Z)
+        return np.where(ok, np.sign(x) * np.sign(y) * value, 0.0)
+
+    return corner(x2, y2) - corner(x1, y2) - corner(x2, y1) + corner(x1, y1)
+
+
+def neighbour_pairs(xs: np.ndarray, ys: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Пары (i, j), i ≠ j, с расстоянием между центрами не больше ``radius``."""
+    if radius <= 0:
+        raise ValueError("Радиус влияния должен быть > 0.")
+    cx = np.floor(xs / radius).astype(np.int64)
+    cy = np.floor(ys / radius).astype(np.int64)
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for idx, key in enumerate(zip(cx.tolist(), cy.tolist())):
+        cells.setdefault(key, []).append(idx)
+    cell_arrays = {key: np.asarray(members) for key, members in cells.items()}
+
+    first: List[np.ndarray] = []
+    second: List[np.ndarray] = []
+    for (gx, gy), members in cell_arrays.items():
+        near = [
+            cell_arrays[key]
+            for key in ((gx + dx, gy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+            if key in cell_arrays
+        ]
+        candidates = np.concatenate(near)
+        i = np.repeat(members, len(candidates))
+        j = np.tile(candidates, len(members))
+        keep = (i != j) & (np.hypot(xs[i] - xs[j], ys[i] - ys[j]) <= radius)
+        first.append(i[keep])
+        second.append(j[keep])
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def group_settlement(
+    footings: Sequence[Footing],
+    *,
+    radius: Optional[float] = None,
+    engine: str = "table",
+    chunk_size: int = 200_000,
+) -> GroupResult:
+    """Осадки фундаментов группы с учётом соседей в радиусе ``radius``.
+
+    По умолчанию радиус — пять наибольших размеров фундамента.  ``engine``
+    задаёт способ расчёта k_i для собственной осадки.
+    """
+    n = len(footings)
+    if n == 0:
+        empty = np.empty(0)
+        return GroupResult(empty, empty, np.empty(0, dtype=np.int64), 0)
+    xs = np.array([f.x for f in footings], dtype=float)
+    ys = np.array([f.y for f in footings], dtype=float)
+    if radius is None:
+        radius = 5.0 * max(max(f.a, f.b) for f in footings)
+
+    prefix = PrefixEngine()
+    own = np.array(
+        [
+            prefix.settlement(f.borehole, Hc=f.Hc, H=f.H, F=f.F, a=f.a, b=f.b, engine=engine)
+            for f in footings
+        ]
+    )
+
+    # границы слоёв всех фундаментов подряд: профиль i — depths[offsets[i]:offsets[i+1]]
+    profiles = [_profile(f) for f in footings]
+    counts = np.array([len(d) for d, _ in profiles], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    depths = np.concatenate([d for d, _ in profiles]) if offsets[-1] else np.empty(0)
+    # веса отрезков между границами: у непустого профиля i их counts[i] - 1,
+    # поэтому смещение уменьшается на число непустых профилей до i
+    weights = np.concatenate([w for _, w in profiles]) if offsets[-1] else np.empty(0)
+    nonempty = (counts > 0).astype(np.int64)
+    w_offsets = offsets[:-1] - (np.cumsum(nonempty) - nonempty)
+
+    i_idx, j_idx = neighbour_pairs(xs, ys, radius)
+    a = np.array([f.a for f in footings], dtype=float)
+    b = np.array([f.b for f in footings], dtype=float)
+    p0 = np.array([f.F for f in footings], dtype=float) / (a * b)
+
+    added_terms = np.zeros(n)
+    pair_counts = counts[i_idx]
+    start = 0
+    while start < len(i_idx):
+        # порция пар с ограниченным числом точек глубины
+        cum = np.cumsum(pair_counts[start:])
+        stop = start + max(1, int(np.searchsorted(cum, chunk_size, side="right")))
+        ii, jj, cc = i_idx[start:stop], j_idx[start:stop], pair_counts[start:stop]
+        rows = np.repeat(np.arange(len(ii)), cc)
+        within = np.arange(len(rows)) - np.repeat(np.cumsum(cc) - cc, cc)
+        ir, jr = ii[rows], jj[rows]
+        z = depths[offsets[ir] + within]
+        dx = xs[jr] - xs[ir]
+        dy = ys[jr] - ys[ir]
+        # та же нормировка, что у ki_analytic: интеграл до половины глубины
+        values = _rect_integral(
+            dx - 0.5 * a[jr], dx + 0.5 * a[jr], dy - 0.5 * b[jr], dy + 0.5 * b[jr], 0.5 * z
+        ) * p0[jr]
+        # приращения между соседними границами одной пары
+        seg = np.flatnonzero(within < cc[rows] - 1)
+        contrib = weights[w_offsets[ir[seg]] + within[seg]] * (values[seg + 1] - values[seg])
+        added_terms += np.bincount(ir[seg], weights=contrib, minlength=n)
+        start = stop
+
+    khs = np.array([kh(z=f.Hc, b=f.b) for f in footings])
+    neighbours = np.bincount(i_idx, minlength=n)
+    return GroupResult(own, added_terms * khs, neighbours, len(i_idx))
+
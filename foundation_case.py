@@ -0,0 +1,81 @@
+"""Подготовленный расчётный случай фундамента для перебора нагрузок.
+
+Нагрузка входит в осадку только через ``p0 = F / (a * b)``: ``sth`` от неё
+не зависит, а ``sp`` — это сумма по слоям, умноженная на ``p0 · b · kh``.
+``FoundationCase`` один раз вычисляет для заданных скважины и геометрии
+(a, b, H, Hc) ``sth``, сумму по слоям и ``kh``; после этого осадка для
+любого числа нагрузок считается одним векторным умножением.
+
+Случай фиксирует состояние скважины на момент создания: после изменения
+слоёв или грунтов его нужно создать заново.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import numpy as np
+
+from borehole_class import Borehole
+from II_calculations import sp_terms, sth_layers
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+class FoundationCase:
+    """Осадка фундамента a×b на отметке H при глубине оттаивания Hc."""
+
+    __slots__ = ("borehole", "a", "b", "H", "Hc", "sth", "kh", "_sp_sum", "_sp_unit")
+
+    def __init__(
+        self,
+        borehole: Borehole,
+        *,
+        a: float,
+        b: float,
+        H: float,
+        Hc: float,
+        engine: str = "table",
+    ) -> None:
+        if a <= 0 or b <= 0:
+            raise ValueError("Размеры фундамента a и b должны быть > 0.")
+        self.borehole = borehole
+        self.a = a
+        self.b = b
+        self.H = H
+        self.Hc = Hc
+        self.sth = sum(sth_layers(borehole=borehole, Hc=Hc, H=H), 0.0)
+        terms, _, self.kh = sp_terms(borehole, F=0.0, a=a, b=b, Hc=Hc, H=H, engine=engine)
+        self._sp_sum = sum(terms, 0.0)
+        # осадка sp от единичной нагрузки (F = 1 кН)
+        self._sp_unit = self._sp_sum * (1.0 / (a * b)) * b * self.kh
+
+    @property
+    def sp_per_kN(self) -> float:
+        """Приращение sp на 1 кН нагрузки."""
+        return self._sp_unit
+
+    def sp(self, F: ArrayLike) -> Union[float, np.ndarray]:
+        """sp для нагрузки ``F`` (число или массив нагрузок)."""
+        # тот же порядок операций, что и в disp_sp: сумма · p0 · b · kh
+        p0 = np.asarray(F, dtype=float) / (self.a * self.b)
+        result = self._sp_sum * p0 * self.b * self.kh
+        return float(result) if result.ndim == 0 else result
+
+    def settlement(self, F: ArrayLike) -> Union[float, np.ndarray]:
+        """Полная осадка sth + sp для нагрузки ``F`` (число или массив)."""
+        return self.sth + self.sp(F)
+
+    def combinations(self, factors: np.ndarray, loads: Sequence[float]) -> np.ndarray:
+        """Осадки для сочетаний нагрузок.
+
+        ``loads`` — нормативные нагрузки по видам (постоянная, временная,
+        снеговая, ...), ``factors`` — матрица коэффициентов сочетаний
+        размером (число сочетаний × число видов нагрузок).
+        """
+        factors = np.asarray(factors, dtype=float)
+        loads = np.asarray(loads, dtype=float)
+        if factors.ndim != 2 or factors.shape[1] != loads.shape[0]:
+            raise ValueError(
+                "Матрица коэффициентов должна иметь по столбцу на каждый вид нагрузки."
+            )
+        return self.settlement(factors @ loads)
@@ -70,65 +70,80 @@ def kmui(z: float, b: float, soil_type: str) -> float:
     return KMUI_TABLE[key][i]
 
 
+# ---- Таблица 7.7: k_i по z/b (строки) и a/b (столбцы), строится один раз ----
+KI_Z_ROWS = [
+    # пример начала (замени на полный список)
+    0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0,
+    2.5, 3.0, 3.5, 4.0, 6.0, 8.0, 12.0, 16.0, 20.0
+]
+
+# Список A/B по столбцам (в точности как в заголовках таблицы)
+KI_A_COLS = [1.0, 1.4, 1.8, 2.4, 3.0, 3.2, 5.0, 10.0]
+
+# Матрица значений k_i размера [len(KI_Z_ROWS)] x [len(KI_A_COLS)]
+# Каждая внутренняя строка — это значения по всем столбцам A/B для одного Z/B.
+# ↓↓↓ ВСТАВЬ СВОИ ЧИСЛА ИЗ ТАБЛИЦЫ 7.7 ↓↓↓
+KI_VALS = [
+    # z/b = 0.0
+    [0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000],
+    # z/b = 0.2
+    [0.100, 0.100, 0.100, 0.100, 0.100, 0.100, 0.100, 0.104],
+    # z/b = 0.4
+    [0.200, 0.200, 0.200, 0.200, 0.200, 0.200, 0.200, 0.208],
+    # z/b = 0.6
+    [0.299, 0.300, 0.300, 0.300, 0.300, 0.300, 0.300, 0.311],
+    # z/b = 0.8
+    [0.380, 0.394, 0.397, 0.397, 0.397, 0.397, 0.397, 0.416],
+    # z/b = 1.0
+    [0.472, 0.486, 0.489, 0.489, 0.487, 0.486, 0.486, 0.520],
+    # z/b = 1.2
+    [0.449, 0.538, 0.566, 0.565, 0.565, 0.567, 0.567, 0.621],
+    # z/b = 1.4
+    [0.542, 0.592, 0.618, 0.635, 0.640, 0.640, 0.640, 0.721],
+    # z/b = 1.6
+    [0.610, 0.643, 0.666, 0.695, 0.705, 0.706, 0.706, 0.821],
+    # z/b = 1.8
+    [0.678, 0.676, 0.717, 0.757, 0.768, 0.768, 0.776, 0.921],
+    # z/b = 2.0
+    [0.706, 0.679, 0.748, 0.795, 0.810, 0.828, 0.832, 1.017],
+    # z/b = 2.5
+    [0.708, 0.846, 0.837, 0.962, 1.023, 1.028, 1.082, 1.200],
+    # z/b = 3.0
+    [0.732, 0.846, 0.927, 1.016, 1.125, 1.121, 1.231, 1.230],
+    # z/b = 3.5
+    [0.760, 0.846, 0.961, 1.015, 1.123, 1.125, 1.203, 1.207],
+    # z/b = 4.0
+    [0.784, 0.904, 1.007, 1.091, 1.203, 1.206, 1.314, 1.341],
+    # z/b = 6.0
+    [0.794, 0.933, 1.037, 1.151, 1.257, 1.258, 1.384, 1.514],
+    # z/b = 8.0
+    [0.824, 0.963, 1.071, 1.207, 1.324, 1.329, 1.459, 1.699],
+    # z/b = 12.0
+    [0.850, 1.011, 1.137, 1.233, 1.351, 1.357, 1.523, 1.925],
+    # z/b = 16.0
+    [0.850, 1.011, 1.137, 1.284, 1.430, 1.469, 1.645, 2.095],
+    # z/b = 20.0
+    [0.857, 1.021, 1.149, 1.300, 1.451, 1.679, 2.236, 2.236],
+]
+_KI_TABLE = Table2D(KI_Z_ROWS, KI_A_COLS, KI_VALS)
+
+
 def ki(a: float, b: float, z: float) -> float:
     if z < 0:
         z = 0
     a_over_b = a_b(a,b)
     z_over_b = z_b(z,b)
-    KI_Z_ROWS = [
-        # пример начала (замени на полный список)
-        0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0,
-        2.5, 3.0, 3.5, 4.0, 6.0, 8.0, 12.0, 16.0, 20.0
-    ]
-
-    # Список A/B по столбцам (в точности как в заголовках таблицы)
-    KI_A_COLS = [1.0, 1.4, 1.8, 2.4, 3.0, 3.2, 5.0, 10.0]
-
-    # Матрица значений k_i размера [len(KI_Z_ROWS)] x [len(KI_A_COLS)]
-    # Каждая внутренняя строка — это значения по всем столбцам A/B для одного Z/B.
-    # ↓↓↓ ВСТАВЬ СВОИ ЧИСЛА ИЗ ТАБЛИЦЫ 7.7 ↓↓↓
-    KI_VALS = [
-        # z/b = 0.0
-        [0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000, 0.000],
-        # z/b = 0.2
-        [0.100, 0.100, 0.100, 0.100, 0.100, 0.100, 0.100, 0.104],
-        # z/b = 0.4
-        [0.200, 0.200, 0.200, 0.200, 0.200, 0.200, 0.200, 0.208],
-        # z/b = 0.6
-        [0.299, 0.300, 0.300, 0.300, 0.300, 0.300, 0.300, 0.311],
-        # z/b = 0.8
-        [0.380, 0.394, 0.397, 0.397, 0.397, 0.397, 0.397, 0.416],
-        # z/b = 1.0
-        [0.472, 0.486, 0.489, 0.489, 0.487, 0.486, 0.486, 0.520],
-        # z/b = 1.2
-        [0.449, 0.538, 0.566, 0.565, 0.565, 0.567, 0.567, 0.621],
-        # z/b = 1.4
-        [0.542, 0.592, 0.618, 0.635, 0.640, 0.640, 0.640, 0.721],
-        # z/b = 1.6
-        [0.610, 0.643, 0.666, 0.695, 0.705, 0.706, 0.706, 0.821],
-        # z/b = 1.8
-        [0.678, 0.676, 0.717, 0.757, 0.768, 0.768, 0.776, 0.921],
-        # z/b = 2.0
-        [0.706, 0.679, 0.748, 0.795, 0.810, 0.828, 0.832, 1.017],
-        # z/b = 2.5
-        [0.708, 0.846, 0.837, 0.962, 1.023, 1.028, 1.082, 1.200],
-        # z/b = 3.0
-        [0.732, 0.846, 0.927, 1.016, 1.125, 1.121, 1.231, 1.230],
-        # z/b = 3.5
-        [0.760, 0.846, 0.961, 1.015, 1.123, 1.125, 1.203, 1.207],
-        # z/b = 4.0
-        [0.784, 0.904, 1.007, 1.091, 1.203, 1.206, 1.314, 1.341],
-        # z/b = 6.0
-        [0.794, 0.933, 1.037, 1.151, 1.257, 1.258, 1.384, 1.514],
-        # z/b = 8.0
-        [0.824, 0.963, 1.071, 1.207, 1.324, 1.329, 1.459, 1.699],
-        # z/b = 12.0
-        [0.850, 1.011, 1.137, 1.233, 1.351, 1.357, 1.523, 1.925],
-        # z/b = 16.0
-        [0.850, 1.011, 1.137, 1.284, 1.430, 1.469, 1.645, 2.095],
-        # z/b = 20.0
-        [0.857, 1.021, 1.149, 1.300, 1.451, 1.679, 2.236, 2.236],
-    ]
-    tab2 = Table2D(KI_Z_ROWS, KI_A_COLS, KI_VALS)
-    ki = tab2.lookup(z_over_b,a_over_b,interpolate=True, clamp=True)
-    return ki
\ No newline at end of file
+    ki = _KI_TABLE.lookup(z_over_b,a_over_b,interpolate=True, clamp=True)
+    return ki
+
+
+def ki_grad(a: float, b: float, z: float) -> Tuple[float, float]:
+    """
+    k_i и его производная по ширине b при неизменных a и z.
+    Таблица 7.7 интерполируется билинейно по z/b и a/b, поэтому
+    dk_i/db = -(z·∂k/∂(z/b) + a·∂k/∂(a/b)) / b².
+    """
+    if z < 0:
+        z = 0
+    value, d_zb, d_ab = _KI_TABLE.lookup_grad(z_b(z,b), a_b(a,b), clamp=True)
+    return value, -(z * d_zb + a * d_ab) / (b * b)
@@ -29,17 +29,36 @@ class Soil:
     def gamma_kNm3(self) -> float:
         return self.rho * 9.81 / 1000.0
 
-# --- Пустые фазы ---
+# --- Фазы ---
 class SoilPhase(Enum):
     THAWED = "талый"
     FROZEN = "мерзлый"
 
-@dataclass(slots=True)
+# числовые поля Phase в постоянном порядке (для таблиц и ключей)
+PHASE_FIELDS = ("conductivity", "heat_capacity", "latent_heat", "water_content")
+
+
+@dataclass(slots=True, kw_only=True)
 class Phase:
-    """Пустой контейнер-фаза: сейчас без полей, потом можно расширить."""
-    pass
+    """Теплофизические свойства грунта в одном фазовом состоянии."""
+    conductivity: Optional[float] = None   # λ, Вт/(м·К)
+    heat_capacity: Optional[float] = None  # C, объёмная, Дж/(м³·К)
+    latent_heat: Optional[float] = None    # теплота фазового перехода, Дж/м³
+    water_content: Optional[float] = None  # суммарная влажность w, д.е.
+
+    def __post_init__(self):
+        for name in PHASE_FIELDS:
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} не может быть отрицательным.")
+        if self.conductivity == 0:
+            raise ValueError("conductivity должно быть > 0.")
+
+    @property
+    def is_empty(self) -> bool:
+        return all(getattr(self, name) is None for name in PHASE_FIELDS)
 
-# --- ММГ-наследник с пустыми фазами + Ath, mth ---
+# --- ММГ-наследник с фазами + Ath, mth ---
 @dataclass(slots=True, kw_only=True)
 class PermafrostSoil(Soil):
     thawed: Phase = field(default_factory=Phase)
@@ -0,0 +1,242 @@
+"""Сжатие плотных каротажных профилей в слоистую скважину.
+
+Полевые и лабораторные данные бывают заданы через каждые 5–10 см
+(плотность, Ath, mth).  Если каждый отсчёт сделать слоем, в скважине
+окажутся тысячи слоёв, и все расчёты будут платить за них.
+``compact_borehole`` объединяет подряд идущие слои одного типа грунта в
+один, пока разброс каждого свойства внутри группы не выходит за допуск
+(группировка серий).  Свойства группы усредняются с весом толщины, поэтому
+вес грунта над подошвой группы сохраняется точно.  Теплофизические
+свойства фаз (``Phase``) тоже должны укладываться в допуск: теплоёмкость,
+теплота фазового перехода и влажность усредняются с весом толщины, а
+теплопроводность — как у последовательно соединённых слоёв (средняя
+гармоническая), чтобы термическое сопротивление группы не менялось.
+Группа из слоёв одного и того же грунта сохраняет сам этот грунт.
+
+Исходная скважина остаётся в ``Compaction.original`` для отчётов, расчёты
+ведутся по ``Compaction.compacted``.  ``settlement_effect`` считает осадку
+по обеим скважинам для набора расчётных случаев и показывает наибольшее
+расхождение.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from borehole_class import Borehole, BoreholeLayer
+from grunt_class import PHASE_FIELDS, PermafrostSoil, Phase, SoilType
+from II_calculations import disp_sp, disp_sth, full_displacment
+
+
+@dataclass(slots=True, kw_only=True)
+class CompactionTolerances:
+    """Допустимый разброс свойств внутри одного слоя."""
+
+    rho: float = 20.0                    # кг/м³, размах
+    Ath: float = 0.002                   # размах
+    mth_rel: float = 0.1                 # размах mth относительно минимума
+    phase_rel: float = 0.1               # размах свойств фаз относительно минимума
+    max_thickness: Optional[float] = None  # наибольшая толщина слоя, м
+
+    def __post_init__(self):
+        if self.rho < 0 or self.Ath < 0 or self.mth_rel < 0 or self.phase_rel < 0:
+            raise ValueError("Допуски не могут быть отрицательными.")
+        if self.max_thickness is not None and self.max_thickness <= 0:
+            raise ValueError("max_thickness должна быть > 0.")
+
+
+@dataclass(slots=True)
+class Compaction:
+    """Исходная и сжатая скважины и соответствие их слоёв."""
+
+    original: Borehole
+    compacted: Borehole
+    groups: List[Tuple[int, int]]   # слои original[start:stop] → слой compacted
+    max_effect: Optional[float] = field(default=None)  # наибольшее |Δs|, м
+
+    @property
+    def ratio(self) -> float:
+        """Во сколько раз уменьшилось число слоёв."""
+        return len(self.original.layers) / max(1, len(self.compacted.layers))
+
+    def report(self) -> str:
+        text = (
+            f"Скважина {self.original.code}: слоёв {len(self.original.layers)} → "
+            f"{len(self.compacted.layers)} (в {self.ratio:.1f} раза меньше)"
+        )
+        if self.max_effect is not None:
+            text += f", наибольшее изменение осадки {self.max_effect * 1000:.2f} мм"
+        return text
+
+
+def log_to_borehole(
+    code: str,
+    z_top: float,
+    step: Union[float, Sequence[float]],
+    *,
+    rho: Sequence[float],
+    Ath: Sequence[float],
+    mth: Sequence[float],
+    soil_type: Union[SoilType, Sequence[SoilType]],
+) -> Borehole:
+    """Плотный профиль как скважина: по слою на каждый отсчёт.
+
+    ``step`` — толщина интервала отсчёта (общая или для каждого отсчёта).
+    Каждый отсчёт получает собственный грунт с кодом ``{code}:{номер}``.
+    """
+    n = len(rho)
+    if len(Ath) != n or len(mth) != n:
+        raise ValueError("Массивы rho, Ath и mth должны быть одной длины.")
+    steps = np.broadcast_to(np.asarray(step, dtype=float), (n,))
+    types = [soil_type] * n if isinstance(soil_type, SoilType) else list(soil_type)
+    if len(types) != n:
+        raise ValueError("Число типов грунта должно совпадать с числом отсчётов.")
+    borehole = Borehole(code=code, z_top=z_top)
+    for i in range(n):
+        soil = PermafrostSoil(
+            code=f"{code}:{i + 1}",
+            name=f"отсчёт {i + 1}",
+            soil_type=types[i],
+            rho=float(rho[i]),
+            Ath=float(Ath[i]),
+            mth=float(mth[i]),
+        )
+        borehole.add(soil, float(steps[i]))
+    return borehole
+
+
+class _Group:
+    """Набираемая группа слоёв: толщина и размах свойств."""
+
+    __slots__ = ("layers", "thickness", "low", "high")
+
+    def __init__(self, layer: BoreholeLayer) -> None:
+        self.layers = [layer]
+        self.thickness = layer.thickness
+        values = _values(layer.soil)
+        self.low = list(values)
+        self.high = list(values)
+
+    def fits(self, layer: BoreholeLayer, tol: CompactionTolerances) -> bool:
+        soil = layer.soil
+        if soil.soil_type is not self.layers[0].soil.soil_type:
+            return False
+        limit = tol.max_thickness
+        if limit is not None and self.thickness + layer.thickness > limit + 1e-12:
+            return False
+        for k, value in enumerate(_values(soil)):
+            low, high = self.low[k], self.high[k]
+            if (value is None) != (low is None):
+                return False
+            if value is None:
+                continue
+            low, high = min(low, value), max(high, value)
+            if k < 2:
+                limit = (tol.rho, tol.Ath)[k]
+            else:
+                limit = (tol.mth_rel if k == 2 else tol.phase_rel) * low
+            if high - low > limit:
+                return False
+        return True
+
+    def add(self, layer: BoreholeLayer) -> None:
+        self.layers.append(layer)
+        self.thickness += layer.thickness
+        for k, value in enumerate(_values(layer.soil)):
+            if value is not None:
+                self.low[k] = min(self.low[k], value)
+                self.high[k] = max(self.high[k], value)
+
+    def merge(self, code: str) -> BoreholeLayer:
+        first = self.layers[0].soil
+        if all(g.soil is first for g in self.layers):
+            return BoreholeLayer(soil=first, thickness=self.thickness)
+
+        def mean(name: str) -> Optional[float]:
+            if getattr(first, name) is None:
+                return None
+            return sum(getattr(g.soil, name) * g.thickness for g in self.layers) / self.thickness
+
+        def phase(which: str) -> Phase:
+            phases = [(getattr(g.soil, which), g.thickness) for g in self.layers]
+            values = {}
+            for name in PHASE_FIELDS:
+                if getattr(phases[0][0], name) is None:
+                    continue
+                if name == "conductivity":
+                    # последовательное соединение: сумма h/λ сохраняется
+                    resistance = sum(h / getattr(p, name) for p, h in phases)
+                    values[name] = self.thickness / resistance
+                else:
+                    values[name] = sum(getattr(p, name) * h for p, h in phases) / self.thickness
+            return Phase(**values)
+
+        soil = PermafrostSoil(
+            code=code,
+            name=f"{first.name} … {self.layers[-1].soil.name}",
+            soil_type=first.soil_type,
+            rho=mean("rho"),
+            Ath=mean("Ath"),
+            mth=mean("mth"),
+            thawed=phase("thawed"),
+            frozen=phase("frozen"),
+        )
+        return BoreholeLayer(soil=soil, thickness=self.thickness)
+
+
+def _values(soil) -> Tuple[Optional[float], ...]:
+    """rho, Ath, mth, затем свойства талой и мёрзлой фаз (порядок PHASE_FIELDS)."""
+    values = [soil.rho, getattr(soil, "Ath", None), getattr(soil, "mth", None)]
+    for which in ("thawed", "frozen"):
+        phase = getattr(soil, which, None)
+        values.extend(getattr(phase, name, None) for name in PHASE_FIELDS)
+    return tuple(values)
+
+
+def compact_borehole(
+    borehole: Borehole, tolerances: Optional[CompactionTolerances] = None
+) -> Compaction:
+    """Объединяет подряд идущие близкие по свойствам слои скважины."""
+    tol = tolerances if tolerances is not None else CompactionTolerances()
+    groups: List[Tuple[int, int]] = []
+    layers: List[BoreholeLayer] = []
+    start = 0
+    current: Optional[_Group] = None
+    for i, layer in enumerate(borehole.layers):
+        if current is not None and current.fits(layer, tol):
+            current.add(layer)
+            continue
+        if current is not None:
+            layers.append(current.merge(f"{borehole.code}/{len(layers) + 1}"))
+            groups.append((start, i))
+        start, current = i, _Group(layer)
+    if current is not None:
+        layers.append(current.merge(f"{borehole.code}/{len(layers) + 1}"))
+        groups.append((start, len(borehole.layers)))
+    compacted = Borehole(code=borehole.code, z_top=borehole.z_top, layers=layers)
+    return Compaction(borehole, compacted, groups)
+
+
+def settlement_effect(
+    compaction: Compaction,
+    cases: Iterable[Tuple[float, float, float, float, float]],
+    *,
+    engine: str = "table",
+) -> float:
+    """Наибольшее |Δs| между исходной и сжатой скважиной, м.
+
+    ``cases`` — кортежи (Hc, H, F, a, b).  Результат сохраняется в
+    ``compaction.max_effect``.
+    """
+    worst = 0.0
+    for Hc, H, F, a, b in cases:
+        values = []
+        for bh in (compaction.original, compaction.compacted):
+            sth = disp_sth(borehole=bh, Hc=Hc, H=H)
+            sp = disp_sp(borehole=bh, F=F, a=a, b=b, Hc=Hc, H=H, engine=engine)
+            values.append(full_displacment(sth, sp))
+        worst = max(worst, abs(values[1] - values[0]))
+    compaction.max_effect = worst
+    return worst
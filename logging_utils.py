@@ -1,19 +1,144 @@
-"""Простой модуль вспомогательного логирования."""
+"""Простой модуль вспомогательного логирования.
+
+Помимо ``get_logger`` с синхронной базовой конфигурацией здесь есть
+неблокирующая схема для расчётов: ``setup_queue_logging`` подключает к
+корневому логгеру ``QueueHandler``, а единственный поток ``QueueListener``
+пишет записи в консоль, файл и окно лога.  Рабочие процессы вызывают
+``worker_logging_init`` с очередью из ``get_log_queue`` и пересылают записи
+в основной процесс через неё.
+
+В горячих циклах уровень проверяется один раз до цикла::
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for case in cases:
+        ...
+        if debug:
+            logger.debug("...", ...)
+"""
 from __future__ import annotations
 
 import logging
-from typing import Final
+import logging.handlers
+import multiprocessing
+import queue
+from typing import Final, Iterable, List, Optional, Set
 
 _DEFAULT_LEVEL: Final[int] = logging.INFO
+_FORMAT: Final[str] = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_level = _DEFAULT_LEVEL
+_loggers: Set[str] = set()
+_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+# обработчики корневого логгера, снятые setup_queue_logging
+_replaced: List[logging.Handler] = []
 
 
 def get_logger(name: str) -> logging.Logger:
     """Возвращает настроенный логгер с базовой конфигурацией."""
     if not logging.getLogger().handlers:
         logging.basicConfig(
-            level=_DEFAULT_LEVEL,
-            format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+            level=_level,
+            format=_FORMAT,
         )
     logger = logging.getLogger(name)
-    logger.setLevel(_DEFAULT_LEVEL)
+    logger.setLevel(_level)
+    _loggers.add(name)
     return logger
+
+
+def setup_queue_logging(
+    *,
+    level: int = _DEFAULT_LEVEL,
+    console: bool = True,
+    log_file: Optional[str] = None,
+    handlers: Iterable[logging.Handler] = (),
+    multiprocess: bool = False,
+) -> logging.handlers.QueueListener:
+    """Переводит логирование на очередь с одним потоком-писателем.
+
+    Корневой логгер получает только ``QueueHandler``, поэтому вызов
+    ``logger.info`` в рабочем коде сводится к постановке записи в очередь.
+    Поток ``QueueListener`` передаёт записи обработчикам: консоли, файлу
+    ``log_file`` и дополнительным ``handlers`` (например,
+    ``widgets.LogConsole.handler()``).  При ``multiprocess=True`` очередь
+    создаётся через ``multiprocessing`` и может передаваться рабочим
+    процессам.  Повторный вызов перенастраивает схему.
+    """
+    global _level, _queue, _listener, _queue_handler, _replaced
+    stop_queue_logging()
+
+    formatter = logging.Formatter(_FORMAT)
+    sinks: List[logging.Handler] = []
+    if console:
+        sinks.append(logging.StreamHandler())
+    if log_file:
+        sinks.append(logging.FileHandler(log_file, encoding="utf-8"))
+    sinks.extend(handlers)
+    for handler in sinks:
+        if handler.formatter is None:
+            handler.setFormatter(formatter)
+
+    _queue = multiprocessing.Queue(-1) if multiprocess else queue.SimpleQueue()
+    root = logging.getLogger()
+    _replaced = list(root.handlers)
+    for handler in _replaced:
+        root.removeHandler(handler)
+    _queue_handler = logging.handlers.QueueHandler(_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _level = level
+    for name in _loggers:
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_queue_logging() -> None:
+    """Останавливает поток-писатель, дописав все записи из очереди.
+
+    Корневой логгер получает обратно обработчики, которые были у него до
+    ``setup_queue_logging``: записи не копятся в очереди без читателя.
+    """
+    global _listener, _queue, _queue_handler, _replaced
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+        for handler in _replaced:
+            root.addHandler(handler)
+        _queue_handler = None
+        _replaced = []
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+    _queue = None
+
+
+def get_log_queue() -> Optional[queue.Queue]:
+    """Очередь, настроенная ``setup_queue_logging`` (для рабочих процессов)."""
+    return _queue
+
+
+def worker_logging_init(log_queue, level: int = _DEFAULT_LEVEL) -> None:
+    """Инициализатор рабочего процесса: все записи уходят в ``log_queue``.
+
+    Подходит как ``initializer`` для ``ProcessPoolExecutor``::
+
+        ProcessPoolExecutor(initializer=worker_logging_init,
+                            initargs=(get_log_queue(), logging.DEBUG))
+    """
+    global _level
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    _level = level
+    for name in _loggers:
+        logging.getLogger(name).setLevel(level)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import tkinter as tk
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from tkinter import ttk
-from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Sequence, Tuple
 
 from borehole_class import Borehole
+from csv_import import find_borehole, import_soils
 from grunt_class import PermafrostSoil, SoilType
 from II_calculations import disp_calculation
-from widgets import create_text, show_error
+from project import Project, ProjectCase, load_project, save_project
+from widgets import VirtualTreeview, ask_file, ask_save_file, create_text, show_error
 
 
 class ParameterInput:
@@ -62,29 +67,130 @@ class ParameterInput:
             raise ValueError(f"Неизвестная размерность: {unit_name}")
         return value * factor
 
+    def get_state(self) -> Tuple[str, str]:
+        """Введённый текст и выбранная размерность (для сохранения проекта)."""
+        return self.var.get(), self.unit_var.get()
+
+    def set_state(self, text: str, unit: str) -> None:
+        self.var.set(text)
+        if unit in self._units_map:
+            self.unit_var.set(unit)
+
+
+KI_ENGINE_LABELS: Dict[str, str] = {
+    "table": "по таблице 7.7",
+    "analytic": "аналитически (Буссинеск)",
+}
+
+
+def soil_label(soil: PermafrostSoil) -> str:
+    """Подпись грунта в выпадающих списках: «код — название»."""
+    return f"{soil.code} — {soil.name}"
+
+
+@dataclass(frozen=True)
+class SoilChange:
+    """Сводное изменение справочника грунтов, передаваемое подписчикам."""
+
+    added: FrozenSet[str] = field(default_factory=frozenset)
+    removed: FrozenSet[str] = field(default_factory=frozenset)
+    changed: FrozenSet[str] = field(default_factory=frozenset)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
 
 class SoilManager:
-    """Хранилище введённых грунтов."""
+    """Хранилище введённых грунтов.
+
+    Отсортированный список подписей, словарь «подпись → код» и индекс для
+    поиска по префиксу строятся лениво и переиспользуются до следующего
+    изменения справочника. Каждое изменение увеличивает ``version``.
+
+    Внутри ``batch()`` уведомления подавляются: по выходу из блока подписчики
+    получают одно событие ``SoilChange`` со всеми добавленными, удалёнными и
+    изменёнными кодами.
+    """
 
     def __init__(self) -> None:
         self._soils: Dict[str, PermafrostSoil] = {}
-        self._listeners: List[Callable[[], None]] = []
-
-    def add_listener(self, callback: Callable[[], None]) -> None:
+        self._listeners: List[Callable[[SoilChange], None]] = []
+        self._batch_depth = 0
+        # код -> был ли грунт в справочнике до начала текущей пачки изменений
+        self._pending: Dict[str, bool] = {}
+        self._version = 0
+        self._cache_version = -1
+        self._labels: List[str] = []
+        self._mapping: Dict[str, str] = {}
+        self._search_keys: List[str] = []
+
+    @property
+    def version(self) -> int:
+        """Номер ревизии справочника, растёт при каждом изменении."""
+        return self._version
+
+    def add_listener(self, callback: Callable[[SoilChange], None]) -> None:
         self._listeners.append(callback)
 
-    def _notify(self) -> None:
+    def remove_listener(self, callback: Callable[[SoilChange], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, change: SoilChange) -> None:
         for callback in list(self._listeners):
-            callback()
+            callback(change)
+
+    def _touch(self, code: str, existed: bool) -> None:
+        self._version += 1
+        self._pending.setdefault(code, existed)
+        if not self._batch_depth:
+            self._flush()
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        added, removed, changed = set(), set(), set()
+        for code, existed in pending.items():
+            exists = code in self._soils
+            if exists and existed:
+                changed.add(code)
+            elif exists:
+                added.add(code)
+            elif existed:
+                removed.add(code)
+        change = SoilChange(frozenset(added), frozenset(removed), frozenset(changed))
+        if change:
+            self._notify(change)
+
+    @contextmanager
+    def batch(self) -> Iterator["SoilManager"]:
+        """Объединяет изменения внутри блока в одно уведомление подписчиков."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush()
 
     def add(self, soil: PermafrostSoil) -> None:
+        existed = soil.code in self._soils
         self._soils[soil.code] = soil
-        self._notify()
+        self._touch(soil.code, existed)
 
     def remove(self, code: str) -> None:
         if code in self._soils:
             del self._soils[code]
-            self._notify()
+            self._touch(code, True)
+
+    def add_many(self, soils: Iterable[PermafrostSoil]) -> None:
+        with self.batch():
+            for soil in soils:
+                self.add(soil)
+
+    def remove_many(self, codes: Iterable[str]) -> None:
+        with self.batch():
+            for code in codes:
+                self.remove(code)
 
     def get(self, code: str) -> PermafrostSoil:
         return self._soils[code]
@@ -92,14 +198,40 @@ class SoilManager:
     def items(self) -> Iterable[PermafrostSoil]:
         return self._soils.values()
 
+    def __len__(self) -> int:
+        return len(self._soils)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._soils
+
+    def _ensure_index(self) -> None:
+        if self._cache_version == self._version:
+            return
+        labels = ((soil_label(soil), soil.code) for soil in self._soils.values())
+        entries = sorted((label.casefold(), label, code) for label, code in labels)
+        self._search_keys = [key for key, _, _ in entries]
+        self._labels = [label for _, label, _ in entries]
+        self._mapping = {label: code for _, label, code in entries}
+        self._cache_version = self._version
+
     def choices(self) -> Tuple[List[str], Dict[str, str]]:
-        labels = []
-        mapping: Dict[str, str] = {}
-        for soil in self._soils.values():
-            label = f"{soil.code} — {soil.name}"
-            labels.append(label)
-            mapping[label] = soil.code
-        return labels, mapping
+        """Возвращает отсортированные подписи и словарь «подпись → код».
+
+        Результат кэшируется до следующего изменения справочника; возвращаемые
+        объекты общие для всех вызывающих и не должны изменяться.
+        """
+        self._ensure_index()
+        return self._labels, self._mapping
+
+    def search(self, prefix: str) -> List[str]:
+        """Подписи грунтов, начинающиеся с ``prefix`` (без учёта регистра)."""
+        self._ensure_index()
+        key = prefix.casefold()
+        if not key:
+            return list(self._labels)
+        lo = bisect_left(self._search_keys, key)
+        hi = bisect_left(self._search_keys, key + "\U0010ffff", lo)
+        return self._labels[lo:hi]
 
 
 class LayerRow:
@@ -111,9 +243,13 @@ class LayerRow:
         *,
         get_choices: Callable[[], Tuple[List[str], Dict[str, str]]],
         on_remove: Callable[["LayerRow"], None],
+        search: Callable[[str], List[str]] | None = None,
     ) -> None:
         self._get_choices = get_choices
         self._on_remove = on_remove
+        self._search = search
+        self._typed = ""
+        self._typed_at = 0
 
         self.var_soil = tk.StringVar()
         self.var_thickness = tk.StringVar()
@@ -134,6 +270,9 @@ class LayerRow:
         self.entry_thickness.grid(row=0, column=1, padx=8)
         self.btn_remove.grid(row=0, column=2)
 
+        if search is not None:
+            self.cmb_soil.bind("<KeyPress>", self._on_type_ahead, add="+")
+
         self.update_choices()
 
     def grid(self, row: int) -> None:
@@ -148,6 +287,21 @@ class LayerRow:
         if labels and not self.var_soil.get():
             self.var_soil.set(labels[0])
 
+    def _on_type_ahead(self, event: tk.Event) -> None:
+        """Выбирает первый грунт, подпись которого начинается с набранного текста."""
+        if event.keysym == "BackSpace":
+            self._typed = self._typed[:-1]
+        elif event.char and event.char.isprintable():
+            if event.time - self._typed_at > 1000:
+                self._typed = ""
+            self._typed += event.char
+        else:
+            return
+        self._typed_at = event.time
+        matches = self._search(self._typed) if self._search is not None else []
+        if matches:
+            self.var_soil.set(matches[0])
+
     def _handle_remove(self) -> None:
         self._on_remove(self)
 
@@ -172,6 +326,213 @@ class LayerRow:
         return mapping[selected], thickness
 
 
+class LayerTable:
+    """Табличный редактор слоёв скважины для разрезов из сотен и тысяч слоёв.
+
+    В отличие от набора ``LayerRow`` использует одну виртуализированную
+    таблицу: ячейки редактируются на месте (двойной щелчок, F2 или Enter),
+    строки можно вставлять из Excel (TSV: «грунт<TAB>толщина» или только
+    толщина).  Грунт в ячейке можно задать кодом, подписью или её началом.
+    """
+
+    def __init__(self, parent: tk.Widget, *, manager: SoilManager) -> None:
+        self._manager = manager
+        self._codes: List[str] = []
+        self._thicknesses: List[float] = []
+        self._ids: List[int] = []
+        self._next_id = 0
+
+        self.frame = ttk.Frame(parent)
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(0, weight=1)
+
+        self.table = VirtualTreeview(
+            self.frame,
+            columns=[("num", "№"), ("soil", "Грунт"), ("thickness", "Толщина, м")],
+            height=12,
+            selectmode="extended",
+            sortable=False,
+        )
+        self.table.tree.column("num", width=50)
+        self.table.tree.column("soil", width=220, anchor="w")
+        self.table.enable_editing(
+            ("soil", "thickness"), on_commit=self._on_cell_commit, choices=self._cell_choices
+        )
+        self.table.bind_paste(self._on_paste)
+        self.table.grid(row=0, column=0, columnspan=3, sticky="nsew")
+
+        ttk.Button(self.frame, text="Добавить слой", command=self._add_layer).grid(
+            row=1, column=0, pady=(8, 0), sticky="w"
+        )
+        ttk.Button(self.frame, text="Удалить выбранные", command=self._remove_selected).grid(
+            row=1, column=1, pady=(8, 0), padx=(8, 0), sticky="w"
+        )
+
+        manager.add_listener(self._on_soils_changed)
+
+    def grid(self, **kwargs) -> None:
+        self.frame.grid(**kwargs)
+
+    def grid_remove(self) -> None:
+        self.frame.grid_remove()
+
+    # ------------------------------------------------------------------
+    def set_layers(self, layers: Iterable[Tuple[str, float]]) -> None:
+        """Заменяет слои списком пар (код грунта, толщина)."""
+        self._codes = []
+        self._thicknesses = []
+        for code, thickness in layers:
+            self._codes.append(code)
+            self._thicknesses.append(thickness)
+        self._ids = list(range(len(self._codes)))
+        self._next_id = len(self._codes)
+        self._reload()
+
+    def get_layers(self) -> List[Tuple[str, float]]:
+        """Возвращает проверенные пары (код грунта, толщина) сверху вниз."""
+        for idx, code in enumerate(self._codes, start=1):
+            if code not in self._manager:
+                raise ValueError(f"Слой {idx}: не выбран грунт")
+        return list(zip(self._codes, self._thicknesses))
+
+    def load_borehole(self, borehole: Borehole) -> None:
+        self.set_layers((layer.soil.code, layer.thickness) for layer in borehole.layers)
+
+    def build_borehole(self, code: str, z_top: float) -> Borehole:
+        borehole = Borehole(code=code, z_top=z_top)
+        for soil_code, thickness in self.get_layers():
+            borehole.add(self._manager.get(soil_code), thickness)
+        return borehole
+
+    # ------------------------------------------------------------------
+    def _label(self, code: str) -> str:
+        if code in self._manager:
+            return soil_label(self._manager.get(code))
+        return f"{code} (?)" if code else ""
+
+    def _row_values(self, pos: int) -> Tuple[object, ...]:
+        return (pos + 1, self._label(self._codes[pos]), self._thicknesses[pos])
+
+    def _reload(self) -> None:
+        self.table.set_rows({row_id: self._row_values(pos) for pos, row_id in enumerate(self._ids)})
+
+    def _resolve_soil(self, text: str) -> str:
+        text = text.strip()
+        if text in self._manager:
+            return text
+        _, mapping = self._manager.choices()
+        if text in mapping:
+            return mapping[text]
+        matches = self._manager.search(text) if text else []
+        if len(matches) == 1:
+            return mapping[matches[0]]
+        if not matches:
+            raise ValueError(f"Грунт '{text}' не найден в справочнике")
+        raise ValueError(f"Грунт '{text}' задан неоднозначно")
+
+    @staticmethod
+    def _parse_thickness(text: str) -> float:
+        text = text.strip()
+        if not text:
+            raise ValueError("Толщина слоя не задана")
+        try:
+            thickness = float(text.replace(",", "."))
+        except ValueError as exc:
+            raise ValueError("Некорректное значение толщины слоя") from exc
+        if thickness <= 0:
+            raise ValueError("Толщина слоя должна быть больше нуля")
+        return thickness
+
+    def _insert_position(self) -> int:
+        selection = self.table.selection()
+        if not selection:
+            return len(self._ids)
+        return self._ids.index(selection[-1]) + 1
+
+    def _default_code(self) -> str:
+        labels, mapping = self._manager.choices()
+        return mapping[labels[0]] if labels else ""
+
+    def _add_layer(self) -> None:
+        pos = self._insert_position()
+        code = self._codes[pos - 1] if pos > 0 else self._default_code()
+        row_id = self._insert([(code, 1.0)], pos)[0]
+        self.table.selection_set([row_id])
+        self.table.see(row_id)
+
+    def _insert(self, layers: Sequence[Tuple[str, float]], pos: int) -> List[int]:
+        new_ids = list(range(self._next_id, self._next_id + len(layers)))
+        self._next_id += len(layers)
+        self._ids[pos:pos] = new_ids
+        self._codes[pos:pos] = [code for code, _ in layers]
+        self._thicknesses[pos:pos] = [thickness for _, thickness in layers]
+        self._reload()
+        return new_ids
+
+    def _remove_selected(self) -> None:
+        selected = set(self.table.selection())
+        if not selected:
+            return
+        keep = [pos for pos, row_id in enumerate(self._ids) if row_id not in selected]
+        self._ids = [self._ids[pos] for pos in keep]
+        self._codes = [self._codes[pos] for pos in keep]
+        self._thicknesses = [self._thicknesses[pos] for pos in keep]
+        self._reload()
+
+    def _cell_choices(self, _row_id: int, column: str) -> List[str] | None:
+        if column == "soil":
+            labels, _ = self._manager.choices()
+            return labels
+        return None
+
+    def _on_cell_commit(self, row_id: int, column: str, text: str) -> None:
+        pos = self._ids.index(row_id)
+        try:
+            if column == "soil":
+                self._codes[pos] = self._resolve_soil(text)
+            else:
+                self._thicknesses[pos] = self._parse_thickness(text)
+        except ValueError as exc:
+            show_error("Ошибка", f"Слой {pos + 1}: {exc}")
+            return
+        self.table.upsert(row_id, self._row_values(pos))
+
+    def _on_paste(self, rows: List[List[str]]) -> None:
+        layers: List[Tuple[str, float]] = []
+        pos = self._insert_position()
+        code = self._codes[pos - 1] if pos > 0 else self._default_code()
+        for line_no, cells in enumerate(rows, start=1):
+            cells = [cell.strip() for cell in cells]
+            if not any(cells):
+                continue
+            try:
+                if len(cells) == 1:
+                    thickness = self._parse_thickness(cells[0])
+                else:
+                    thickness = self._parse_thickness(cells[1])
+                    code = self._resolve_soil(cells[0])
+            except ValueError as exc:
+                if line_no == 1 and not layers:
+                    # первая строка может быть заголовком таблицы
+                    continue
+                show_error("Ошибка", f"Строка {line_no} буфера обмена: {exc}")
+                return
+            layers.append((code, thickness))
+        if layers:
+            new_ids = self._insert(layers, pos)
+            self.table.selection_set(new_ids)
+            self.table.see(new_ids[-1])
+
+    def _on_soils_changed(self, change: SoilChange) -> None:
+        affected = change.added | change.removed | change.changed
+        upserts = {
+            row_id: self._row_values(pos)
+            for pos, row_id in enumerate(self._ids)
+            if self._codes[pos] in affected
+        }
+        self.table.apply(upserts)
+
+
 class SoilDialog:
     """Окно для управления справочником грунтов."""
 
@@ -229,29 +590,44 @@ class SoilDialog:
             row=6, column=0, columnspan=2, pady=(8, 0)
         )
 
-        columns = ("code", "name", "type", "rho", "Ath", "mth")
-        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", height=8)
-        headings = {
-            "code": "Код",
-            "name": "Название",
-            "type": "Тип",
-            "rho": "ρ, кг/м³",
-            "Ath": "Ath",
-            "mth": "mth, кПа⁻¹",
-        }
-        for col in columns:
-            self.tree.heading(col, text=headings[col])
-            self.tree.column(col, width=100, anchor="center")
-        self.tree.grid(row=1, column=0, padx=12, pady=(0, 8), sticky="nsew")
+        filter_frame = ttk.Frame(self.window)
+        filter_frame.grid(row=1, column=0, padx=12, pady=(0, 4), sticky="we")
+        filter_frame.grid_columnconfigure(1, weight=1)
+        ttk.Label(filter_frame, text="Поиск").grid(row=0, column=0, sticky="w", padx=(0, 8))
+        self.var_filter = tk.StringVar()
+        entry_filter = create_text(filter_frame, method="entry")
+        entry_filter.configure(textvariable=self.var_filter)
+        entry_filter.grid(row=0, column=1, sticky="we")
+        self.var_filter.trace_add("write", lambda *_: self._apply_filter())
+
+        self.tree = VirtualTreeview(
+            self.window,
+            columns=[
+                ("code", "Код"),
+                ("name", "Название"),
+                ("type", "Тип"),
+                ("rho", "ρ, кг/м³"),
+                ("Ath", "Ath"),
+                ("mth", "mth, кПа⁻¹"),
+            ],
+            height=8,
+            selectmode="extended",
+        )
+        self.tree.grid(row=2, column=0, padx=12, pady=(0, 8), sticky="nsew")
 
-        ttk.Button(self.window, text="Удалить выбранный", command=self._remove_selected).grid(
-            row=2, column=0, padx=12, pady=(0, 12), sticky="e"
+        buttons = ttk.Frame(self.window)
+        buttons.grid(row=3, column=0, padx=12, pady=(0, 12), sticky="we")
+        ttk.Button(buttons, text="Импорт CSV…", command=self._import_csv).pack(side="left")
+        ttk.Button(buttons, text="Удалить выбранный", command=self._remove_selected).pack(
+            side="right"
         )
 
-        self.window.grid_rowconfigure(1, weight=1)
+        self.window.grid_rowconfigure(2, weight=1)
         self.window.grid_columnconfigure(0, weight=1)
 
-        self._refresh_tree()
+        self.tree.set_rows({soil.code: self._row_values(soil) for soil in manager.items()})
+        manager.add_listener(self._on_soils_changed)
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
 
     def _parse_float(self, value: str, *, allow_none: bool = False) -> float | None:
         value = value.strip()
@@ -291,7 +667,8 @@ class SoilDialog:
             show_error("Ошибка", str(exc))
             return
         self._manager.add(soil)
-        self._refresh_tree()
+        self.tree.selection_set([soil.code])
+        self.tree.see(soil.code)
         self.var_code.set("")
         self.var_name.set("")
         self.var_rho.set("")
@@ -302,27 +679,48 @@ class SoilDialog:
         selection = self.tree.selection()
         if not selection:
             return
-        item_id = selection[0]
-        code = self.tree.set(item_id, "code")
-        self._manager.remove(code)
-        self._refresh_tree()
-
-    def _refresh_tree(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for soil in self._manager.items():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    soil.code,
-                    soil.name,
-                    soil.soil_type.name,
-                    soil.rho,
-                    soil.Ath if soil.Ath is not None else "",
-                    soil.mth if soil.mth is not None else "",
-                ),
-            )
+        self._manager.remove_many(selection)
+
+    def _import_csv(self) -> None:
+        path = ask_file()
+        if not path:
+            return
+        try:
+            import_soils(path, self._manager)
+        except (OSError, ValueError) as exc:
+            show_error("Ошибка импорта", str(exc))
+
+    @staticmethod
+    def _row_values(soil: PermafrostSoil) -> Tuple[object, ...]:
+        return (
+            soil.code,
+            soil.name,
+            soil.soil_type.name,
+            soil.rho,
+            soil.Ath if soil.Ath is not None else "",
+            soil.mth if soil.mth is not None else "",
+        )
+
+    def _on_soils_changed(self, change: SoilChange) -> None:
+        upserts = {
+            code: self._row_values(self._manager.get(code))
+            for code in change.added | change.changed
+        }
+        self.tree.apply(upserts, change.removed)
+
+    def _apply_filter(self) -> None:
+        text = self.var_filter.get().strip().casefold()
+        if not text:
+            self.tree.set_filter(None)
+            return
+        self.tree.set_filter(
+            lambda _code, values: text in str(values[0]).casefold()
+            or text in str(values[1]).casefold()
+        )
+
+    def _on_destroy(self, event: tk.Event) -> None:
+        if event.widget is self.window:
+            self._manager.remove_listener(self._on_soils_changed)
 
 
 class App:
@@ -331,8 +729,19 @@ class App:
         self.root.title("Расчёт осадки основания")
 
         self.soil_manager = SoilManager()
-        self.soil_manager.add_listener(self._update_layer_choices)
+        self.soil_manager.add_listener(self._on_soils_changed)
         self.soil_dialog: SoilDialog | None = None
+        # Скважины проекта; в редакторе слоёв находится только текущая
+        self.boreholes: Dict[str, Borehole] = {}
+        self._current_borehole: str | None = None
+        self.project_cases: List[ProjectCase] = []
+
+        menubar = tk.Menu(root)
+        file_menu = tk.Menu(menubar, tearoff=False)
+        file_menu.add_command(label="Открыть проект…", command=self._open_project)
+        file_menu.add_command(label="Сохранить проект…", command=self._save_project)
+        menubar.add_cascade(label="Файл", menu=file_menu)
+        root.configure(menu=menubar)
 
         main_frame = ttk.Frame(root, padding=12)
         main_frame.grid(row=0, column=0, sticky="nsew")
@@ -376,15 +785,31 @@ class App:
         for idx, widget in enumerate(self.inputs.values()):
             widget.grid(row=idx, column=0, pady=4, sticky="we")
 
+        engine_frame = ttk.Frame(params_frame)
+        engine_frame.grid(row=len(self.inputs), column=0, pady=4, sticky="we")
+        engine_frame.grid_columnconfigure(1, weight=1)
+        ttk.Label(engine_frame, text="Коэффициент k_i").grid(row=0, column=0, sticky="w", padx=(0, 8))
+        self.var_ki_engine = tk.StringVar(value=KI_ENGINE_LABELS["table"])
+        ttk.Combobox(
+            engine_frame,
+            values=list(KI_ENGINE_LABELS.values()),
+            textvariable=self.var_ki_engine,
+            state="readonly",
+        ).grid(row=0, column=1, sticky="we")
+
         borehole_frame = ttk.LabelFrame(main_frame, text="Скважина")
         borehole_frame.grid(row=1, column=0, sticky="nsew", pady=(12, 0))
         borehole_frame.grid_columnconfigure(0, weight=1)
 
         ttk.Label(borehole_frame, text="Название скважины").grid(row=0, column=0, sticky="w")
         self.var_borehole_code = tk.StringVar(value="BH-01")
-        borehole_code_entry = create_text(borehole_frame, method="entry")
-        borehole_code_entry.configure(textvariable=self.var_borehole_code)
-        borehole_code_entry.grid(row=0, column=1, sticky="we", padx=(8, 0))
+        self.cmb_borehole = ttk.Combobox(
+            borehole_frame,
+            textvariable=self.var_borehole_code,
+            postcommand=self._update_borehole_choices,
+        )
+        self.cmb_borehole.grid(row=0, column=1, sticky="we", padx=(8, 0))
+        self.cmb_borehole.bind("<<ComboboxSelected>>", self._on_borehole_selected)
 
         ttk.Label(borehole_frame, text="Отметка устья, м").grid(row=1, column=0, sticky="w")
         self.var_borehole_top = tk.StringVar(value="100")
@@ -396,26 +821,46 @@ class App:
             borehole_frame,
             text="Справочник грунтов",
             command=self._open_soil_dialog,
-        ).grid(row=0, column=2, rowspan=2, padx=(12, 0))
+        ).grid(row=0, column=2, padx=(12, 0))
+        ttk.Button(
+            borehole_frame,
+            text="Импорт слоёв CSV…",
+            command=self._import_layers,
+        ).grid(row=1, column=2, padx=(12, 0), sticky="we")
 
         layers_frame = ttk.LabelFrame(main_frame, text="Слои скважины")
         layers_frame.grid(row=2, column=0, sticky="nsew", pady=(12, 0))
         layers_frame.grid_columnconfigure(0, weight=1)
 
-        header = ttk.Frame(layers_frame)
+        layers_frame.grid_rowconfigure(0, weight=1)
+
+        self.rows_frame = ttk.Frame(layers_frame)
+        self.rows_frame.grid(row=0, column=0, sticky="nsew")
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+
+        header = ttk.Frame(self.rows_frame)
         header.grid(row=0, column=0, sticky="we")
         header.grid_columnconfigure(0, weight=1)
         ttk.Label(header, text="Грунт").grid(row=0, column=0, sticky="w")
         ttk.Label(header, text="Толщина, м").grid(row=0, column=1, padx=8)
 
-        self.layers_container = ttk.Frame(layers_frame)
+        self.layers_container = ttk.Frame(self.rows_frame)
         self.layers_container.grid(row=1, column=0, sticky="nsew")
         self.layers_container.grid_columnconfigure(0, weight=1)
 
-        ttk.Button(layers_frame, text="Добавить слой", command=self._add_layer_row).grid(
+        ttk.Button(self.rows_frame, text="Добавить слой", command=self._add_layer_row).grid(
             row=2, column=0, pady=(8, 0), sticky="w"
         )
 
+        self.layer_table = LayerTable(layers_frame, manager=self.soil_manager)
+        self.var_table_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            layers_frame,
+            text="Табличный редактор",
+            variable=self.var_table_mode,
+            command=self._toggle_layer_editor,
+        ).grid(row=1, column=0, pady=(8, 0), sticky="e")
+
         result_frame = ttk.Frame(main_frame)
         result_frame.grid(row=3, column=0, sticky="we", pady=(12, 0))
         ttk.Button(result_frame, text="Расчёт", command=self._calculate).grid(
@@ -453,8 +898,7 @@ class App:
                 mth=0.000051,
             ),
         ]
-        for soil in default_soils:
-            self.soil_manager.add(soil)
+        self.soil_manager.add_many(default_soils)
 
         self._add_layer_row()
         self._add_layer_row()
@@ -471,6 +915,7 @@ class App:
             self.layers_container,
             get_choices=self.soil_manager.choices,
             on_remove=self._remove_layer_row,
+            search=self.soil_manager.search,
         )
         self.layer_rows.append(row)
         self._regrid_layers()
@@ -485,10 +930,197 @@ class App:
         for idx, row in enumerate(self.layer_rows):
             row.grid(row=idx)
 
+    def _on_soils_changed(self, change: SoilChange) -> None:
+        # Подписи строятся из кода и названия, поэтому списки обновляются
+        # при любом изменении; сами списки берутся из кэша справочника.
+        self._update_layer_choices()
+
     def _update_layer_choices(self) -> None:
         for row in self.layer_rows:
             row.update_choices()
 
+    def _collect_layers(self) -> List[Tuple[str, float]]:
+        """Пары (код грунта, толщина) из активного редактора слоёв."""
+        if self.var_table_mode.get():
+            return self.layer_table.get_layers()
+        return [row.get_data() for row in self.layer_rows]
+
+    def _toggle_layer_editor(self) -> None:
+        table_mode = self.var_table_mode.get()
+        try:
+            if table_mode:
+                layers = [row.get_data() for row in self.layer_rows]
+            else:
+                layers = self.layer_table.get_layers()
+        except ValueError as exc:
+            self.var_table_mode.set(not table_mode)
+            show_error("Ошибка", str(exc))
+            return
+        if table_mode:
+            self.layer_table.set_layers(layers)
+            self.rows_frame.grid_remove()
+            self.layer_table.grid(row=0, column=0, sticky="nsew")
+            return
+        self._set_layer_rows(layers)
+        self.layer_table.grid_remove()
+        self.rows_frame.grid()
+
+    def _set_layer_rows(self, layers: Iterable[Tuple[str, float]]) -> None:
+        for row in self.layer_rows:
+            row.destroy()
+        self.layer_rows.clear()
+        for code, thickness in layers:
+            self._add_layer_row()
+            self.layer_rows[-1].set_values(soil_label(self.soil_manager.get(code)), thickness)
+
+    def _import_layers(self) -> None:
+        """Загружает из CSV слои скважины с текущим кодом, иначе первой в файле."""
+        path = ask_file()
+        if not path:
+            return
+        code = self.var_borehole_code.get().strip() or None
+        soils = {soil.code: soil for soil in self.soil_manager.items()}
+        try:
+            borehole = find_borehole(path, soils, code)
+            if borehole is None and code is not None:
+                borehole = find_borehole(path, soils)
+        except (OSError, ValueError) as exc:
+            show_error("Ошибка импорта", str(exc))
+            return
+        if borehole is None:
+            show_error("Ошибка импорта", "В файле нет слоёв скважин")
+            return
+        self._load_borehole(borehole)
+
+    def _load_borehole(self, borehole: Borehole) -> None:
+        """Показывает скважину в редакторе; виджеты создаются только для неё."""
+        self.var_borehole_code.set(borehole.code)
+        self.var_borehole_top.set(f"{borehole.z_top:g}")
+        layers = [(layer.soil.code, layer.thickness) for layer in borehole.layers]
+        if self.var_table_mode.get():
+            self.layer_table.set_layers(layers)
+        else:
+            self._set_layer_rows(layers)
+        self._current_borehole = borehole.code
+
+    def _editor_borehole(self) -> Borehole:
+        """Собирает скважину из полей редактора."""
+        borehole_code = self.var_borehole_code.get().strip()
+        if not borehole_code:
+            raise ValueError("Название скважины не задано")
+        borehole_top = self._parse_float(self.var_borehole_top.get())
+
+        layers = self._collect_layers()
+        if not layers:
+            raise ValueError("Не задан ни один слой скважины")
+
+        borehole = Borehole(code=borehole_code, z_top=borehole_top)
+        for soil_code, thickness in layers:
+            soil = self.soil_manager.get(soil_code)
+            borehole.add(soil, thickness)
+        return borehole
+
+    def _store_editor_borehole(self) -> None:
+        """Переносит скважину из редактора в список скважин проекта."""
+        borehole = self._editor_borehole()
+        if self._current_borehole is not None and self._current_borehole != borehole.code:
+            # скважина переименована в поле кода
+            self.boreholes.pop(self._current_borehole, None)
+        self.boreholes[borehole.code] = borehole
+        self._current_borehole = borehole.code
+
+    def _update_borehole_choices(self) -> None:
+        codes = list(self.boreholes)
+        if self._current_borehole is not None and self._current_borehole not in self.boreholes:
+            codes.insert(0, self._current_borehole)
+        self.cmb_borehole.configure(values=codes)
+
+    def _on_borehole_selected(self, _event: tk.Event) -> None:
+        code = self.var_borehole_code.get()
+        borehole = self.boreholes.get(code)
+        if borehole is None or code == self._current_borehole:
+            return
+        previous = self._current_borehole
+        self.var_borehole_code.set(previous or "")
+        try:
+            self._store_editor_borehole()
+        except ValueError as exc:
+            show_error("Ошибка", str(exc))
+            return
+        self._load_borehole(borehole)
+
+    def _project_state(self) -> Project:
+        self._store_editor_borehole()
+        settings = {
+            "inputs": {name: list(widget.get_state()) for name, widget in self.inputs.items()},
+            "table_mode": self.var_table_mode.get(),
+            "ki_engine": self._ki_engine(),
+            "borehole": self._current_borehole,
+        }
+        return Project(
+            soils=list(self.soil_manager.items()),
+            boreholes=list(self.boreholes.values()),
+            cases=list(self.project_cases),
+            settings=settings,
+        )
+
+    def _apply_project(self, project: Project) -> None:
+        with self.soil_manager.batch():
+            self.soil_manager.remove_many([soil.code for soil in self.soil_manager.items()])
+            self.soil_manager.add_many(project.soils)
+        self.boreholes = {borehole.code: borehole for borehole in project.boreholes}
+        self.project_cases = list(project.cases)
+        settings = project.settings
+        for name, state in settings.get("inputs", {}).items():
+            if name in self.inputs and len(state) == 2:
+                self.inputs[name].set_state(str(state[0]), str(state[1]))
+        self.var_ki_engine.set(
+            KI_ENGINE_LABELS.get(settings.get("ki_engine"), KI_ENGINE_LABELS["table"])
+        )
+        if bool(settings.get("table_mode", False)) != self.var_table_mode.get():
+            self.var_table_mode.set(not self.var_table_mode.get())
+            self._set_layer_rows([])
+            self.layer_table.set_layers([])
+            self._toggle_layer_editor()
+        current = self.boreholes.get(settings.get("borehole")) or next(
+            iter(self.boreholes.values()), None
+        )
+        if current is not None:
+            self._load_borehole(current)
+        else:
+            self._current_borehole = None
+            self._set_layer_rows([])
+            self.layer_table.set_layers([])
+
+    def _open_project(self) -> None:
+        path = ask_file()
+        if not path:
+            return
+        try:
+            project = load_project(path)
+        except (OSError, ValueError) as exc:
+            show_error("Ошибка открытия проекта", str(exc))
+            return
+        self._apply_project(project)
+
+    def _save_project(self) -> None:
+        try:
+            project = self._project_state()
+        except ValueError as exc:
+            show_error("Ошибка", str(exc))
+            return
+        path = ask_save_file(
+            filetypes=[("Проект (JSON)", "*.json"), ("Проект (двоичный)", "*.npz")],
+        )
+        if not path:
+            return
+        if not path.lower().endswith((".json", ".npz")):
+            path += ".json"
+        try:
+            save_project(project, path)
+        except (OSError, ValueError) as exc:
+            show_error("Ошибка сохранения проекта", str(exc))
+
     def _open_soil_dialog(self) -> None:
         if self.soil_dialog is not None and tk.Toplevel.winfo_exists(self.soil_dialog.window):
             self.soil_dialog.window.lift()
@@ -506,22 +1138,17 @@ class App:
         except ValueError as exc:
             raise ValueError("Ожидалось числовое значение") from exc
 
+    def _ki_engine(self) -> str:
+        label = self.var_ki_engine.get()
+        for engine, engine_label in KI_ENGINE_LABELS.items():
+            if engine_label == label:
+                return engine
+        return "table"
+
     def _calculate(self) -> None:
         try:
             params = {name: widget.get_value() for name, widget in self.inputs.items()}
-            borehole_code = self.var_borehole_code.get().strip()
-            if not borehole_code:
-                raise ValueError("Название скважины не задано")
-            borehole_top = self._parse_float(self.var_borehole_top.get())
-
-            if not self.layer_rows:
-                raise ValueError("Не задан ни один слой скважины")
-
-            borehole = Borehole(code=borehole_code, z_top=borehole_top)
-            for row in self.layer_rows:
-                soil_code, thickness = row.get_data()
-                soil = self.soil_manager.get(soil_code)
-                borehole.add(soil, thickness)
+            borehole = self._editor_borehole()
 
             result = disp_calculation(
                 borehole=borehole,
@@ -530,6 +1157,7 @@ class App:
                 F=params["F"],
                 a=params["a"],
                 b=params["b"],
+                engine=self._ki_engine(),
             )
             self.result_var.set(f"{result:.6f}")
         except Exception as exc:
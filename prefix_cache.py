@@ -0,0 +1,179 @@
+"""Повторное использование расчёта общих верхних слоёв у разных скважин.
+
+На площадке многие скважины начинаются одинаково (насыпь, затем суглинок
+той же мощности) и различаются только на глубине.  ``PrefixEngine``
+хранит состояние послойного расчёта (остаток Hc, напряжение sigmai,
+отметку, накопленные суммы sth и sp) в префиксном дереве: ребро — пара
+«объект грунта, толщина».  Для новой скважины общая с уже посчитанными
+часть разреза берётся из дерева, считаются только отличающиеся нижние
+слои.
+
+Деревья строятся отдельно для каждого набора (z_top, H, Hc) — а для sp и
+(a, b), — потому что расчёт ведётся в абсолютных отметках; результаты
+совпадают с ``disp_sth``/``disp_sp`` до бита.  Грунты считаются
+неизменяемыми: при правке грунта в месте (а не замене объекта) кэш нужно
+очистить через ``clear``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from borehole_class import Borehole
+from function_for_II_calculations import kh
+from II_calculations import full_displacment, ki_engine, sp_step, sth_step
+
+
+class _Node:
+    __slots__ = ("children", "soil", "state", "done")
+
+    def __init__(self, soil, state: Tuple[float, ...], done: bool) -> None:
+        self.children: Dict[Tuple[int, float], "_Node"] = {}
+        self.soil = soil        # ссылка держит объект грунта, чтобы id в ключе не переиспользовался
+        self.state = state
+        self.done = done        # ниже этого слоя вклад равен нулю
+
+
+@dataclass(slots=True)
+class PrefixStats:
+    """Сколько послойных шагов запрошено и сколько реально посчитано."""
+
+    layers_total: int = 0
+    layers_computed: int = 0
+
+    @property
+    def layers_reused(self) -> int:
+        return self.layers_total - self.layers_computed
+
+    @property
+    def saved_fraction(self) -> float:
+        return self.layers_reused / self.layers_total if self.layers_total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"слоёв запрошено: {self.layers_total}, посчитано: {self.layers_computed}, "
+            f"взято из кэша: {self.layers_reused} ({self.saved_fraction:.0%})"
+        )
+
+
+class PrefixEngine:
+    """Расчёт sth и sp с общими префиксами разрезов."""
+
+    def __init__(self) -> None:
+        self._sth_roots: Dict[Tuple[float, float, float], _Node] = {}
+        self._sp_roots: Dict[Tuple[float, float, float, float, float, str], _Node] = {}
+        self.stats = PrefixStats()
+
+    def clear(self) -> None:
+        self._sth_roots.clear()
+        self._sp_roots.clear()
+        self.stats = PrefixStats()
+
+    def _walk(self, node: _Node, borehole: Borehole, step) -> _Node:
+        stats = self.stats
+        for layer in borehole.layers:
+            if node.done:
+                break
+            stats.layers_total += 1
+            key = (id(layer.soil), layer.thickness)
+            child = node.children.get(key)
+            if child is None:
+                stats.layers_computed += 1
+                state, done = step(layer, node.state)
+                child = node.children[key] = _Node(layer.soil, state, done)
+            node = child
+        return node
+
+    def disp_sth(self, borehole: Borehole, Hc: float, H: float) -> float:
+        if Hc < 0:
+            raise ValueError("Hc должно быть ≥ 0.")
+        key = (borehole.z_top, H, Hc)
+        root = self._sth_roots.get(key)
+        if root is None:
+            # состояние: (сумма sth, остаток Hc, sigmai, отметка верха слоя)
+            root = self._sth_roots[key] = _Node(None, (0.0, Hc, 0, borehole.z_top), Hc <= 0)
+
+        def step(layer, state):
+            total, remaining, sigmai, top = state
+            value, remaining, sigmai, top = sth_step(
+                layer.soil, layer.thickness, H, remaining, sigmai, top
+            )
+            return (total + value, remaining, sigmai, top), remaining <= 0
+
+        return self._walk(root, borehole, step).state[0]
+
+    def disp_sp(
+        self,
+        borehole: Borehole,
+        F: float,
+        a: float,
+        b: float,
+        Hc: float,
+        H: float,
+        engine: str = "table",
+    ) -> float:
+        ki_func = ki_engine(engine)
+        key = (borehole.z_top, H, Hc, a, b, engine)
+        target_bottom = H - Hc
+        root = self._sp_roots.get(key)
+        if root is None:
+            # состояние: (сумма слагаемых sp, отметка верха слоя)
+            root = self._sp_roots[key] = _Node(None, (0.0, borehole.z_top), False)
+
+        def step(layer, state):
+            total, top = state
+            term, top = sp_step(layer.soil, layer.thickness, top, a, b, H, target_bottom, ki_func)
+            return (total + term, top), top <= target_bottom
+
+        total = self._walk(root, borehole, step).state[0]
+        p0 = F / (a * b)
+        return total * p0 * b * kh(z=Hc, b=b)
+
+    def settlement(
+        self,
+        borehole: Borehole,
+        *,
+        Hc: float,
+        H: float,
+        F: float,
+        a: float,
+        b: float,
+        engine: str = "table",
+    ) -> float:
+        sth = self.disp_sth(borehole, Hc=Hc, H=H)
+        sp = self.disp_sp(borehole, F=F, a=a, b=b, Hc=Hc, H=H, engine=engine)
+        return full_displacment(sth, sp)
+
+
+def settle_many(
+    boreholes: Iterable[Borehole],
+    *,
+    Hc: Union[float, Sequence[float]],
+    H: float,
+    F: float,
+    a: float,
+    b: float,
+    engine: str = "table",
+    prefix: Optional[PrefixEngine] = None,
+) -> Tuple[List[float], PrefixStats]:
+    """Осадки фундамента на каждой скважине площадки и статистика экономии.
+
+    ``Hc`` — общая глубина оттаивания или своя для каждой скважины
+    (например, строка матрицы ``thaw_depth.thaw_hc``).
+    """
+    prefix = prefix if prefix is not None else PrefixEngine()
+    boreholes = list(boreholes)
+    if np.ndim(Hc) == 0:
+        depths = [float(Hc)] * len(boreholes)
+    else:
+        try:
+            depths = np.broadcast_to(np.asarray(Hc, dtype=float), (len(boreholes),)).tolist()
+        except ValueError:
+            raise ValueError("Число значений Hc должно совпадать с числом скважин.") from None
+    results = [
+        prefix.settlement(bh, Hc=hc, H=H, F=F, a=a, b=b, engine=engine)
+        for bh, hc in zip(boreholes, depths)
+    ]
+    return results, prefix.stats
@@ -0,0 +1,291 @@
+"""Сохранение и загрузка проекта: грунты, скважины, расчётные случаи, настройки.
+
+Поддерживаются два формата, выбор — по расширению файла:
+
+* ``.json`` — читаемый текст;
+* ``.npz`` — компактный двоичный архив NumPy.  Слои всех скважин лежат в
+  общих массивах (индекс грунта и толщина), границы скважин заданы
+  массивом смещений, поэтому объём файла и время чтения почти не зависят
+  от числа скважин.  Архив читается без ``pickle``.
+"""
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from borehole_class import Borehole, BoreholeLayer
+from grunt_class import PHASE_FIELDS, PermafrostSoil, Phase, SoilType
+
+PROJECT_FORMAT = "mmg-project"
+PROJECT_VERSION = 1
+
+
+@dataclass(slots=True, kw_only=True)
+class ProjectCase:
+    """Расчётный случай фундамента, сохраняемый в проекте."""
+
+    name: str
+    Hc: float
+    F: float
+    a: float
+    b: float
+    H: float
+
+
+@dataclass(slots=True)
+class Project:
+    soils: List[PermafrostSoil] = field(default_factory=list)
+    boreholes: List[Borehole] = field(default_factory=list)
+    cases: List[ProjectCase] = field(default_factory=list)
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+
+def _suffix(path: str) -> str:
+    dot = path.rfind(".")
+    return path[dot:].lower() if dot >= 0 else ""
+
+
+def save_project(project: Project, path: str) -> None:
+    suffix = _suffix(path)
+    if suffix == ".json":
+        _save_json(project, path)
+    elif suffix == ".npz":
+        _save_npz(project, path)
+    else:
+        raise ValueError(f"Неизвестный формат проекта {path!r}. Допустимо: .json, .npz")
+
+
+def load_project(path: str) -> Project:
+    suffix = _suffix(path)
+    if suffix == ".json":
+        return _load_json(path)
+    if suffix == ".npz":
+        return _load_npz(path)
+    raise ValueError(f"Неизвестный формат проекта {path!r}. Допустимо: .json, .npz")
+
+
+def _soil_index(project: Project) -> Dict[str, int]:
+    index: Dict[str, int] = {}
+    for i, soil in enumerate(project.soils):
+        if soil.code in index:
+            raise ValueError(f"Грунт {soil.code!r} встречается в проекте дважды.")
+        index[soil.code] = i
+    for borehole in project.boreholes:
+        for layer in borehole.layers:
+            if layer.soil.code not in index:
+                raise ValueError(
+                    f"Грунт {layer.soil.code!r} скважины {borehole.code!r} отсутствует в справочнике."
+                )
+    return index
+
+
+def _make_soil(
+    code, name, soil_type, rho, Ath, mth, thawed=None, frozen=None
+) -> PermafrostSoil:
+    try:
+        soil_type = SoilType[soil_type]
+    except KeyError:
+        raise ValueError(f"Неизвестный тип грунта: {soil_type!r}") from None
+    return PermafrostSoil(
+        code=code, name=name, soil_type=soil_type, rho=rho, Ath=Ath, mth=mth,
+        thawed=Phase(**(thawed or {})), frozen=Phase(**(frozen or {})),
+    )
+
+
+def _phase_dict(phase: Phase) -> Dict[str, float]:
+    values = ((name, getattr(phase, name)) for name in PHASE_FIELDS)
+    return {name: value for name, value in values if value is not None}
+
+
+def _check_header(fmt: object, version: object) -> None:
+    if fmt != PROJECT_FORMAT:
+        raise ValueError("Файл не является проектом.")
+    if not isinstance(version, int) or version > PROJECT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия проекта: {version!r}")
+
+
+# --- JSON ---
+
+def _save_json(project: Project, path: str) -> None:
+    _soil_index(project)
+    data = {
+        "format": PROJECT_FORMAT,
+        "version": PROJECT_VERSION,
+        "soils": [
+            {
+                "code": s.code,
+                "name": s.name,
+                "soil_type": s.soil_type.name,
+                "rho": s.rho,
+                "Ath": s.Ath,
+                "mth": s.mth,
+                "thawed": _phase_dict(s.thawed),
+                "frozen": _phase_dict(s.frozen),
+            }
+            for s in project.soils
+        ],
+        "boreholes": [
+            {
+                "code": bh.code,
+                "z_top": bh.z_top,
+                "layers": [[layer.soil.code, layer.thickness] for layer in bh.layers],
+            }
+            for bh in project.boreholes
+        ],
+        "cases": [asdict(case) for case in project.cases],
+        "settings": project.settings,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=1)
+
+
+def _load_json(path: str) -> Project:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    if not isinstance(data, dict):
+        raise ValueError("Файл не является проектом.")
+    _check_header(data.get("format"), data.get("version"))
+    try:
+        soils = [
+            _make_soil(
+                s["code"], s["name"], s["soil_type"], s["rho"], s.get("Ath"), s.get("mth"),
+                s.get("thawed"), s.get("frozen"),
+            )
+            for s in data["soils"]
+        ]
+        by_code = {soil.code: soil for soil in soils}
+        boreholes = []
+        for bh in data["boreholes"]:
+            borehole = Borehole(code=bh["code"], z_top=bh["z_top"])
+            for soil_code, thickness in bh["layers"]:
+                soil = by_code.get(soil_code)
+                if soil is None:
+                    raise ValueError(f"Скважина {bh['code']!r}: неизвестный грунт {soil_code!r}")
+                borehole.add(soil, thickness)
+            boreholes.append(borehole)
+        cases = [ProjectCase(**case) for case in data.get("cases", [])]
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"Повреждённый файл проекта: {exc}") from None
+    return Project(soils, boreholes, cases, dict(data.get("settings", {})))
+
+
+# --- NPZ ---
+
+def _optional(values) -> np.ndarray:
+    return np.array([math.nan if v is None else v for v in values], dtype=float)
+
+
+def _phase_table(phases) -> np.ndarray:
+    rows = [_optional(getattr(p, name) for name in PHASE_FIELDS) for p in phases]
+    return np.array(rows, dtype=float).reshape(-1, len(PHASE_FIELDS))
+
+
+def _phase_from_row(row) -> Dict[str, float]:
+    return {name: float(v) for name, v in zip(PHASE_FIELDS, row) if not math.isnan(v)}
+
+
+def _save_npz(project: Project, path: str) -> None:
+    index = _soil_index(project)
+    soils = project.soils
+    boreholes = project.boreholes
+    counts = [len(bh.layers) for bh in boreholes]
+    offsets = np.zeros(len(boreholes) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    layer_soil = np.fromiter(
+        (index[layer.soil.code] for bh in boreholes for layer in bh.layers),
+        dtype=np.int32,
+        count=int(offsets[-1]),
+    )
+    layer_thickness = np.fromiter(
+        (layer.thickness for bh in boreholes for layer in bh.layers),
+        dtype=float,
+        count=int(offsets[-1]),
+    )
+    meta = {
+        "format": PROJECT_FORMAT,
+        "version": PROJECT_VERSION,
+        "settings": project.settings,
+    }
+    np.savez_compressed(
+        path,
+        meta=np.array(json.dumps(meta, ensure_ascii=False)),
+        soil_code=np.array([s.code for s in soils], dtype=str),
+        soil_name=np.array([s.name for s in soils], dtype=str),
+        soil_type=np.array([s.soil_type.name for s in soils], dtype=str),
+        soil_rho=np.array([s.rho for s in soils], dtype=float),
+        soil_Ath=_optional(s.Ath for s in soils),
+        soil_mth=_optional(s.mth for s in soils),
+        soil_thawed=_phase_table(s.thawed for s in soils),
+        soil_frozen=_phase_table(s.frozen for s in soils),
+        borehole_code=np.array([bh.code for bh in boreholes], dtype=str),
+        borehole_z_top=np.array([bh.z_top for bh in boreholes], dtype=float),
+        borehole_offset=offsets,
+        layer_soil=layer_soil,
+        layer_thickness=layer_thickness,
+        case_name=np.array([c.name for c in project.cases], dtype=str),
+        case_values=np.array(
+            [[c.Hc, c.F, c.a, c.b, c.H] for c in project.cases], dtype=float
+        ).reshape(-1, 5),
+    )
+
+
+def _load_npz(path: str) -> Project:
+    with np.load(path, allow_pickle=False) as npz:
+        try:
+            meta = json.loads(str(npz["meta"]))
+            _check_header(meta.get("format"), meta.get("version"))
+            n_soils = len(npz["soil_code"])
+            # в проектах без теплофизических свойств массивов фаз нет
+            empty = np.full((n_soils, len(PHASE_FIELDS)), math.nan)
+            thawed = npz["soil_thawed"] if "soil_thawed" in npz.files else empty
+            frozen = npz["soil_frozen"] if "soil_frozen" in npz.files else empty
+            soils = [
+                _make_soil(
+                    code, name, soil_type, float(rho),
+                    None if math.isnan(Ath) else float(Ath),
+                    None if math.isnan(mth) else float(mth),
+                    _phase_from_row(th), _phase_from_row(fr),
+                )
+                for code, name, soil_type, rho, Ath, mth, th, fr in zip(
+                    npz["soil_code"].tolist(),
+                    npz["soil_name"].tolist(),
+                    npz["soil_type"].tolist(),
+                    npz["soil_rho"].tolist(),
+                    npz["soil_Ath"].tolist(),
+                    npz["soil_mth"].tolist(),
+                    thawed.tolist(),
+                    frozen.tolist(),
+                )
+            ]
+            offsets = npz["borehole_offset"].tolist()
+            layer_soil = npz["layer_soil"]
+            layer_thickness = npz["layer_thickness"]
+            if len(layer_soil) and (layer_soil.min() < 0 or layer_soil.max() >= len(soils)):
+                raise ValueError("Повреждённый файл проекта: неверный индекс грунта.")
+            if np.any(layer_thickness <= 0):
+                raise ValueError("Повреждённый файл проекта: толщина слоя должна быть > 0 м.")
+            layer_soil = layer_soil.tolist()
+            layer_thickness = layer_thickness.tolist()
+            boreholes = []
+            for i, (code, z_top) in enumerate(
+                zip(npz["borehole_code"].tolist(), npz["borehole_z_top"].tolist())
+            ):
+                start, stop = offsets[i], offsets[i + 1]
+                # толщины уже проверены, слои собираются без повторной проверки в add()
+                layers = [
+                    BoreholeLayer(soil=soils[s], thickness=h)
+                    for s, h in zip(layer_soil[start:stop], layer_thickness[start:stop])
+                ]
+                boreholes.append(Borehole(code=code, z_top=z_top, layers=layers))
+            cases = [
+                ProjectCase(name=name, Hc=v[0], F=v[1], a=v[2], b=v[3], H=v[4])
+                for name, v in zip(npz["case_name"].tolist(), npz["case_values"].tolist())
+            ]
+        except KeyError as exc:
+            raise ValueError(f"Повреждённый файл проекта: нет массива {exc}") from None
+    return Project(soils, boreholes, cases, dict(meta.get("settings", {})))
+
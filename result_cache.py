@@ -0,0 +1,259 @@
+"""Постоянный кэш результатов расчёта осадки в файле SQLite.
+
+Ключ — SHA-256 канонического JSON с исходными данными: параметры грунтов
+(тип, плотность, Ath, mth), стратиграфия скважины, параметры фундамента,
+способ расчёта k_i и версия таблиц коэффициентов.  Версия вычисляется по
+исходному тексту ``function_for_II_calculations`` и ``stress_engine``,
+поэтому любое изменение таблиц даёт новые ключи, а записи со старой
+версией удаляются при открытии кэша.
+
+Каждый процесс открывает собственный ``ResultCache`` на один и тот же файл:
+база работает в режиме WAL, запись идёт короткими транзакциями
+``BEGIN IMMEDIATE`` с ожиданием блокировки.  Размер ограничен числом
+записей; при превышении удаляются давно не использованные (LRU).  Время
+последнего обращения при чтении запоминается в памяти и записывается в
+базу вместе с ближайшей записью или вытеснением, поэтому попадание в кэш
+не требует транзакции записи.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+import function_for_II_calculations
+import stress_engine
+from borehole_class import Borehole
+from II_calculations import disp_sp, disp_sth, full_displacment
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    sth REAL NOT NULL,
+    sp REAL NOT NULL,
+    total REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used);
+"""
+
+
+@lru_cache(maxsize=None)
+def tables_version() -> str:
+    """Версия таблиц коэффициентов — хэш исходного текста модулей с ними."""
+    digest = hashlib.sha256()
+    for module in (function_for_II_calculations, stress_engine):
+        digest.update(inspect.getsource(module).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _num(value: Optional[float]) -> Optional[str]:
+    # float.hex сохраняет значение точно и не зависит от форматирования
+    return None if value is None else float(value).hex()
+
+
+def cache_key(
+    borehole: Borehole,
+    Hc: float,
+    H: float,
+    F: float,
+    a: float,
+    b: float,
+    engine: str = "table",
+) -> str:
+    """Канонический хэш исходных данных расчёта.
+
+    Коды и названия грунтов и скважины в ключ не входят: одинаковые по
+    содержанию данные дают один ключ независимо от подписей.
+    """
+    payload = {
+        "tables": tables_version(),
+        "z_top": _num(borehole.z_top),
+        "layers": [
+            [
+                layer.soil.soil_type.value,
+                _num(layer.soil.rho),
+                _num(getattr(layer.soil, "Ath", None)),
+                _num(getattr(layer.soil, "mth", None)),
+                _num(layer.thickness),
+            ]
+            for layer in borehole.layers
+        ],
+        "foundation": [_num(Hc), _num(H), _num(F), _num(a), _num(b)],
+        "engine": engine,
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResult:
+    """Осадка и её составляющие."""
+
+    sth: float
+    sp: float
+    total: float
+
+
+class ResultCache:
+    """Кэш результатов в файле ``path`` с ограничением ``max_entries``."""
+
+    def __init__(self, path: str, *, max_entries: int = 100_000, timeout: float = 30.0) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries должно быть > 0.")
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._touched: Dict[str, float] = {}  # ключ → время обращения, ещё не записанное
+        self._conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._check_version()
+
+    def _check_version(self) -> None:
+        version = tables_version()
+        with self._write() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'tables'").fetchone()
+            if row is None or row[0] != version:
+                conn.execute("DELETE FROM results")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta(name, value) VALUES ('tables', ?)", (version,)
+                )
+
+    def _write(self):
+        return _Transaction(self._conn, self._lock)
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Записывает накопленные обращения; вызывается внутри транзакции записи."""
+        if self._touched:
+            # MAX: запись могла быть перезаписана позже обращения
+            conn.executemany(
+                "UPDATE results SET last_used = MAX(last_used, ?) WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sth, sp, total FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._touched[key] = time.time()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResult(*row)
+
+    def flush(self) -> None:
+        """Записывает в базу время обращений, накопленное при чтении."""
+        with self._write() as conn:
+            self._flush_touches(conn)
+
+    def put(self, key: str, result: CachedResult) -> None:
+        with self._write() as conn:
+            self._flush_touches(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO results(key, sth, sp, total, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, result.sth, result.sp, result.total, time.time()),
+            )
+        self._puts += 1
+        # проверка размера раз в несколько записей, чтобы не считать COUNT на каждой
+        if self._puts % 64 == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Удаляет давно не использованные записи сверх ``max_entries``."""
+        with self._write() as conn:
+            self._flush_touches(conn)
+            (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        return excess
+
+    def calculate(
+        self,
+        borehole: Borehole,
+        Hc: float,
+        H: float,
+        F: float,
+        a: float,
+        b: float,
+        engine: str = "table",
+    ) -> CachedResult:
+        """Возвращает результат из кэша или считает и сохраняет его."""
+        key = cache_key(borehole, Hc=Hc, H=H, F=F, a=a, b=b, engine=engine)
+        result = self.get(key)
+        if result is None:
+            sth = disp_sth(borehole=borehole, Hc=Hc, H=H)
+            sp = disp_sp(borehole=borehole, F=F, a=a, b=b, Hc=Hc, H=H, engine=engine)
+            result = CachedResult(sth, sp, full_displacment(sth, sp))
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        with self._write() as conn:
+            self._touched.clear()
+            conn.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Transaction:
+    """Короткая транзакция записи: блокировка потока и ``BEGIN IMMEDIATE``."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
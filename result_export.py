@@ -0,0 +1,289 @@
+"""Постолбцовая выгрузка результатов пакетных расчётов.
+
+Результаты пишутся по мере получения, память не зависит от числа строк:
+
+* ``.csv`` — построчно через ``csv.writer``;
+* ``.npy`` — структурированный массив NumPy; строки дописываются в конец
+  файла, заголовок с итоговым числом строк перезаписывается при закрытии.
+  Файл читается без копирования через ``np.load(..., mmap_mode="r")``;
+* ``.parquet`` — группами строк через ``pyarrow``, если он установлен.
+
+Сводная таблица (``RESULT_DTYPE``) содержит строку на фундамент и случай,
+послойная (``LAYER_DTYPE``) — вклад каждого слоя в sth и sp.  Строковые
+поля в ``.npy`` имеют фиксированную ширину (32 символа).
+"""
+from __future__ import annotations
+
+import abc
+import csv
+import struct
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from borehole_class import Borehole
+from II_calculations import full_displacment, sp_terms, sth_layers
+
+try:  # pyarrow необязателен: без него недоступна только выгрузка в Parquet
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - зависит от окружения
+    pa = None
+    pq = None
+
+RESULT_DTYPE = np.dtype(
+    [
+        ("borehole", "U32"),
+        ("case", "U32"),
+        ("Hc", "f8"),
+        ("H", "f8"),
+        ("F", "f8"),
+        ("a", "f8"),
+        ("b", "f8"),
+        ("p0", "f8"),
+        ("kh", "f8"),
+        ("sth", "f8"),
+        ("sp", "f8"),
+        ("total", "f8"),
+    ]
+)
+
+LAYER_DTYPE = np.dtype(
+    [
+        ("borehole", "U32"),
+        ("case", "U32"),
+        ("layer", "i4"),
+        ("soil", "U32"),
+        ("thickness", "f8"),
+        ("sth", "f8"),
+        ("sp", "f8"),
+    ]
+)
+
+Row = Tuple[object, ...]
+
+
+def settlement_rows(
+    borehole: Borehole,
+    case: str,
+    *,
+    Hc: float,
+    H: float,
+    F: float,
+    a: float,
+    b: float,
+    engine: str = "table",
+) -> Tuple[Row, List[Row]]:
+    """Сводная строка результата и послойные строки для одного случая."""
+    sth = sth_layers(borehole=borehole, Hc=Hc, H=H)
+    terms, p0, khcalc = sp_terms(borehole, F=F, a=a, b=b, Hc=Hc, H=H, engine=engine)
+    sth_total = sum(sth, 0.0)
+    sp_total = sum(terms, 0.0) * p0 * b * khcalc
+    summary = (
+        borehole.code, case, Hc, H, F, a, b, p0, khcalc,
+        sth_total, sp_total, full_displacment(sth_total, sp_total),
+    )
+    layers = [
+        (borehole.code, case, i, layer.soil.code, layer.thickness, sth[i], terms[i] * p0 * b * khcalc)
+        for i, layer in enumerate(borehole.layers)
+    ]
+    return summary, layers
+
+
+class ResultWriter(abc.ABC):
+    """Базовый класс записи: ``write`` принимает порцию кортежей по ``dtype``."""
+
+    def __init__(self, path: str, dtype: np.dtype) -> None:
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+
+    @abc.abstractmethod
+    def write(self, rows: Sequence[Row]) -> None:
+        """Дописывает порцию строк."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CsvResultWriter(ResultWriter):
+    def __init__(self, path: str, dtype: np.dtype, *, delimiter: str = ",") -> None:
+        super().__init__(path, dtype)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file, delimiter=delimiter)
+        self._writer.writerow(self.dtype.names)
+
+    def write(self, rows: Sequence[Row]) -> None:
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class NpyResultWriter(ResultWriter):
+    """Запись структурированного массива в ``.npy`` без удержания его в памяти."""
+
+    _HEADER_SIZE = 256  # резерв под заголовок с любым числом строк
+
+    def __init__(self, path: str, dtype: np.dtype) -> None:
+        super().__init__(path, dtype)
+        self._file = open(path, "wb")
+        self._file.write(self._header(0))
+
+    def _header(self, count: int) -> bytes:
+        descr = np.lib.format.dtype_to_descr(self.dtype)
+        text = f"{{'descr': {descr!r}, 'fortran_order': False, 'shape': ({count},), }}"
+        prefix = np.lib.format.magic(1, 0)
+        body_size = self._HEADER_SIZE - len(prefix) - 2
+        body = text.encode("latin1")
+        if len(body) + 1 > body_size:
+            raise ValueError("Слишком длинное описание структуры для заголовка .npy.")
+        body = body.ljust(body_size - 1) + b"\n"
+        return prefix + struct.pack("<H", body_size) + body
+
+    def write(self, rows: Sequence[Row]) -> None:
+        if not rows:
+            return
+        self._file.write(np.array(rows, dtype=self.dtype).tobytes())
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header(self.rows))
+        self._file.close()
+
+
+class ParquetResultWriter(ResultWriter):
+    def __init__(self, path: str, dtype: np.dtype) -> None:
+        if pq is None:
+            raise ValueError("Для выгрузки в Parquet нужен пакет pyarrow.")
+        super().__init__(path, dtype)
+        fields = []
+        for name in self.dtype.names:
+            kind = self.dtype[name]
+            fields.append((name, pa.string() if kind.kind == "U" else pa.from_numpy_dtype(kind)))
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: Sequence[Row]) -> None:
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self._schema)],
+            schema=self._schema,
+        ))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class BufferedWriter(ResultWriter):
+    """Копит строки и передаёт их ``target`` порциями по ``chunk_size``."""
+
+    def __init__(self, target: ResultWriter, chunk_size: int = 8192) -> None:
+        super().__init__(target.path, target.dtype)
+        self.target = target
+        self.chunk_size = chunk_size
+        self._pending: List[Row] = []
+
+    def write(self, rows: Sequence[Row]) -> None:
+        self._pending.extend(rows)
+        self.rows += len(rows)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def append(self, row: Row) -> None:
+        self.write((row,))
+
+    def flush(self) -> None:
+        if self._pending:
+            self.target.write(self._pending)
+            self._pending = []
+
+    def close(self) -> None:
+        self.flush()
+        self.target.close()
+
+
+_WRITERS = {
+    ".csv": CsvResultWriter,
+    ".npy": NpyResultWriter,
+    ".parquet": ParquetResultWriter,
+}
+
+
+def _suffix(path: str) -> str:
+    dot = path.rfind(".")
+    return path[dot:].lower() if dot >= 0 else ""
+
+
+def open_writer(path: str, dtype: np.dtype = RESULT_DTYPE, *, chunk_size: int = 8192) -> BufferedWriter:
+    """Открывает буферизованную запись; формат выбирается по расширению."""
+    writer_cls = _WRITERS.get(_suffix(path))
+    if writer_cls is None:
+        allowed = ", ".join(_WRITERS)
+        raise ValueError(f"Неизвестный формат файла {path!r}. Допустимо: {allowed}")
+    return BufferedWriter(writer_cls(path, dtype), chunk_size=chunk_size)
+
+
+def read_results(path: str, dtype: np.dtype = RESULT_DTYPE):
+    """Читает выгруженные результаты.
+
+    ``.npy`` отображается в память (без копирования), ``.parquet``
+    возвращается как ``pyarrow.Table`` поверх отображённого файла, ``.csv``
+    разбирается в структурированный массив.
+    """
+    suffix = _suffix(path)
+    if suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if suffix == ".parquet":
+        if pq is None:
+            raise ValueError("Для чтения Parquet нужен пакет pyarrow.")
+        return pq.read_table(path, memory_map=True)
+    if suffix == ".csv":
+        return np.genfromtxt(
+            path, delimiter=",", names=True, dtype=dtype, encoding="utf-8", ndmin=1
+        )
+    raise ValueError(f"Неизвестный формат файла {path!r}")
+
+
+def export_cases(
+    borehole: Borehole,
+    cases: Iterable,
+    path: str,
+    *,
+    layers_path: Optional[str] = None,
+) -> int:
+    """Считает случаи прогона (``sweep.SweepCase``) и выгружает результаты.
+
+    Сводка пишется в ``path``, послойная разбивка — в ``layers_path``.
+    Возвращает число записанных случаев.
+    """
+    with open_writer(path, RESULT_DTYPE) as summary_out:
+        layer_out = open_writer(layers_path, LAYER_DTYPE) if layers_path else None
+        try:
+            for case in cases:
+                summary, layers = settlement_rows(
+                    borehole, case.curve, Hc=case.Hc, H=case.H, F=case.F, a=case.a, b=case.b
+                )
+                summary_out.append(summary)
+                if layer_out is not None:
+                    layer_out.write(layers)
+        finally:
+            if layer_out is not None:
+                layer_out.close()
+        return summary_out.rows
@@ -0,0 +1,152 @@
+"""Чувствительность осадки к параметрам грунтов и фундамента за один проход.
+
+Вместе с ``disp_sth``/``disp_sp`` считаются производные осадки по Ath, mth
+и rho каждого слоя, по нагрузке F и по ширине b.  Значения совпадают с
+``disp_sth``/``disp_sp`` до бита, производные — точные для кусочно-
+линейных таблиц:
+
+* sth линейна по Ath и mth слоя; rho входит через sigmai во все нижележащие
+  слои, поэтому ∂sth/∂rho собирается одной обратной суммой по слоям, а не
+  отдельным проходом на каждый слой;
+* sp = (Σ mth·kmui·Δk_i)·F/a·kh — линейна по mth и F; от b зависят только
+  k_i (билинейная таблица 7.7, ``ki_grad``), kh и kmui кусочно-постоянны
+  и производной по b не дают (на границах интервалов — скачок, он не
+  учитывается).
+
+Производные берутся по каждому слою: если один грунт встречается в
+нескольких слоях, полная производная по его параметру — сумма по ним
+(``Sensitivity.per_soil``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from borehole_class import Borehole
+from function_for_II_calculations import kh, ki_grad
+from II_calculations import segment_kmui, sp_segments, sp_term, sth_step_partials
+
+# gamma_kNm3 = rho · G_KN
+G_KN = 9.81 / 1000.0
+
+
+@dataclass(slots=True)
+class Sensitivity:
+    """Осадка и её производные по параметрам."""
+
+    sth: float
+    sp: float
+    dAth: np.ndarray      # ∂s/∂Ath по слоям
+    dmth: np.ndarray      # ∂s/∂mth по слоям
+    drho: np.ndarray      # ∂s/∂rho по слоям
+    dF: float
+    db: float
+    soil_codes: List[str]
+
+    @property
+    def total(self) -> float:
+        return self.sth + self.sp
+
+    @property
+    def gradient(self) -> np.ndarray:
+        """Вектор [∂Ath…, ∂mth…, ∂rho…, ∂F, ∂b] в порядке ``names``."""
+        return np.concatenate([self.dAth, self.dmth, self.drho, [self.dF, self.db]])
+
+    @property
+    def names(self) -> List[str]:
+        n = len(self.soil_codes)
+        return (
+            [f"Ath[{i}]" for i in range(n)]
+            + [f"mth[{i}]" for i in range(n)]
+            + [f"rho[{i}]" for i in range(n)]
+            + ["F", "b"]
+        )
+
+    def per_soil(self) -> Dict[str, Tuple[float, float, float]]:
+        """Производные (∂Ath, ∂mth, ∂rho), просуммированные по кодам грунтов."""
+        out: Dict[str, Tuple[float, float, float]] = {}
+        for i, code in enumerate(self.soil_codes):
+            dA, dm, dr = out.get(code, (0.0, 0.0, 0.0))
+            out[code] = (dA + self.dAth[i], dm + self.dmth[i], dr + self.drho[i])
+        return out
+
+
+def sth_grad(
+    borehole: Borehole, Hc: float, H: float
+) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray]:
+    """sth и производные по Ath, mth, rho каждого слоя.
+
+    Проход сверху вниз по ``sth_step_partials`` запоминает для слоя k:
+    ``pre`` — вес gamma_k в sigmai середины самого слоя, ``post`` — в sigmai
+    всех слоёв ниже, ``w`` = take·mth.  Тогда
+    ∂sth/∂gamma_k = pre_k·w_k + post_k·Σ_{l>k} w_l.
+    """
+    if Hc < 0:
+        raise ValueError("Hc должно быть ≥ 0.")
+    n = len(borehole.layers)
+    # столбцы: ∂/∂Ath, ∂/∂mth, pre, post
+    partials = np.zeros((n, 4))
+    values = [0.0] * n
+
+    remaining = Hc
+    sigmai = 0
+    curenztop = borehole.z_top
+    for i, layer in enumerate(borehole.layers):
+        if remaining <= 0:
+            break
+        values[i], remaining, sigmai, curenztop, partials[i] = sth_step_partials(
+            layer.soil, layer.thickness, H, remaining, sigmai, curenztop
+        )
+
+    dAth, dmth, pre, post = partials.T
+    w = dAth * np.array([layer.soil.mth for layer in borehole.layers], dtype=float)
+    below = np.concatenate([np.cumsum(w[::-1])[::-1][1:], [0.0]])
+    drho = (pre * w + post * below) * G_KN
+    return sum(values, 0.0), dAth.copy(), dmth.copy(), drho
+
+
+def sp_grad(
+    borehole: Borehole, F: float, a: float, b: float, Hc: float, H: float
+) -> Tuple[float, np.ndarray, float, float]:
+    """sp и производные по mth каждого слоя, по F и по b (табличный k_i)."""
+    terms = [0.0] * len(borehole.layers)
+    dmth = np.zeros(len(borehole.layers))
+    dsum_db = 0.0
+    for i, soil, (d_top, d_bottom) in sp_segments(borehole, Hc=Hc, H=H):
+        kmuicalc = segment_kmui(soil, d_top, d_bottom, b)
+        ki_top, dki_top = ki_grad(a=a, b=b, z=d_top)
+        ki_bottom, dki_bottom = ki_grad(a=a, b=b, z=d_bottom)
+        terms[i] = sp_term(soil, kmuicalc, ki_top, ki_bottom)
+        dmth[i] = kmuicalc * (ki_bottom - ki_top)
+        dsum_db += soil.mth * kmuicalc * (dki_bottom - dki_top)
+
+    p0 = F / (a * b)
+    khcalc = kh(z=Hc, b=b)
+    total = sum(terms, 0.0)
+    # p0·b = F/a от b не зависит
+    scale = p0 * b * khcalc
+    return total * p0 * b * khcalc, dmth * scale, total / a * khcalc, dsum_db * scale
+
+
+def disp_sensitivity(
+    borehole: Borehole, Hc: float, H: float, F: float, a: float, b: float, engine: str = "table"
+) -> Sensitivity:
+    """Осадка и все производные за один проход по слоям."""
+    if engine != "table":
+        raise ValueError(
+            "Чувствительности считаются только для табличного k_i (engine='table')."
+        )
+    sth, dAth, dmth_th, drho = sth_grad(borehole, Hc=Hc, H=H)
+    sp, dmth_p, dF, db = sp_grad(borehole, F=F, a=a, b=b, Hc=Hc, H=H)
+    return Sensitivity(
+        sth=sth,
+        sp=sp,
+        dAth=dAth,
+        dmth=dmth_th + dmth_p,
+        drho=drho,
+        dF=dF,
+        db=db,
+        soil_codes=[layer.soil.code for layer in borehole.layers],
+    )
@@ -0,0 +1,265 @@
+"""Подбор размеров фундаментов здания по осадке и разности осадок.
+
+Для каждого фундамента подбирается наименьшая по площади подошва a×b из
+сетки кандидатов (ширина b с шагом ``step``, отношения a/b из ``ratios``),
+при которой осадка не превышает предельной, а относительная разность
+осадок соседних фундаментов Δs/L — допустимой.  Высота фундаментов
+одинакова, поэтому минимум площади — это минимум объёма бетона.
+
+Осадка убывает с ростом подошвы, поэтому перебор не нужен:
+
+* для каждого отношения a/b сначала проверяется наибольший кандидат,
+  площадь которого меньше уже найденной (граница); если он не проходит,
+  отношение отбрасывается целиком;
+* иначе наименьшая проходящая ширина ищется делением пополам.
+
+Таблицы kh и kmui ступенчатые, и монотонность может нарушаться в мелочах;
+выбранный размер всегда проверен точным расчётом, но может оказаться
+на шаг крупнее абсолютного минимума.
+
+Разность осадок проверяется для пар соседей в радиусе ``radius``.  Если
+пара не проходит, у фундамента с большей осадкой предел ужесточается до
+осадки соседа плюс допустимая разность, и он подбирается заново; осадки
+только уменьшаются, поэтому итерации сходятся.  Фундаменты подбираются
+независимо друг от друга в пуле процессов.
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from borehole_class import Borehole
+from footing_group import neighbour_pairs
+from II_calculations import disp_sp, disp_sth, full_displacment
+from logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+GOVERNING_SETTLEMENT = "предельная осадка"
+GOVERNING_MINIMUM = "минимальный размер"
+GOVERNING_INFEASIBLE = "не обеспечено при наибольшем размере"
+
+
+@dataclass(slots=True, kw_only=True)
+class FootingSpec:
+    """Фундамент здания: положение, нагрузка и грунтовые условия."""
+
+    name: str
+    x: float
+    y: float
+    F: float
+    borehole: Borehole
+    H: float
+    Hc: float
+
+
+@dataclass(slots=True, kw_only=True)
+class SizingLimits:
+    """Предельные значения и сетка кандидатов."""
+
+    s_max: float                      # предельная осадка, м
+    rel_diff_max: float               # предельная относительная разность осадок Δs/L
+    b_min: float
+    b_max: float
+    step: float = 0.1                 # шаг ширины, м
+    ratios: Sequence[float] = (1.0,)  # отношения a/b
+    radius: float = 12.0              # радиус проверки разности осадок, м
+
+    def __post_init__(self):
+        if self.s_max <= 0 or self.rel_diff_max <= 0:
+            raise ValueError("Предельные осадка и разность осадок должны быть > 0.")
+        if not 0 < self.b_min <= self.b_max:
+            raise ValueError("Должно быть 0 < b_min ≤ b_max.")
+        if self.step <= 0:
+            raise ValueError("Шаг ширины должен быть > 0.")
+        if not self.ratios or min(self.ratios) < 1:
+            raise ValueError("Отношения a/b должны быть ≥ 1.")
+
+    def widths(self) -> List[float]:
+        n = int(math.floor((self.b_max - self.b_min) / self.step + 1e-9))
+        return [round(self.b_min + k * self.step, 10) for k in range(n + 1)]
+
+
+@dataclass(slots=True)
+class FootingSize:
+    """Подобранная подошва фундамента."""
+
+    name: str
+    a: float
+    b: float
+    settlement: float
+    governing: str
+    evaluations: int
+    feasible: bool = True
+
+    @property
+    def area(self) -> float:
+        return self.a * self.b
+
+
+@dataclass(slots=True)
+class SizingResult:
+    footings: List[FootingSize]
+    evaluations: int                  # вызовы расчёта осадки по всем фундаментам
+    rounds: int                       # проходов согласования разности осадок
+    violations: List[Tuple[str, str, float]] = field(default_factory=list)
+
+    @property
+    def total_area(self) -> float:
+        return sum(f.area for f in self.footings)
+
+    def report(self) -> str:
+        rows = [
+            f"{f.name}: a={f.a:.2f} м, b={f.b:.2f} м, s={f.settlement * 1000:.1f} мм — {f.governing}"
+            for f in self.footings
+        ]
+        rows.append(
+            f"Суммарная площадь подошв: {self.total_area:.2f} м², "
+            f"расчётов осадки: {self.evaluations}, проходов: {self.rounds}"
+        )
+        for first, second, ratio in self.violations:
+            rows.append(f"Не обеспечена разность осадок {first}–{second}: Δs/L={ratio:.5f}")
+        return "\n".join(rows)
+
+
+def _size_footing(
+    task: Tuple[FootingSpec, float, SizingLimits, str]
+) -> Tuple[float, float, float, int, bool]:
+    """Наименьшая подошва с осадкой ≤ ``target``: (a, b, s, вызовов, найдено)."""
+    footing, target, limits, engine = task
+    widths = limits.widths()
+    sth = disp_sth(borehole=footing.borehole, Hc=footing.Hc, H=footing.H)
+    evaluations = 1
+    memo: Dict[Tuple[float, int], float] = {}
+
+    def settlement(ratio: float, k: int) -> float:
+        nonlocal evaluations
+        key = (ratio, k)
+        if key not in memo:
+            b = widths[k]
+            sp = disp_sp(
+                borehole=footing.borehole, F=footing.F, a=ratio * b, b=b,
+                Hc=footing.Hc, H=footing.H, engine=engine,
+            )
+            memo[key] = full_displacment(sth, sp)
+            evaluations += 1
+        return memo[key]
+
+    best: Optional[Tuple[float, float, int]] = None  # (площадь, ratio, k)
+    for ratio in sorted(limits.ratios):
+        # граница: наибольший кандидат, который ещё меньше найденного по площади
+        hi = len(widths) - 1
+        if best is not None:
+            while hi >= 0 and ratio * widths[hi] ** 2 >= best[0]:
+                hi -= 1
+        if hi < 0 or settlement(ratio, hi) > target:
+            continue
+        lo = 0
+        if settlement(ratio, lo) <= target:
+            hi = lo
+        else:
+            # lo не проходит, hi проходит
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if settlement(ratio, mid) <= target:
+                    hi = mid
+                else:
+                    lo = mid
+        best = (ratio * widths[hi] ** 2, ratio, hi)
+
+    if best is None:
+        # требование не выполнимо: берём наибольшую подошву
+        ratio = max(limits.ratios)
+        k = len(widths) - 1
+        b = widths[k]
+        return ratio * b, b, settlement(ratio, k), evaluations, False
+    _, ratio, k = best
+    b = widths[k]
+    return ratio * b, b, settlement(ratio, k), evaluations, True
+
+
+def optimize_foundations(
+    footings: Sequence[FootingSpec],
+    limits: SizingLimits,
+    *,
+    engine: str = "table",
+    workers: Optional[int] = None,
+    max_rounds: int = 50,
+) -> SizingResult:
+    """Подбирает размеры всех фундаментов здания.
+
+    ``workers`` — число процессов (по умолчанию по числу ядер, 1 — без
+    пула).  Результат содержит подошвы, определяющую проверку для каждой
+    и общее число расчётов осадки.
+    """
+    n = len(footings)
+    if n == 0:
+        return SizingResult([], 0, 0)
+    names = [f.name for f in footings]
+    targets = [limits.s_max] * n
+    governing = [GOVERNING_SETTLEMENT] * n
+    sizes: List[Optional[Tuple[float, float, float, int, bool]]] = [None] * n
+
+    xs = np.array([f.x for f in footings], dtype=float)
+    ys = np.array([f.y for f in footings], dtype=float)
+    i_idx, j_idx = neighbour_pairs(xs, ys, limits.radius)
+    keep = i_idx < j_idx
+    pairs = list(zip(i_idx[keep].tolist(), j_idx[keep].tolist()))
+
+    def failing_pairs():
+        for i, j in pairs:
+            s_i, s_j = sizes[i][2], sizes[j][2]
+            distance = math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+            if abs(s_i - s_j) > limits.rel_diff_max * distance:
+                yield (i, j) if s_i > s_j else (j, i), distance
+
+    calls = [0] * n
+    rounds = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and n > 1 else None
+    try:
+        pending = list(range(n))
+        while pending and rounds < max_rounds:
+            rounds += 1
+            tasks = [(footings[i], targets[i], limits, engine) for i in pending]
+            if pool is None:
+                results = map(_size_footing, tasks)
+            else:
+                results = pool.map(_size_footing, tasks, chunksize=max(1, len(tasks) // 64))
+            for i, result in zip(pending, results):
+                sizes[i] = result
+                calls[i] += result[3]
+
+            changed = set()
+            for (high, low), distance in failing_pairs():
+                # если требование не выполнено и при наибольшей подошве, увеличивать нечего
+                target = sizes[low][2] + limits.rel_diff_max * distance
+                if sizes[high][4] and target < targets[high]:
+                    targets[high] = target
+                    governing[high] = f"разность осадок с {names[low]}"
+                    changed.add(high)
+            pending = sorted(changed)
+            logger.debug("Проход %d: пересчёт %d фундаментов", rounds, len(pending))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    violations = [
+        (names[high], names[low], abs(sizes[high][2] - sizes[low][2]) / distance)
+        for (high, low), distance in failing_pairs()
+    ]
+    widths = limits.widths()
+    out: List[FootingSize] = []
+    for i, (a, b, s, _, feasible) in enumerate(sizes):
+        reason = governing[i]
+        if not feasible:
+            reason = GOVERNING_INFEASIBLE
+        elif b == widths[0] and a == min(limits.ratios) * b:
+            reason = GOVERNING_MINIMUM
+        out.append(FootingSize(names[i], a, b, s, reason, calls[i], feasible))
+    evaluations = sum(calls)
+    logger.info("Подбор фундаментов: %d шт., расчётов осадки %d", n, evaluations)
+    return SizingResult(out, evaluations, rounds, violations)
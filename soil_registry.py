@@ -0,0 +1,232 @@
+"""Справочник грунтов-«приспособленцев» и компактное хранение разрезов площадки.
+
+При импорте площадки одинаковые грунты часто создаются заново для каждой
+скважины, и каждый слой держит ссылку на собственный объект
+``PermafrostSoil`` с двумя фазами.  ``SoilRegistry`` хранит один объект
+на каждое сочетание кода и параметров и выдаёт ему малый целый номер.
+Числовые свойства всех грунтов лежат в одной непрерывной таблице
+(``SOIL_DTYPE``), строка таблицы — номер грунта.
+
+``SiteStore`` хранит разрезы площадки так же, как архив ``.npz`` проекта:
+номер грунта и толщина каждого слоя в общих массивах, границы скважин —
+массив смещений.  Свойства всех слоёв собираются одним ``take`` по
+таблице; обычная ``Borehole`` для существующих расчётов собирается по
+запросу и ссылается на общие объекты грунтов.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from borehole_class import Borehole, BoreholeLayer
+from grunt_class import PHASE_FIELDS, PermafrostSoil, SoilType
+
+SOIL_TYPES: Tuple[SoilType, ...] = tuple(SoilType)
+
+SOIL_DTYPE = np.dtype(
+    [
+        ("soil_type", "i1"),   # номер в SOIL_TYPES
+        ("rho", "f8"),
+        ("gamma", "f8"),       # кН/м³
+        ("Ath", "f8"),         # NaN, если не задан
+        ("mth", "f8"),
+    ]
+)
+
+
+def _phase_key(phase) -> Tuple | None:
+    if phase is None:
+        return None
+    return tuple(getattr(phase, name) for name in PHASE_FIELDS)
+
+
+def _key(soil) -> Tuple:
+    return (
+        soil.code,
+        soil.name,
+        soil.soil_type,
+        soil.rho,
+        getattr(soil, "Ath", None),
+        getattr(soil, "mth", None),
+        _phase_key(getattr(soil, "thawed", None)),
+        _phase_key(getattr(soil, "frozen", None)),
+    )
+
+
+def _nan(value) -> float:
+    return np.nan if value is None else value
+
+
+class SoilRegistry:
+    """Грунты по номерам: один объект и одна строка таблицы на грунт."""
+
+    def __init__(self) -> None:
+        self._soils: List[PermafrostSoil] = []
+        self._ids: Dict[Tuple, int] = {}
+        self._by_code: Dict[str, int] = {}
+        self._table = np.zeros(8, dtype=SOIL_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self._soils)
+
+    def intern(self, soil: PermafrostSoil) -> int:
+        """Номер грунта; равный по коду и параметрам грунт получает тот же номер.
+
+        Грунт с уже известным кодом, но другими параметрами — ошибка.
+        """
+        key = _key(soil)
+        soil_id = self._ids.get(key)
+        if soil_id is not None:
+            return soil_id
+        if soil.code in self._by_code:
+            raise ValueError(
+                f"Грунт {soil.code!r} уже есть в справочнике с другими параметрами."
+            )
+        soil_id = len(self._soils)
+        if soil_id == len(self._table):
+            # удвоение ёмкости: добавление грунта в среднем O(1)
+            self._table = np.resize(self._table, 2 * len(self._table))
+        self._table[soil_id] = (
+            SOIL_TYPES.index(soil.soil_type),
+            soil.rho,
+            soil.gamma_kNm3,
+            _nan(getattr(soil, "Ath", None)),
+            _nan(getattr(soil, "mth", None)),
+        )
+        self._soils.append(soil)
+        self._ids[key] = soil_id
+        self._by_code[soil.code] = soil_id
+        return soil_id
+
+    def soil(self, soil_id: int) -> PermafrostSoil:
+        return self._soils[soil_id]
+
+    def id_of(self, code: str) -> int:
+        try:
+            return self._by_code[code]
+        except KeyError:
+            raise ValueError(f"Грунт {code!r} отсутствует в справочнике.") from None
+
+    @property
+    def soils(self) -> Sequence[PermafrostSoil]:
+        return tuple(self._soils)
+
+    @property
+    def table(self) -> np.ndarray:
+        """Таблица свойств, строка ``i`` — грунт с номером ``i`` (только чтение)."""
+        view = self._table[: len(self._soils)]
+        view.flags.writeable = False
+        return view
+
+    def take(self, ids: np.ndarray, field: str) -> np.ndarray:
+        """Свойство ``field`` для массива номеров грунтов."""
+        return self._table[field].take(ids)
+
+    def intern_boreholes(self, boreholes: Iterable[Borehole]) -> int:
+        """Заменяет в слоях скважин копии грунтов общими объектами.
+
+        Возвращает число заменённых ссылок.
+        """
+        replaced = 0
+        for borehole in boreholes:
+            for layer in borehole.layers:
+                shared = self._soils[self.intern(layer.soil)]
+                if shared is not layer.soil:
+                    layer.soil = shared
+                    replaced += 1
+        return replaced
+
+
+class SiteStore:
+    """Разрезы скважин площадки в общих массивах номеров грунтов и толщин."""
+
+    def __init__(self, registry: SoilRegistry | None = None) -> None:
+        self.registry = registry if registry is not None else SoilRegistry()
+        self.codes: List[str] = []
+        self._z_top: List[float] = []
+        self._offsets: List[int] = [0]
+        self._soil_chunks: List[np.ndarray] = []
+        self._thickness_chunks: List[np.ndarray] = []
+        self._packed: Tuple[np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_boreholes(
+        cls, boreholes: Iterable[Borehole], registry: SoilRegistry | None = None
+    ) -> "SiteStore":
+        store = cls(registry)
+        for borehole in boreholes:
+            store.add(borehole)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def add(self, borehole: Borehole) -> int:
+        """Добавляет скважину; возвращает её номер в хранилище."""
+        intern = self.registry.intern
+        n = len(borehole.layers)
+        self._soil_chunks.append(
+            np.fromiter((intern(layer.soil) for layer in borehole.layers), dtype=np.int32, count=n)
+        )
+        self._thickness_chunks.append(
+            np.fromiter((layer.thickness for layer in borehole.layers), dtype=float, count=n)
+        )
+        self.codes.append(borehole.code)
+        self._z_top.append(borehole.z_top)
+        self._offsets.append(self._offsets[-1] + n)
+        self._packed = None
+        return len(self.codes) - 1
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._packed is None:
+            if self._soil_chunks:
+                soil = np.concatenate(self._soil_chunks)
+                thickness = np.concatenate(self._thickness_chunks)
+            else:
+                soil, thickness = np.empty(0, dtype=np.int32), np.empty(0)
+            self._soil_chunks = [soil]
+            self._thickness_chunks = [thickness]
+            self._packed = (soil, thickness)
+        return self._packed
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return np.asarray(self._offsets, dtype=np.int64)
+
+    @property
+    def z_top(self) -> np.ndarray:
+        return np.asarray(self._z_top, dtype=float)
+
+    @property
+    def layer_soil(self) -> np.ndarray:
+        return self._arrays()[0]
+
+    @property
+    def layer_thickness(self) -> np.ndarray:
+        return self._arrays()[1]
+
+    def layer_property(self, field: str) -> np.ndarray:
+        """Свойство грунта каждого слоя площадки (одним ``take``)."""
+        return self.registry.take(self.layer_soil, field)
+
+    def borehole(self, index: int) -> Borehole:
+        """Скважина для расчёта; слои ссылаются на общие объекты грунтов."""
+        soil_ids, thickness = self._arrays()
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        soils = self.registry.soil
+        layers = [
+            BoreholeLayer(soil=soils(s), thickness=h)
+            for s, h in zip(soil_ids[start:stop].tolist(), thickness[start:stop].tolist())
+        ]
+        return Borehole(code=self.codes[index], z_top=self._z_top[index], layers=layers)
+
+    def boreholes(self) -> Iterable[Borehole]:
+        for index in range(len(self.codes)):
+            yield self.borehole(index)
+
+    @property
+    def nbytes(self) -> int:
+        """Объём массивов хранилища, байт (без справочника грунтов)."""
+        soil_ids, thickness = self._arrays()
+        return soil_ids.nbytes + thickness.nbytes + 16 * len(self.codes)
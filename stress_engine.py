@@ -0,0 +1,106 @@
+"""Аналитический расчёт коэффициента k_i по решению Буссинеска.
+
+Вместо таблицы 7.7 (``function_for_II_calculations.ki``) коэффициент
+вычисляется интегрированием вертикального напряжения под центром
+прямоугольного фундамента a×b.  Напряжение в центре — сумма четырёх
+угловых точек (метод угловых точек), интеграл по глубине от угловой точки
+берётся в замкнутом виде, поэтому одна векторная формула NumPy считает
+k_i сразу для тысяч глубин без табличной интерполяции и при любом a/b.
+
+Нормировка совпадает с табличной: у подошвы k_i растёт как z/(2b), т.е.
+``k_i(z) = (1/b)·∫₀^{z/2} α(ζ) dζ``, где α — отношение σz/p0 под центром.
+Табличные значения глубже учитывают боковое расширение грунта, поэтому
+расхождение с ними растёт с глубиной; ``benchmark`` показывает его вместе
+со сравнением скорости.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, Union
+
+import numpy as np
+
+from function_for_II_calculations import ki
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def corner_stress(L: float, B: float, z: ArrayLike) -> np.ndarray:
+    """σz/p под углом равномерно загруженного прямоугольника L×B на глубине z."""
+    z = np.maximum(np.asarray(z, dtype=float), 1e-12)
+    R = np.sqrt(L * L + B * B + z * z)
+    return (
+        np.arctan(L * B / (z * R))
+        + L * B * z / R * (1.0 / (L * L + z * z) + 1.0 / (B * B + z * z))
+    ) / (2.0 * np.pi)
+
+
+def corner_stress_integral(L: float, B: float, Z: ArrayLike) -> np.ndarray:
+    """∫₀^Z σz/p dz под углом прямоугольника L×B (замкнутая форма)."""
+    Z = np.maximum(np.asarray(Z, dtype=float), 0.0)
+    D0 = np.hypot(L, B)
+    J0 = L * np.log((B + D0) / L) + B * np.log((L + D0) / B)
+    D = np.sqrt(L * L + B * B + Z * Z)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail = np.where(Z > 0, Z * np.arctan(L * B / (Z * D)), 0.0)
+    return (
+        2.0 * J0
+        - 2.0 * L * np.log((B + D) / np.hypot(L, Z))
+        - 2.0 * B * np.log((L + D) / np.hypot(B, Z))
+        + tail
+    ) / (2.0 * np.pi)
+
+
+def centre_stress(a: float, b: float, z: ArrayLike) -> np.ndarray:
+    """σz/p0 под центром фундамента a×b."""
+    return 4.0 * corner_stress(0.5 * a, 0.5 * b, z)
+
+
+def ki_analytic(a: float, b: float, z: ArrayLike) -> Union[float, np.ndarray]:
+    """Аналог ``ki(a, b, z)``; ``z`` может быть массивом глубин."""
+    if a <= 0 or b <= 0:
+        raise ValueError("Размеры фундамента a и b должны быть > 0.")
+    z = np.maximum(np.asarray(z, dtype=float), 0.0)
+    result = 4.0 * corner_stress_integral(0.5 * a, 0.5 * b, 0.5 * z) / b
+    return float(result) if result.ndim == 0 else result
+
+
+def benchmark(b: float = 1.0, repeat: int = 3) -> Dict[str, float]:
+    """Сравнение с табличным ki по узлам таблицы 7.7 (z/b ≤ 20, a/b ≤ 10).
+
+    Возвращает время одного вычисления каждым способом (мкс) и отклонения
+    аналитических значений от табличных.
+    """
+    z_rows = np.array([0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0,
+                       2.5, 3.0, 3.5, 4.0, 6.0, 8.0, 12.0, 16.0, 20.0])
+    a_cols = [1.0, 1.4, 1.8, 2.4, 3.0, 3.2, 5.0, 10.0]
+    depths = np.linspace(0.0, 20.0 * b, 2001)
+
+    def best(func) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    calls = len(a_cols) * len(depths)
+    t_table = best(lambda: [ki(a=ab * b, b=b, z=z) for ab in a_cols for z in depths])
+    t_analytic = best(lambda: [ki_analytic(ab * b, b, depths) for ab in a_cols])
+
+    table = np.array([[ki(a=ab * b, b=b, z=zb * b) for ab in a_cols] for zb in z_rows])
+    analytic = np.column_stack([ki_analytic(ab * b, b, z_rows * b) for ab in a_cols])
+    diff = analytic - table
+    shallow = z_rows <= 1.0
+    return {
+        "table_us": t_table / calls * 1e6,
+        "analytic_us": t_analytic / calls * 1e6,
+        "max_abs_diff": float(np.abs(diff).max()),
+        "max_abs_diff_shallow": float(np.abs(diff[shallow]).max()),
+        "mean_rel_diff": float(np.mean(np.abs(diff[1:]) / table[1:])),
+    }
+
+
+if __name__ == "__main__":
+    for name, value in benchmark().items():
+        print(f"{name}: {value:.4g}")
@@ -0,0 +1,243 @@
+"""Поверхность отклика для мгновенной оценки осадки при перетаскивании ползунков.
+
+Для фиксированных скважины и отметки подошвы H точный расчёт заранее
+выполняется в узлах сетки по (b, a/b, Hc), а между узлами осадка
+интерполируется полилинейно.  Нагрузка в сетку не входит: ``sth`` от F не
+зависит, а ``sp`` ей пропорциональна (см. ``FoundationCase``), поэтому
+в узлах хранятся ``sth(Hc)`` и ``sp`` на 1 кН, и зависимость от F
+воспроизводится точно.
+
+При построении оценивается погрешность: точный расчёт в серединах ячеек
+сравнивается с интерполяцией, максимум отклонения сохраняется отдельно для
+``sth`` и для ``sp`` на 1 кН.  Таблицы kh и kmui ступенчатые, поэтому
+внутри ячейки со скачком погрешность заметно больше — её и показывает
+оценка.  Это оценка, а не строгая граница: в отдельных точках ячейки
+отклонение может быть немного больше.
+
+Поверхность помнит отпечаток скважины (отметка, слои, параметры грунтов) и
+при любом их изменении перестраивается при следующем обращении.  Для
+точного значения в отпущенной точке ползунка служит ``verify``.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import product
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from borehole_class import Borehole
+from foundation_case import FoundationCase
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _fingerprint(borehole: Borehole, engine: str) -> Tuple:
+    return (
+        engine,
+        borehole.z_top,
+        tuple(
+            (
+                layer.thickness,
+                layer.soil.soil_type,
+                layer.soil.rho,
+                getattr(layer.soil, "Ath", None),
+                getattr(layer.soil, "mth", None),
+            )
+            for layer in borehole.layers
+        ),
+    )
+
+
+def _nodes(values: Sequence[float], name: str) -> np.ndarray:
+    nodes = np.asarray(values, dtype=float)
+    if nodes.ndim != 1 or len(nodes) < 2 or np.any(np.diff(nodes) <= 0):
+        raise ValueError(f"Узлы {name} должны быть возрастающими, не меньше двух.")
+    return nodes
+
+
+def _cell(nodes: Sequence[float], x: float) -> Tuple[int, float]:
+    """Номер ячейки и доля внутри неё; за пределами сетки — экстраполяция запрещена."""
+    if not nodes[0] <= x <= nodes[-1]:
+        raise ValueError(f"Значение {x} вне области [{nodes[0]}, {nodes[-1]}].")
+    i = min(bisect_right(nodes, x), len(nodes) - 1) - 1
+    return i, (x - nodes[i]) / (nodes[i + 1] - nodes[i])
+
+
+@dataclass(frozen=True, slots=True)
+class Verification:
+    """Точная осадка в точке и отклонение от неё поверхности."""
+
+    exact: float
+    predicted: float
+    estimate: float   # заявленная оценка погрешности
+
+    @property
+    def error(self) -> float:
+        return self.predicted - self.exact
+
+    @property
+    def within_estimate(self) -> bool:
+        return abs(self.error) <= self.estimate
+
+
+class SettlementSurrogate:
+    """Интерполяционная поверхность осадки по (b, a/b, Hc, F) для одной скважины."""
+
+    def __init__(
+        self,
+        borehole: Borehole,
+        *,
+        H: float,
+        b: Sequence[float],
+        a_over_b: Sequence[float],
+        Hc: Sequence[float],
+        engine: str = "table",
+    ) -> None:
+        self.borehole = borehole
+        self.H = H
+        self.engine = engine
+        self.b_nodes = _nodes(b, "b")
+        self.ab_nodes = _nodes(a_over_b, "a/b")
+        self.Hc_nodes = _nodes(Hc, "Hc")
+        if self.b_nodes[0] <= 0 or self.ab_nodes[0] <= 0 or self.Hc_nodes[0] < 0:
+            raise ValueError("Узлы b и a/b должны быть > 0, узлы Hc — ≥ 0.")
+        self.evaluations = 0
+        self.builds = 0
+        self._build()
+
+    @classmethod
+    def uniform(
+        cls,
+        borehole: Borehole,
+        *,
+        H: float,
+        b: Tuple[float, float],
+        a_over_b: Tuple[float, float],
+        Hc: Tuple[float, float],
+        nodes: Tuple[int, int, int] = (9, 6, 9),
+        engine: str = "table",
+    ) -> "SettlementSurrogate":
+        """Равномерная сетка: диапазоны (min, max) и число узлов по каждой оси."""
+        nb, nab, nhc = nodes
+        return cls(
+            borehole,
+            H=H,
+            b=np.linspace(*b, nb),
+            a_over_b=np.linspace(*a_over_b, nab),
+            Hc=np.linspace(*Hc, nhc),
+            engine=engine,
+        )
+
+    # ---- построение ----
+    def _exact_parts(self, b: float, ab: float, Hc: float) -> Tuple[float, float]:
+        case = FoundationCase(self.borehole, a=ab * b, b=b, H=self.H, Hc=Hc, engine=self.engine)
+        self.evaluations += 1
+        return case.sth, case.sp_per_kN
+
+    def _build(self) -> None:
+        bn, abn, hcn = self.b_nodes, self.ab_nodes, self.Hc_nodes
+        self._fingerprint = _fingerprint(self.borehole, self.engine)
+        sth = np.empty(len(hcn))
+        unit = np.empty((len(bn), len(abn), len(hcn)))
+        for (i, b), (j, ab), (k, hc) in product(enumerate(bn), enumerate(abn), enumerate(hcn)):
+            s, unit[i, j, k] = self._exact_parts(b, ab, hc)
+            sth[k] = s   # sth зависит только от Hc
+        self._sth = sth
+        self._unit = unit
+        # списки для скалярного пути: индексация list быстрее, чем ndarray
+        self._b_list = bn.tolist()
+        self._ab_list = abn.tolist()
+        self._hc_list = hcn.tolist()
+        self._sth_list = sth.tolist()
+        self._unit_list = unit.tolist()
+        self.builds += 1
+        self._estimate_error()
+
+    def _estimate_error(self) -> None:
+        mid = lambda nodes: 0.5 * (nodes[1:] + nodes[:-1])
+        sth_err = 0.0
+        unit_err = 0.0
+        for b, ab, hc in product(mid(self.b_nodes), mid(self.ab_nodes), mid(self.Hc_nodes)):
+            sth, unit = self._exact_parts(b, ab, hc)
+            p_sth, p_unit = self._parts(float(b), float(ab), float(hc))
+            sth_err = max(sth_err, abs(p_sth - sth))
+            unit_err = max(unit_err, abs(p_unit - unit))
+        self.sth_error = float(sth_err)
+        self.sp_error_per_kN = float(unit_err)
+
+    # ---- актуальность ----
+    @property
+    def stale(self) -> bool:
+        """Скважина или её грунты изменились после построения."""
+        return _fingerprint(self.borehole, self.engine) != self._fingerprint
+
+    def refresh(self) -> bool:
+        """Перестраивает поверхность, если исходные данные изменились."""
+        if self.stale:
+            self._build()
+            return True
+        return False
+
+    # ---- прогноз ----
+    def _parts(self, b: float, ab: float, Hc: float) -> Tuple[float, float]:
+        i, tb = _cell(self._b_list, b)
+        j, ta = _cell(self._ab_list, ab)
+        k, th = _cell(self._hc_list, Hc)
+        s0, s1 = self._sth_list[k], self._sth_list[k + 1]
+        u = self._unit_list
+
+        def line(row):
+            return row[k] + th * (row[k + 1] - row[k])
+
+        def plane(block):
+            v0 = line(block[j])
+            return v0 + ta * (line(block[j + 1]) - v0)
+
+        v0 = plane(u[i])
+        return s0 + th * (s1 - s0), v0 + tb * (plane(u[i + 1]) - v0)
+
+    def predict(self, *, b: float, a_over_b: float, Hc: float, F: float) -> float:
+        """Оценка полной осадки в точке."""
+        self.refresh()
+        sth, unit = self._parts(b, a_over_b, Hc)
+        return sth + unit * F
+
+    def predict_many(
+        self, *, b: ArrayLike, a_over_b: ArrayLike, Hc: ArrayLike, F: ArrayLike
+    ) -> np.ndarray:
+        """Векторная оценка осадки; аргументы согласуются по правилам NumPy."""
+        self.refresh()
+        b, ab, hc, F = np.broadcast_arrays(
+            *(np.asarray(v, dtype=float) for v in (b, a_over_b, Hc, F))
+        )
+        idx = []
+        axes = ((self.b_nodes, b, "b"), (self.ab_nodes, ab, "a/b"), (self.Hc_nodes, hc, "Hc"))
+        for nodes, x, name in axes:
+            if np.any((x < nodes[0]) | (x > nodes[-1])):
+                raise ValueError(f"Значения {name} вне области [{nodes[0]}, {nodes[-1]}].")
+            i = np.clip(np.searchsorted(nodes, x, side="right") - 1, 0, len(nodes) - 2)
+            idx.append((i, (x - nodes[i]) / (nodes[i + 1] - nodes[i])))
+        (i, tb), (j, ta), (k, th) = idx
+        u = self._unit
+        unit = 0.0
+        for di, wi in ((0, 1 - tb), (1, tb)):
+            for dj, wj in ((0, 1 - ta), (1, ta)):
+                for dk, wk in ((0, 1 - th), (1, th)):
+                    unit = unit + wi * wj * wk * u[i + di, j + dj, k + dk]
+        sth = self._sth[k] + th * (self._sth[k + 1] - self._sth[k])
+        return sth + unit * F
+
+    def error_estimate(self, F: float) -> float:
+        """Оценка максимальной погрешности прогноза при нагрузке F."""
+        return self.sth_error + self.sp_error_per_kN * abs(F)
+
+    def verify(self, *, b: float, a_over_b: float, Hc: float, F: float) -> Verification:
+        """Точный расчёт в точке (например, при отпускании ползунка)."""
+        predicted = self.predict(b=b, a_over_b=a_over_b, Hc=Hc, F=F)
+        case = FoundationCase(
+            self.borehole, a=a_over_b * b, b=b, H=self.H, Hc=Hc, engine=self.engine
+        )
+        self.evaluations += 1
+        return Verification(case.settlement(F), predicted, self.error_estimate(F))
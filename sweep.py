@@ -0,0 +1,152 @@
+"""Параметрические прогоны расчёта осадки с потоковой выдачей результатов.
+
+Прогон выполняется в фоновом потоке и публикует точки в ``ResultStream``
+порциями, не дожидаясь окончания всего расчёта.  Интерфейс (например,
+``widgets.progressive_plot.ProgressivePlot``) забирает накопленные точки из
+потока по таймеру и достраивает графики по мере поступления.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from borehole_class import Borehole
+from II_calculations import disp_sp, disp_sth, full_displacment
+from logging_utils import get_logger
+from result_cache import ResultCache
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SweepCase:
+    """Один расчётный случай прогона и его место на графике."""
+
+    curve: str   # подпись кривой, к которой относится точка
+    x: float     # значение по оси абсцисс
+    Hc: float
+    F: float
+    a: float
+    b: float
+    H: float
+
+
+@dataclass(frozen=True, slots=True)
+class SweepPoint:
+    curve: str
+    x: float
+    y: float
+
+
+class ResultStream:
+    """Потокобезопасная очередь результатов от расчёта к интерфейсу."""
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[Sequence[SweepPoint]]" = queue.SimpleQueue()
+        self._done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def publish(self, points: Sequence[SweepPoint]) -> None:
+        if points:
+            self._queue.put(points)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Сообщает, что новых точек не будет (``error`` — причина остановки)."""
+        self.error = error
+        self._done.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._done.is_set()
+
+    def drain(self) -> List[SweepPoint]:
+        """Забирает все накопленные точки, не блокируясь."""
+        out: List[SweepPoint] = []
+        while True:
+            try:
+                out.extend(self._queue.get_nowait())
+            except queue.Empty:
+                return out
+
+    @property
+    def exhausted(self) -> bool:
+        """Поток закрыт и все точки из него уже забраны."""
+        return self.closed and self._queue.empty()
+
+
+def width_sweep_cases(
+    Hc_values: Iterable[float],
+    b_values: Sequence[float],
+    *,
+    F: float,
+    a: float,
+    H: float,
+) -> Iterator[SweepCase]:
+    """Случаи для диаграммы «осадка от b» — по кривой на каждое значение Hc."""
+    for Hc in Hc_values:
+        for b in b_values:
+            yield SweepCase(curve=f"Hc = {Hc:g} м", x=b, Hc=Hc, F=F, a=a, b=b, H=H)
+
+
+def run_sweep(
+    borehole: Borehole,
+    cases: Iterable[SweepCase],
+    stream: ResultStream,
+    *,
+    chunk_size: int = 64,
+    stop: Optional[threading.Event] = None,
+    cache: Optional[ResultCache] = None,
+) -> None:
+    """Считает осадку для каждого случая и публикует точки порциями.
+
+    Поток результатов закрывается в любом случае; исключение расчёта
+    сохраняется в ``stream.error``.  При заданном ``cache`` уже посчитанные
+    случаи берутся из него.
+    """
+    chunk: List[SweepPoint] = []
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        for case in cases:
+            if stop is not None and stop.is_set():
+                break
+            if cache is not None:
+                cached = cache.calculate(
+                    borehole, Hc=case.Hc, H=case.H, F=case.F, a=case.a, b=case.b
+                )
+                sth, sp = cached.sth, cached.sp
+            else:
+                sth = disp_sth(borehole=borehole, Hc=case.Hc, H=case.H)
+                sp = disp_sp(borehole=borehole, F=case.F, a=case.a, b=case.b, Hc=case.Hc, H=case.H)
+            if debug:
+                logger.debug("%s, x=%g: sth=%g, sp=%g", case.curve, case.x, sth, sp)
+            chunk.append(SweepPoint(case.curve, case.x, full_displacment(sth, sp)))
+            if len(chunk) >= chunk_size:
+                stream.publish(chunk)
+                chunk = []
+        stream.publish(chunk)
+    except Exception as exc:
+        logger.exception("Прогон прерван ошибкой")
+        stream.publish(chunk)
+        stream.close(exc)
+        return
+    stream.close()
+
+
+def start_sweep(
+    borehole: Borehole,
+    cases: Iterable[SweepCase],
+    stream: ResultStream,
+    **kwargs,
+) -> threading.Thread:
+    """Запускает ``run_sweep`` в фоновом потоке и возвращает его."""
+    thread = threading.Thread(
+        target=run_sweep,
+        args=(borehole, cases, stream),
+        kwargs=kwargs,
+        daemon=True,
+    )
+    thread.start()
+    return thread
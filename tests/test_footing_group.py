@@ -0,0 +1,30 @@
+import numpy as np
+
+from borehole_class import Borehole
+from footing_group import Footing, group_settlement
+from grunt_class import PermafrostSoil, SoilType
+
+
+def _borehole() -> Borehole:
+    borehole = Borehole(code="B", z_top=0.0)
+    for i, kind in enumerate(SoilType):
+        soil = PermafrostSoil(code=f"S{i}", name=f"грунт {i}", soil_type=kind,
+                              rho=1600 + 50 * i, Ath=0.01 * i, mth=3e-4 * (i + 1))
+        borehole.add(soil, 1.5)
+    return borehole
+
+
+def test_empty_zone_first_does_not_shift_weights():
+    """Фундамент с пустой сжимаемой зоной (Hc = 0) не сдвигает веса остальных."""
+    borehole = _borehole()
+    pair = [
+        Footing(x=0.0, y=0.0, a=2.0, b=2.0, F=500.0, borehole=borehole, H=-1.0, Hc=4.0),
+        Footing(x=3.0, y=0.0, a=2.0, b=2.0, F=500.0, borehole=borehole, H=-1.0, Hc=3.0),
+    ]
+    far = Footing(x=1000.0, y=0.0, a=2.0, b=2.0, F=500.0, borehole=borehole, H=-1.0, Hc=0.0)
+
+    alone = group_settlement(pair).added
+    with_empty = group_settlement([far] + pair).added
+
+    assert with_empty[0] == 0.0
+    np.testing.assert_allclose(with_empty[1:], alone, rtol=1e-12, atol=0.0)
@@ -0,0 +1,186 @@
+"""Глубина оттаивания Hc по теплофизическим свойствам грунтов.
+
+Используется решение Стефана для слоистого разреза.  Чтобы фронт
+оттаивания прошёл слои 1…n, нужен индекс оттаивания
+
+    I_n = Σ L_i·h_i·(R_{i-1} + h_i / (2 λ_i)),   R_{i-1} = Σ_{j<i} h_j / λ_j,
+
+где λ — теплопроводность талого грунта, а L — затраты тепла на единицу
+объёма.  Кроме теплоты фазового перехода в L входят прогрев талого грунта
+до средней температуры C_th·T_s/2 и прогрев мёрзлого до нуля C_f·|T_0|
+(модифицированное решение Стефана).  Внутри слоя глубина находится из
+квадратного уравнения.  Ниже последнего слоя разреза он считается
+продолжающимся бесконечно.
+
+Индекс оттаивания задаётся в °C·сут на поверхности грунта.  Сценарии —
+это массивы индексов и температур; расчёт векторный сразу по всем
+сценариям и скважинам.  L_i линейна по T_s и T_0, поэтому суммы I_n
+скважины раскладываются на три слагаемых, которые считаются один раз,
+а для сценариев остаётся только их взвешенная сумма.
+
+``thaw_hc`` переводит глубину от устья в Hc от подошвы фундамента на
+отметке H: матрица (сценарии × скважины) подаётся в ``settle_many`` по
+строке на сценарий.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from borehole_class import Borehole
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# удельная теплота плавления льда, Дж/кг
+L_ICE = 334_000.0
+SECONDS_PER_DAY = 86_400.0
+
+
+def layer_thermal(soil) -> Tuple[float, float, float, float]:
+    """(λ талого, теплота фазового перехода, C талого, C мёрзлого) грунта.
+
+    Если теплота фазового перехода не задана, она считается по влажности
+    мёрзлого грунта: L = L_льда · ρ_d · w, ρ_d = ρ / (1 + w).  Не заданные
+    теплоёмкости считаются нулевыми (классическое решение Стефана).
+    """
+    thawed = getattr(soil, "thawed", None)
+    frozen = getattr(soil, "frozen", None)
+    if thawed is None or thawed.conductivity is None:
+        raise ValueError(f"Грунт {soil.code!r}: не задана теплопроводность талого грунта.")
+    latent = thawed.latent_heat if thawed.latent_heat is not None else frozen.latent_heat
+    if latent is None:
+        w = frozen.water_content if frozen.water_content is not None else thawed.water_content
+        if w is None:
+            raise ValueError(
+                f"Грунт {soil.code!r}: нужна теплота фазового перехода или влажность."
+            )
+        latent = L_ICE * soil.rho / (1.0 + w) * w
+    return (
+        thawed.conductivity,
+        latent,
+        thawed.heat_capacity or 0.0,
+        frozen.heat_capacity or 0.0,
+    )
+
+
+def _profiles(boreholes: Sequence[Borehole]):
+    """Отрезки разрезов, дополненные до общей длины.
+
+    Для отрезка n каждой скважины: отметка верха от устья, толщина (у
+    последнего — бесконечность), сопротивление над ним R, λ, три
+    составляющие L (теплота, C_th, C_f) и три составляющие I над ним.
+    Лишние отрезки коротких скважин получают I = ∞ и не выбираются.
+    """
+    width = max((len(bh.layers) for bh in boreholes), default=0) + 1
+    shape = (len(boreholes), width)
+    top = np.zeros(shape)
+    h = np.full(shape, np.inf)
+    R = np.zeros(shape)
+    lam = np.ones(shape)
+    L = np.zeros(shape + (3,))
+    I = np.zeros(shape + (3,))
+    I[..., 0] = np.inf
+    thermal_cache = {}
+    for b, borehole in enumerate(boreholes):
+        if not borehole.layers:
+            raise ValueError(f"Скважина {borehole.code!r} не содержит слоёв.")
+        depth = resist = 0.0
+        total = np.zeros(3)
+        n = len(borehole.layers)
+        for i, layer in enumerate(borehole.layers):
+            soil = layer.soil
+            props = thermal_cache.get(id(soil))
+            if props is None:
+                props = thermal_cache[id(soil)] = layer_thermal(soil)
+            k, latent, c_th, c_fr = props
+            top[b, i], R[b, i], lam[b, i] = depth, resist, k
+            L[b, i] = (latent, c_th, c_fr)
+            I[b, i] = total
+            h[b, i] = layer.thickness
+            total = total + L[b, i] * layer.thickness * (resist + layer.thickness / (2.0 * k))
+            depth += layer.thickness
+            resist += layer.thickness / k
+        # ниже разреза продолжается последний слой
+        top[b, n], R[b, n], lam[b, n] = depth, resist, lam[b, n - 1]
+        L[b, n] = L[b, n - 1]
+        I[b, n] = total
+    return top, h, R, lam, L, I
+
+
+def thaw_depths(
+    boreholes: Sequence[Borehole],
+    thaw_index: ArrayLike,
+    *,
+    surface_temperature: ArrayLike = 0.0,
+    ground_temperature: ArrayLike = 0.0,
+    chunk_size: int = 2_000_000,
+) -> np.ndarray:
+    """Глубины оттаивания от устья, м, формы (число сценариев, число скважин).
+
+    ``thaw_index`` — индекс оттаивания на поверхности, °C·сут;
+    ``surface_temperature`` — средняя температура поверхности за период
+    оттаивания, °C; ``ground_temperature`` — начальная температура мёрзлого
+    грунта, °C (≤ 0).  Аргументы согласуются по правилам NumPy.
+    """
+    index, t_surf, t_ground = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (thaw_index, surface_temperature, ground_temperature)
+        )
+    )
+    if np.any(index < 0):
+        raise ValueError("Индекс оттаивания должен быть ≥ 0.")
+    if np.any(t_ground > 0):
+        raise ValueError("Температура мёрзлого грунта должна быть ≤ 0 °C.")
+    top, h, R, lam, L, I = _profiles(boreholes)
+    n_bh, width = top.shape
+    out = np.empty((len(index), n_bh))
+    if n_bh == 0:
+        return out
+
+    # веса составляющих L для каждого сценария: (1, T_s/2, |T_0|)
+    weights = np.stack([np.ones_like(index), 0.5 * t_surf, -t_ground], axis=1)
+    heat = index * SECONDS_PER_DAY
+    step = max(1, chunk_size // (n_bh * width))
+    rows = np.arange(n_bh)
+    for start in range(0, len(index), step):
+        w = weights[start:start + step]
+        q = heat[start:start + step]
+        # I отрезков по сценариям: (сценарии, скважины, отрезки)
+        I_s = np.einsum("bnk,sk->sbn", I, w)
+        seg = np.sum(I_s <= q[:, None, None], axis=2) - 1
+        I_top = np.take_along_axis(I_s, seg[..., None], axis=2)[..., 0]
+        L_s = np.einsum("sbk,sk->sb", L[rows, seg], w)
+        lam_s, R_s = lam[rows, seg], R[rows, seg]
+        rest = q[:, None] - I_top
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = lam_s * (np.sqrt(R_s * R_s + 2.0 * rest / (lam_s * L_s)) - R_s)
+        # без затрат тепла на оттаивание (L = 0) слой проходится целиком
+        x = np.where(L_s > 0, x, np.inf)
+        out[start:start + step] = top[rows, seg] + np.minimum(x, h[rows, seg])
+    return out
+
+
+def thaw_hc(
+    boreholes: Sequence[Borehole],
+    thaw_index: ArrayLike,
+    *,
+    H: ArrayLike,
+    surface_temperature: ArrayLike = 0.0,
+    ground_temperature: ArrayLike = 0.0,
+) -> np.ndarray:
+    """Hc — мощность оттаявшего слоя под подошвой на отметке ``H``.
+
+    ``H`` — абсолютная отметка подошвы, общая или по скважинам.  Результат
+    формы (число сценариев, число скважин); подошва ниже фронта даёт 0.
+    """
+    depth = thaw_depths(
+        boreholes,
+        thaw_index,
+        surface_temperature=surface_temperature,
+        ground_temperature=ground_temperature,
+    )
+    z_top = np.array([bh.z_top for bh in boreholes], dtype=float)
+    base_depth = z_top - np.asarray(H, dtype=float)
+    return np.maximum(depth - base_depth, 0.0)
@@ -3,20 +3,24 @@
 from .context_menu import make_context_menu
 from .hotkeys import add_hotkeys
 from .select_path import select_path
-from .message_log import message_log
+from .message_log import LogConsole, LogConsoleHandler, message_log
 from .text_widget import create_text, clear_text
 from .dialogs import ask_directory, ask_file, ask_save_file, show_error
+from .virtual_tree import VirtualTreeview
 
 __all__ = [
     "make_context_menu",
     "add_hotkeys",
     "select_path",
     "message_log",
+    "LogConsole",
+    "LogConsoleHandler",
     "create_text",
     "clear_text",
     "ask_directory",
     "ask_file",
     "ask_save_file",
     "show_error",
+    "VirtualTreeview",
 ]
 
@@ -0,0 +1,338 @@
+"""Диаграммы из сотен кривых на одном ``LineCollection``.
+
+Расчётные диаграммы (осадка от b для набора Hc, осадка от Hc для набора
+скважин) содержат сотни кривых.  Отдельный ``Line2D`` на каждую кривую
+дорог и для matplotlib, и для ``PlotEditor``, который заводит по две строки
+виджетов на линию.  ``CurveCollectionView`` рисует все кривые одним
+артистом (с упрощением путей до разрешения экрана) и хранит цвет, тип,
+толщину и видимость в массивах по кривым, а ``CurveGroupEditor`` управляет
+оформлением не отдельных кривых, а их групп.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import tkinter as tk
+from tkinter import ttk, colorchooser
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.lines import Line2D
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+from color_palettes import PALETTES
+
+
+class _SimplifiedLineCollection(LineCollection):
+    """``LineCollection``, упрощающая кривые до разрешения экрана.
+
+    В отличие от ``Line2D`` коллекции не упрощают пути при отрисовке, и
+    сотни кривых по тысяче точек растеризуются целиком.  Здесь кривые
+    хранятся в координатах данных, а перед отрисовкой переводятся в
+    экранные координаты с упрощением matplotlib; результат кэшируется до
+    изменения пределов или размера осей.
+    """
+
+    def __init__(self) -> None:
+        super().__init__([], transform=IdentityTransform())
+        self._data_segments: List[np.ndarray] = []
+        self._view_key = None
+
+    def set_data_segments(self, segments: List[np.ndarray]) -> None:
+        self._data_segments = segments
+        self._view_key = None
+        self.stale = True
+
+    def draw(self, renderer) -> None:
+        axes = self.axes
+        if axes is not None:
+            key = (tuple(axes.viewLim.bounds), tuple(axes.bbox.bounds))
+            if key != self._view_key:
+                transform = axes.transData
+                # пути подменяются напрямую, без set_paths: он пометил бы
+                # артист устаревшим посреди отрисовки
+                self._paths = [
+                    Path(seg).cleaned(transform=transform, simplify=True)
+                    for seg in self._data_segments
+                ]
+                self._view_key = key
+        super().draw(renderer)
+
+
+@dataclass
+class CurveGroup:
+    """Общее оформление группы кривых."""
+
+    name: str
+    color: str = "C0"
+    linestyle: str = "-"
+    linewidth: float = 1.5
+    visible: bool = True
+
+
+class CurveCollectionView:
+    """Набор кривых одной диаграммы, отрисовываемый одним ``LineCollection``."""
+
+    def __init__(self, ax) -> None:
+        self.ax = ax
+        self.groups: List[CurveGroup] = []
+        self._group_index: Dict[str, int] = {}
+        self._segments: List[np.ndarray] = []
+        self._group_ids = np.empty(0, dtype=int)
+        self._bounds = np.empty((0, 4))  # xmin, xmax, ymin, ymax
+        self._colors = np.empty((0, 4))
+        self._widths = np.empty(0)
+        self._styles: List[str] = []
+        self._visible = np.empty(0, dtype=bool)
+        self._shown: Optional[np.ndarray] = None
+        self.collection = _SimplifiedLineCollection()
+        ax.add_collection(self.collection, autolim=False)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    # ------------------------------------------------------------------
+    def add_group(self, name: str, **style) -> CurveGroup:
+        """Создаёт группу (или возвращает существующую с тем же именем)."""
+
+        if name in self._group_index:
+            return self.groups[self._group_index[name]]
+        group = CurveGroup(name, **style)
+        self._group_index[name] = len(self.groups)
+        self.groups.append(group)
+        return group
+
+    def add_curves(
+        self,
+        group: str,
+        xs: Iterable[Sequence[float]],
+        ys: Iterable[Sequence[float]],
+    ) -> None:
+        """Добавляет кривые в группу ``group``; оформление берётся из группы."""
+
+        info = self.add_group(group)
+        gid = self._group_index[group]
+        segments = []
+        bounds = []
+        for x, y in zip(xs, ys):
+            seg = np.column_stack((np.asarray(x, dtype=float), np.asarray(y, dtype=float)))
+            segments.append(seg)
+            if len(seg):
+                bounds.append((np.nanmin(seg[:, 0]), np.nanmax(seg[:, 0]),
+                               np.nanmin(seg[:, 1]), np.nanmax(seg[:, 1])))
+            else:
+                bounds.append((np.nan, np.nan, np.nan, np.nan))
+        if not segments:
+            return
+        count = len(segments)
+        self._segments.extend(segments)
+        self._group_ids = np.concatenate((self._group_ids, np.full(count, gid)))
+        self._bounds = np.vstack((self._bounds, np.asarray(bounds, dtype=float)))
+        self._colors = np.vstack((self._colors, np.tile(to_rgba(info.color), (count, 1))))
+        self._widths = np.concatenate((self._widths, np.full(count, info.linewidth)))
+        self._styles.extend([info.linestyle] * count)
+        self._visible = np.concatenate((self._visible, np.full(count, info.visible)))
+        self._shown = None
+
+    def clear(self) -> None:
+        self.groups.clear()
+        self._group_index.clear()
+        self._segments = []
+        self._group_ids = np.empty(0, dtype=int)
+        self._bounds = np.empty((0, 4))
+        self._colors = np.empty((0, 4))
+        self._widths = np.empty(0)
+        self._styles = []
+        self._visible = np.empty(0, dtype=bool)
+        self._shown = None
+
+    def group_size(self, name: str) -> int:
+        return int(np.count_nonzero(self._group_ids == self._group_index[name]))
+
+    # ------------------------------------------------------------------
+    def _members(self, name: str) -> np.ndarray:
+        return np.flatnonzero(self._group_ids == self._group_index[name])
+
+    def set_group_color(self, name: str, color: str) -> None:
+        self.groups[self._group_index[name]].color = color
+        self._colors[self._members(name)] = to_rgba(color)
+
+    def set_group_colors(self, name: str, colors: Sequence[str]) -> None:
+        """Раскрашивает кривые группы по порядку цветами ``colors`` (по кругу)."""
+
+        members = self._members(name)
+        if not len(members) or not colors:
+            return
+        rgba = np.array([to_rgba(c) for c in colors])
+        self._colors[members] = rgba[np.arange(len(members)) % len(rgba)]
+
+    def set_group_linestyle(self, name: str, linestyle: str) -> None:
+        self.groups[self._group_index[name]].linestyle = linestyle
+        for idx in self._members(name):
+            self._styles[idx] = linestyle
+
+    def set_group_linewidth(self, name: str, linewidth: float) -> None:
+        self.groups[self._group_index[name]].linewidth = linewidth
+        self._widths[self._members(name)] = linewidth
+
+    def set_group_visible(self, name: str, visible: bool) -> None:
+        self.groups[self._group_index[name]].visible = visible
+        self._visible[self._members(name)] = visible
+
+    # ------------------------------------------------------------------
+    def update(self, autoscale: bool = True) -> None:
+        """Передаёт видимые кривые и их оформление в ``LineCollection``."""
+
+        shown = np.flatnonzero(self._visible)
+        if self._shown is None or not np.array_equal(shown, self._shown):
+            # пути пересчитываются только при изменении набора кривых
+            self.collection.set_data_segments([self._segments[idx] for idx in shown])
+            self._shown = shown
+        self.collection.set_color(self._colors[shown])
+        self.collection.set_linewidth(self._widths[shown])
+        self.collection.set_linestyle([self._styles[idx] for idx in shown])
+        if autoscale:
+            self._autoscale(shown)
+
+    def _autoscale(self, shown: np.ndarray) -> None:
+        if hasattr(self.ax, "relim"):
+            self.ax.relim()
+        if len(shown):
+            bounds = self._bounds[shown]
+            if not np.all(np.isnan(bounds)):
+                xmin, ymin = np.nanmin(bounds[:, 0]), np.nanmin(bounds[:, 2])
+                xmax, ymax = np.nanmax(bounds[:, 1]), np.nanmax(bounds[:, 3])
+                self.ax.update_datalim([(xmin, ymin), (xmax, ymax)])
+        if hasattr(self.ax, "autoscale_view"):
+            self.ax.autoscale_view()
+
+    def legend_handles(self) -> List[Line2D]:
+        """Подписи для легенды: по одной на видимую группу."""
+
+        return [
+            Line2D([], [], color=g.color, linestyle=g.linestyle, linewidth=g.linewidth, label=g.name)
+            for g in self.groups
+            if g.visible
+        ]
+
+
+class CurveGroupEditor(ttk.Frame):
+    """Панель оформления диаграммы ``CurveCollectionView`` по группам кривых.
+
+    Для каждой группы показывается одна строка: видимость, цвет, тип линии
+    и толщина.  Палитра раскрашивает группы по порядку либо, в режиме
+    «внутри групп», кривые каждой группы.
+    """
+
+    def __init__(self, parent: tk.Widget, view: CurveCollectionView, canvas) -> None:
+        super().__init__(parent)
+        self.view = view
+        self.canvas = canvas
+        self._line_styles = ["-", "--", "-.", ":"]
+        self._rows: Dict[str, tk.Label] = {}
+
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X, pady=2)
+        self.palette_combo = ttk.Combobox(top, values=list(PALETTES.keys()), state="readonly")
+        self.palette_combo.current(0)
+        self.palette_combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.palette_combo.bind("<<ComboboxSelected>>", lambda _e: self.apply_selected_palette())
+        self.within_groups_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            top,
+            text="Внутри групп",
+            variable=self.within_groups_var,
+            command=self.apply_selected_palette,
+        ).pack(side=tk.RIGHT, padx=(6, 0))
+
+        self.row_container = ttk.Frame(self)
+        self.row_container.pack(fill=tk.X)
+
+    def refresh(self) -> None:
+        """Перестраивает строки по текущему списку групп."""
+
+        for child in self.row_container.winfo_children():
+            child.destroy()
+        self._rows.clear()
+        for group in self.view.groups:
+            self._append_row(group)
+
+    def _append_row(self, group: CurveGroup) -> None:
+        row = ttk.Frame(self.row_container)
+        row.pack(fill=tk.X, pady=2)
+
+        visible_var = tk.BooleanVar(value=group.visible)
+        ttk.Checkbutton(
+            row,
+            variable=visible_var,
+            command=lambda: self._set_visible(group, visible_var.get()),
+        ).pack(side=tk.LEFT)
+        ttk.Label(row, text=f"{group.name} ({self.view.group_size(group.name)})").pack(
+            side=tk.LEFT, padx=5
+        )
+
+        colour_lbl = tk.Label(row, bg=group.color, width=4)
+        colour_lbl.pack(side=tk.LEFT, padx=5)
+        colour_lbl.bind("<Button-1>", lambda _e: self._choose_colour(group, colour_lbl))
+        self._rows[group.name] = colour_lbl
+
+        style_box = ttk.Combobox(row, values=self._line_styles, width=4)
+        style_box.set(group.linestyle)
+        style_box.pack(side=tk.LEFT, padx=5)
+        style_box.bind(
+            "<<ComboboxSelected>>",
+            lambda _e: self._apply(self.view.set_group_linestyle, group, style_box.get()),
+        )
+
+        width_scale = ttk.Scale(row, from_=0.5, to=6, orient=tk.HORIZONTAL)
+        width_scale.set(group.linewidth)
+        width_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        width_scale.configure(
+            command=lambda v: self._apply(self.view.set_group_linewidth, group, float(v))
+        )
+
+    # ------------------------------------------------------------------
+    def _apply(self, setter, group: CurveGroup, value) -> None:
+        setter(group.name, value)
+        self.view.update(autoscale=False)
+        self._redraw_canvas()
+
+    def _set_visible(self, group: CurveGroup, visible: bool) -> None:
+        self.view.set_group_visible(group.name, visible)
+        self.view.update()
+        self._redraw_canvas()
+
+    def _choose_colour(self, group: CurveGroup, label: tk.Label) -> None:
+        colour_code = colorchooser.askcolor(color=group.color)[1]
+        if colour_code:
+            label.config(bg=colour_code)
+            self._apply(self.view.set_group_color, group, colour_code)
+
+    def apply_palette(self, palette_name: str, within_groups: Optional[bool] = None) -> None:
+        colors = PALETTES.get(palette_name, [])
+        if not colors:
+            return
+        if within_groups is None:
+            within_groups = self.within_groups_var.get()
+        for idx, group in enumerate(self.view.groups):
+            if within_groups:
+                self.view.set_group_colors(group.name, colors)
+            else:
+                color = colors[idx % len(colors)]
+                self.view.set_group_color(group.name, color)
+                if group.name in self._rows:
+                    self._rows[group.name].config(bg=color)
+        self.view.update(autoscale=False)
+        self._redraw_canvas()
+
+    def apply_selected_palette(self) -> None:
+        self.apply_palette(self.palette_combo.get())
+
+    def _redraw_canvas(self) -> None:
+        if hasattr(self.canvas, "draw_idle"):
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
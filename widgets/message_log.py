@@ -1,4 +1,7 @@
+import logging
+import threading
 import tkinter as tk
+from collections import deque
 
 
 def message_log(log_text, message):
@@ -8,3 +11,102 @@ def message_log(log_text, message):
     log_text.config(state='disabled')
     log_text.yview(tk.END)
 
+
+def text_line_count(text_widget):
+    """Возвращает число строк в текстовом виджете, не читая его содержимое."""
+    return int(text_widget.index("end-1c").split(".")[0])
+
+
+class LogConsole:
+    """Буферизованный вывод сообщений в текстовый виджет.
+
+    Сообщения складываются в кольцевой буфер (добавлять можно из любого
+    потока) и переносятся в виджет пачкой по таймеру Tk.  Строки сверх
+    ``max_lines`` удаляются с начала, так что размер лога ограничен.
+    Если буфер переполняется между сбросами, самые старые сообщения
+    отбрасываются, а в лог выводится их количество.
+    """
+
+    def __init__(self, text_widget, max_lines=5000, buffer_size=10000, interval=100):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.interval = interval
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._job = None
+        self.start()
+
+    def write(self, message):
+        """Ставит сообщение в очередь на вывод (потокобезопасно)."""
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                # append вытеснит самое старое сообщение
+                self._dropped += 1
+            self._buffer.append(message)
+
+    def start(self):
+        if self._job is None:
+            self._job = self.text.after(self.interval, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.text.after_cancel(self._job)
+            self._job = None
+        self.flush()
+
+    def _tick(self):
+        self._job = None
+        try:
+            self.flush()
+        except tk.TclError:
+            # виджет уничтожен — вывод прекращается
+            return
+        self._job = self.text.after(self.interval, self._tick)
+
+    def flush(self):
+        """Переносит накопленные сообщения в виджет одной вставкой."""
+        with self._lock:
+            lines = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+        if dropped > 0:
+            lines.insert(0, f"... пропущено сообщений: {dropped}")
+        if not lines:
+            return
+        follow = self.text.yview()[1] >= 0.999
+        self.text.config(state='normal')
+        self.text.insert(tk.END, "\n".join(lines) + "\n")
+        if self.max_lines > 0:
+            excess = text_line_count(self.text) - 1 - self.max_lines
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+        self.text.config(state='disabled')
+        if follow:
+            self.text.yview(tk.END)
+
+    def handler(self, level=logging.NOTSET, fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s"):
+        """Создаёт обработчик ``logging``, пишущий в эту консоль."""
+        handler = LogConsoleHandler(self, level)
+        handler.setFormatter(logging.Formatter(fmt))
+        return handler
+
+    def attach(self, logger, level=logging.NOTSET):
+        """Подключает консоль к логгеру (например, из ``logging_utils.get_logger``)."""
+        handler = self.handler(level)
+        logger.addHandler(handler)
+        return handler
+
+
+class LogConsoleHandler(logging.Handler):
+    """Обработчик ``logging``, передающий записи в ``LogConsole``."""
+
+    def __init__(self, console, level=logging.NOTSET):
+        super().__init__(level)
+        self.console = console
+
+    def emit(self, record):
+        try:
+            self.console.write(self.format(record))
+        except Exception:
+            self.handleError(record)
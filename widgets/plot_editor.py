@@ -6,6 +6,12 @@
 расположенных на одной линии.  Ползунки позволяют ограничить диапазон
 данных без повторного чтения файлов: исходные точки сохраняются в объекте
 линии и переиспользуются при перемещении бегунков.
+
+Для очень длинных кривых исходные точки один раз переводятся в массивы
+NumPy, границы диапазона ищутся через ``searchsorted``, а на холст уходит
+прореженная по столбцам пикселей копия (минимум и максимум в каждом
+столбце).  При приближении видимый участок перестраивается заново, так что
+в крупном масштабе кривая показывается с полным разрешением.
 """
 
 from __future__ import annotations
@@ -13,6 +19,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
+import numpy as np
 import tkinter as tk
 from tkinter import ttk, colorchooser
 
@@ -21,6 +28,52 @@ from .range_line import RangeLine
 from .text_widget import create_text
 
 
+@dataclass
+class _CurveData:
+    """Полные данные кривой в виде массивов NumPy."""
+
+    x: np.ndarray
+    y: np.ndarray
+    is_sorted: bool
+    source: object
+
+
+def _decimate_minmax(
+    x: np.ndarray, y: np.ndarray, edges: Optional[np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Прореживает кривую по столбцам пикселей, сохраняя минимум и максимум.
+
+    ``edges`` — границы столбцов пикселей по X (возрастают).  Точки
+    раскладываются по столбцам через ``np.searchsorted``; точки левее и
+    правее окна попадают в два крайних внешних столбца.  Из каждого столбца
+    берутся первая и последняя точки и точки с наименьшим и наибольшим Y в
+    исходном порядке, поэтому огибающая кривой на экране не меняется.
+    """
+
+    n = len(x)
+    if edges is None or len(edges) < 2 or n <= 4 * (len(edges) - 1):
+        return x, y
+    column = np.searchsorted(edges, x, side="right")
+    # для возрастающего X перестановка тождественна, но X может и не быть упорядочен
+    order = np.argsort(column, kind="stable")
+    sorted_column = column[order]
+    starts = np.flatnonzero(np.r_[True, sorted_column[1:] != sorted_column[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    counts = ends - starts + 1
+    ys = y[order]
+    position = np.arange(n)
+
+    def extreme(reduce) -> np.ndarray:
+        # первая позиция в столбце, где Y равен экстремуму (NaN пропускаются)
+        value = np.repeat(reduce.reduceat(ys, starts), counts)
+        found = np.minimum.reduceat(np.where(ys == value, position, n), starts)
+        return np.where(found < n, found, starts)
+
+    keep = order[np.concatenate((starts, ends, extreme(np.fmin), extreme(np.fmax)))]
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
 @dataclass
 class _RowWidgets:
     """Хранит элементы управления, связанные с одной кривой."""
@@ -48,6 +101,28 @@ class _RangeWidgets:
     manual_upper_entry: tk.Entry
     line: object
     index: int
+    title: ttk.Label
+
+
+@dataclass
+class _CurveControls:
+    """Кривая и её элементы управления.
+
+    Рамки-заполнители создаются сразу, а строки внутри них — только когда
+    рамка впервые попадает в видимую часть панели.
+    """
+
+    line: object
+    index: int
+    row_holder: ttk.Frame
+    range_holder: ttk.Frame
+    row: Optional[_RowWidgets] = None
+    range: Optional[_RangeWidgets] = None
+
+
+# Высота рамок-заполнителей до создания строк (пиксели)
+_ROW_HEIGHT_HINT = 30
+_RANGE_HEIGHT_HINT = 90
 
 
 class PlotEditor(ttk.Frame):
@@ -59,18 +134,27 @@ class PlotEditor(ttk.Frame):
         ax,
         canvas,
         saved_data: Optional[List[dict]] = None,
+        max_height: int = 600,
     ) -> None:
         super().__init__(parent)
         self.ax = ax
         self.canvas = canvas
         self.saved_data = saved_data if saved_data is not None else []
-        self._rows: List[_RowWidgets] = []
-        self._range_controls: List[_RangeWidgets] = []
+        self._curves: List[_CurveControls] = []
         self._cached_height = 0
+        self._max_height = max_height
+        self._materialize_job: Optional[str] = None
         self._fixed_limits: Optional[
             tuple[tuple[float, float], tuple[float, float]]
         ] = None
         self.fix_axes_var = tk.BooleanVar(value=False)
+        self._rendering = False
+        self._blit_line = None
+        self._blit_background = None
+        if hasattr(ax, "callbacks"):
+            ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+        if hasattr(canvas, "mpl_connect"):
+            canvas.mpl_connect("draw_event", self._on_canvas_draw)
 
         self._line_styles = ["-", "--", "-.", ":"]
         self._style_box_width = max(len(style) for style in self._line_styles) + 2
@@ -84,49 +168,93 @@ class PlotEditor(ttk.Frame):
             "<<ComboboxSelected>>", lambda _e: self.apply_selected_palette()
         )
 
-        self.row_container = ttk.Frame(self)
+        # Прокручиваемая область: строки кривых создаются по мере появления
+        # в видимой части, до этого на их месте стоят пустые рамки.
+        self._scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL)
+        self._scroll_canvas = tk.Canvas(
+            self, highlightthickness=0, bd=0, height=1,
+            yscrollcommand=self._on_yscroll,
+        )
+        self._scrollbar.configure(command=self._scroll_canvas.yview)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._scroll_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._body = ttk.Frame(self._scroll_canvas)
+        self._body_window = self._scroll_canvas.create_window(
+            0, 0, window=self._body, anchor="nw"
+        )
+        self._body.bind("<Configure>", self._on_body_configure)
+        self._scroll_canvas.bind("<Configure>", self._on_viewport_configure)
+        for widget in (self._scroll_canvas, self._body):
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+            widget.bind("<Button-4>", lambda _e: self._scroll_canvas.yview_scroll(-1, "units"))
+            widget.bind("<Button-5>", lambda _e: self._scroll_canvas.yview_scroll(1, "units"))
+
+        self.row_container = ttk.Frame(self._body)
         self.row_container.pack(fill=tk.X, expand=False)
 
-        self.separator = ttk.Separator(self, orient=tk.HORIZONTAL)
-        self.range_container = ttk.Frame(self)
+        self.separator = ttk.Separator(self._body, orient=tk.HORIZONTAL)
+        self.range_container = ttk.Frame(self._body)
+        self._build_range_header()
 
     # ------------------------------------------------------------------
     # ------------------------------------------------------------------
     def refresh(self) -> None:
-        """Перестраивает панели на основе текущих линий осей."""
-
-        for row in self._rows:
-            row.frame.destroy()
-        self._rows.clear()
+        """Согласует панели с текущими линиями осей.
 
-        for controls in self._range_controls:
-            controls.frame.destroy()
-        self._range_controls.clear()
-
-        for child in self.range_container.winfo_children():
-            child.destroy()
-        self.separator.pack_forget()
-        self.range_container.pack_forget()
+        Элементы управления сопоставляются с линиями по идентичности объекта:
+        для новых линий заводятся строки, строки исчезнувших линий удаляются,
+        остальные сохраняются вместе с их состоянием.
+        """
 
+        self._end_blit()
         lines = list(self.ax.lines)
-        for idx, line in enumerate(lines, start=1):
-            self._append_row(line, idx)
+        alive = {id(line) for line in lines}
+        existing = {}
+        kept_before = []
+        for curve in self._curves:
+            if id(curve.line) in alive:
+                existing[id(curve.line)] = curve
+                kept_before.append(curve)
+            else:
+                curve.row_holder.destroy()
+                curve.range_holder.destroy()
 
-        if lines:
+        curves: List[_CurveControls] = []
+        added: List[_CurveControls] = []
+        for idx, line in enumerate(lines, start=1):
+            curve = existing.get(id(line))
+            if curve is None:
+                curve = self._create_curve(line, idx)
+                added.append(curve)
+            elif curve.index != idx:
+                self._set_curve_index(curve, idx)
+            curves.append(curve)
+
+        kept_after = [id(curve) for curve in curves if id(curve.line) in existing]
+        appended_only = [id(curve) for curve in curves[: len(kept_after)]] == kept_after
+        self._curves = curves
+        if kept_after != [id(curve) for curve in kept_before] or not appended_only:
+            self._repack_curves()
+
+        if curves:
             self.separator.pack(fill=tk.X, pady=(6, 4))
             self.range_container.pack(fill=tk.X, pady=(0, 0))
-            self._build_range_controls(lines)
-
-        self.apply_selected_palette()
-        self._update_size_hint()
+        else:
+            self.separator.pack_forget()
+            self.range_container.pack_forget()
+
+        if added:
+            self._apply_palette_to(added)
+            self._rendering = True
+            try:
+                self._update_axes_limits()
+            finally:
+                self._rendering = False
+            self._refresh_legend()
+        self._cached_height = 0
+        self._schedule_materialize()
 
     # ------------------------------------------------------------------
-    def _update_size_hint(self) -> None:
-        """Запоминает требуемую высоту редактора после перестройки."""
-
-        self.update_idletasks()
-        self._cached_height = max(self.winfo_reqheight(), 1)
-
     @property
     def required_height(self) -> int:
         """Возвращает актуальную высоту, необходимую для отображения всех элементов."""
@@ -134,14 +262,92 @@ class PlotEditor(ttk.Frame):
         if self._cached_height:
             return self._cached_height
         self.update_idletasks()
-        return max(self.winfo_reqheight(), 1)
+        self._cached_height = max(self.winfo_reqheight(), 1)
+        return self._cached_height
+
+    # ------------------------------------------------------------------
+    def _create_curve(self, line, index: int) -> _CurveControls:
+        row_holder = ttk.Frame(self.row_container, height=_ROW_HEIGHT_HINT)
+        row_holder.pack(fill=tk.X, pady=2)
+        row_holder.pack_propagate(False)
+        range_holder = ttk.Frame(self.range_container, height=_RANGE_HEIGHT_HINT)
+        range_holder.pack(fill=tk.X, padx=5, pady=6)
+        range_holder.pack_propagate(False)
+
+        start, end = self._initial_range_values(line, index)
+        self._update_saved_data(index, start, end)
+        self._set_line_range(line, start, end)
+        return _CurveControls(line, index, row_holder, range_holder)
+
+    def _set_curve_index(self, curve: _CurveControls, index: int) -> None:
+        curve.index = index
+        if curve.row is not None:
+            curve.row.label.config(text=f"Кривая {index}")
+        if curve.range is not None:
+            curve.range.index = index
+            curve.range.title.config(text=f"Кривая {index}")
+
+    def _repack_curves(self) -> None:
+        for curve in self._curves:
+            curve.row_holder.pack_forget()
+            curve.range_holder.pack_forget()
+        for curve in self._curves:
+            curve.row_holder.pack(fill=tk.X, pady=2)
+            curve.range_holder.pack(fill=tk.X, padx=5, pady=6)
 
     # ------------------------------------------------------------------
-    def _append_row(self, line, index: int) -> None:
-        row_frame = ttk.Frame(self.row_container)
-        row_frame.pack(fill=tk.X, pady=2)
+    def _on_body_configure(self, event: tk.Event) -> None:
+        self._scroll_canvas.configure(
+            scrollregion=(0, 0, event.width, event.height),
+            height=min(event.height, self._max_height),
+        )
+        self._cached_height = 0
+        self._schedule_materialize()
+
+    def _on_viewport_configure(self, event: tk.Event) -> None:
+        self._scroll_canvas.itemconfigure(self._body_window, width=event.width)
+        self._schedule_materialize()
+
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self._scrollbar.set(first, last)
+        self._schedule_materialize()
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        self._scroll_canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def _schedule_materialize(self) -> None:
+        if self._materialize_job is None:
+            self._materialize_job = self.after_idle(self._materialize_visible)
+
+    def _materialize_visible(self) -> None:
+        """Создаёт виджеты для строк, попавших в видимую часть области."""
+
+        self._materialize_job = None
+        view_top = self._scroll_canvas.canvasy(0)
+        view_bottom = view_top + max(self._scroll_canvas.winfo_height(), _ROW_HEIGHT_HINT)
+        margin = _RANGE_HEIGHT_HINT
+        for curve in self._curves:
+            if curve.row is None and self._in_view(
+                curve.row_holder, self.row_container, view_top - margin, view_bottom + margin
+            ):
+                self._build_row(curve)
+            if curve.range is None and self._in_view(
+                curve.range_holder, self.range_container, view_top - margin, view_bottom + margin
+            ):
+                self._build_range_row(curve)
+
+    @staticmethod
+    def _in_view(holder: ttk.Frame, container: ttk.Frame, top: float, bottom: float) -> bool:
+        y = container.winfo_y() + holder.winfo_y()
+        return y <= bottom and y + max(holder.winfo_height(), 1) >= top
 
-        name_lbl = ttk.Label(row_frame, text=f"Кривая {index}")
+    # ------------------------------------------------------------------
+    def _build_row(self, curve: _CurveControls) -> None:
+        line = curve.line
+        row_frame = curve.row_holder
+        row_frame.pack_propagate(True)
+
+        name_lbl = ttk.Label(row_frame, text=f"Кривая {curve.index}")
         name_lbl.pack(side=tk.LEFT, padx=5)
 
         colour_lbl = tk.Label(row_frame, bg=line.get_color(), width=4)
@@ -169,12 +375,10 @@ class PlotEditor(ttk.Frame):
             command=lambda v, ln=line: self._update_width(ln, float(v))
         )
 
-        self._rows.append(
-            _RowWidgets(row_frame, name_lbl, colour_lbl, style_box, width_scale)
-        )
+        curve.row = _RowWidgets(row_frame, name_lbl, colour_lbl, style_box, width_scale)
 
     # ------------------------------------------------------------------
-    def _build_range_controls(self, lines: List) -> None:
+    def _build_range_header(self) -> None:
         header_frame = ttk.Frame(self.range_container)
         header_frame.pack(fill=tk.X, padx=5)
 
@@ -189,14 +393,12 @@ class PlotEditor(ttk.Frame):
         )
         fix_axes.pack(side=tk.RIGHT)
 
-        for idx, line in enumerate(lines, start=1):
-            self._append_range_row(line, idx)
-
-    def _append_range_row(self, line, index: int) -> None:
-        frame = ttk.Frame(self.range_container)
-        frame.pack(fill=tk.X, padx=5, pady=6)
+    def _build_range_row(self, curve: _CurveControls) -> None:
+        line = curve.line
+        frame = curve.range_holder
+        frame.pack_propagate(True)
 
-        title = ttk.Label(frame, text=f"Кривая {index}")
+        title = ttk.Label(frame, text=f"Кривая {curve.index}")
         title.pack(side=tk.LEFT, padx=(0, 10))
 
         slider_holder = ttk.Frame(frame)
@@ -205,7 +407,7 @@ class PlotEditor(ttk.Frame):
         scales_frame = ttk.Frame(slider_holder)
         scales_frame.pack(fill=tk.X)
 
-        start_val, end_val = self._initial_range_values(line, index)
+        start_val, end_val = self._initial_range_values(line, curve.index)
 
         slider = RangeLine(
             scales_frame,
@@ -259,15 +461,17 @@ class PlotEditor(ttk.Frame):
             manual_lower_entry,
             manual_upper_entry,
             line,
-            index,
+            curve.index,
+            title,
         )
-        self._range_controls.append(controls)
+        curve.range = controls
 
         slider.command = (
             lambda lower, upper, ctrl=controls: self._on_range_change(
                 ctrl, lower, upper
             )
         )
+        slider.release_command = self._end_blit
 
         manual_lower_entry.bind(
             "<FocusOut>",
@@ -286,7 +490,9 @@ class PlotEditor(ttk.Frame):
             lambda _e, ctrl=controls: self._on_manual_range_change(ctrl),
         )
 
-        self._apply_range(controls)
+        # данные линии уже обрезаны при создании записи кривой
+        self._update_range_labels(controls, start_val, end_val)
+        self._update_manual_inputs(controls)
 
     # ------------------------------------------------------------------
     def _coerce_percentage(self, value, default: float) -> float:
@@ -325,13 +531,14 @@ class PlotEditor(ttk.Frame):
     def _on_range_change(
         self, controls: _RangeWidgets, lower: float, upper: float
     ) -> None:
-        self._apply_range(controls, lower, upper)
+        self._apply_range(controls, lower, upper, live=True)
 
     def _apply_range(
         self,
         controls: _RangeWidgets,
         lower: Optional[float] = None,
         upper: Optional[float] = None,
+        live: bool = False,
     ) -> None:
         if lower is None or upper is None:
             lower, upper = controls.slider.get()
@@ -339,7 +546,7 @@ class PlotEditor(ttk.Frame):
             controls.slider.set(lower=lower, upper=upper, notify=False)
         self._update_range_labels(controls, lower, upper)
         self._update_saved_data(controls.index, lower, upper)
-        self._update_line_range(controls.line, lower, upper)
+        self._update_line_range(controls.line, lower, upper, live=live)
         self._update_manual_inputs(controls)
 
     def _update_saved_data(self, index: int, start: float, end: float) -> None:
@@ -347,41 +554,146 @@ class PlotEditor(ttk.Frame):
             self.saved_data[index - 1]["slider_start"] = start
             self.saved_data[index - 1]["slider_end"] = end
 
-    def _update_line_range(self, line, start: float, end: float) -> None:
+    def _curve_data(self, line) -> Optional[_CurveData]:
+        """Возвращает (и кэширует на линии) полные данные кривой как массивы."""
+
         full_x = getattr(line, "_full_x", None)
         full_y = getattr(line, "_full_y", None)
-        if not full_x or not full_y:
+        if full_x is None or full_y is None:
+            return None
+        cached = getattr(line, "_curve_data", None)
+        if (
+            cached is not None
+            and cached.source is full_x
+            and len(cached.x) == len(full_x)
+        ):
+            return cached
+        if len(full_x) == 0 or len(full_x) != len(full_y):
+            return None
+        x = np.asarray(full_x, dtype=float)
+        y = np.asarray(full_y, dtype=float)
+        is_sorted = bool(len(x) < 2 or np.all(x[1:] >= x[:-1]))
+        data = _CurveData(x, y, is_sorted, full_x)
+        setattr(line, "_curve_data", data)
+        return data
+
+    def _range_indices(self, size: int, start: float, end: float) -> tuple[int, int]:
+        max_index = size - 1
+        start_idx = int(round(max_index * start / 100))
+        end_idx = int(round(max_index * end / 100))
+        if end_idx < start_idx:
+            start_idx, end_idx = end_idx, start_idx
+        start_idx = max(0, min(start_idx, max_index))
+        end_idx = max(start_idx, min(end_idx, max_index))
+        return start_idx, end_idx
+
+    def _update_line_range(
+        self, line, start: float, end: float, live: bool = False
+    ) -> None:
+        if not self._set_line_range(line, start, end):
             return
-        if len(full_x) != len(full_y):
+        if live and self._can_blit():
+            self._blit(line)
             return
-        if len(full_x) <= 1:
-            line.set_data(full_x, full_y)
-        else:
-            max_index = len(full_x) - 1
-            start_idx = int(round(max_index * start / 100))
-            end_idx = int(round(max_index * end / 100))
-            if end_idx < start_idx:
-                start_idx, end_idx = end_idx, start_idx
-            start_idx = max(0, min(start_idx, max_index))
-            end_idx = max(start_idx, min(end_idx, max_index))
-            new_x = full_x[start_idx : end_idx + 1]
-            new_y = full_y[start_idx : end_idx + 1]
-            if not new_x or not new_y:
-                return
-            line.set_data(new_x, new_y)
+        self._rendering = True
+        try:
+            self._update_axes_limits()
+        finally:
+            self._rendering = False
+        self._redraw_canvas()
+
+    def _set_line_range(self, line, start: float, end: float) -> bool:
+        """Запоминает диапазон на линии и обновляет её данные без перерисовки."""
+
+        data = self._curve_data(line)
+        if data is None:
+            return False
+        setattr(line, "_range_indices", self._range_indices(len(data.x), start, end))
         setattr(line, "_slider_start", start)
         setattr(line, "_slider_end", end)
-        self._update_axes_limits()
+        self._render_line(line)
+        return True
+
+    def _render_line(self, line) -> None:
+        """Передаёт линии видимую часть диапазона, прореженную до ширины осей."""
+
+        data = self._curve_data(line)
+        if data is None:
+            return
+        start_idx, end_idx = getattr(line, "_range_indices", (0, len(data.x) - 1))
+        end_idx = min(end_idx, len(data.x) - 1)
+        narrowed = (
+            data.is_sorted
+            and hasattr(self.ax, "get_autoscalex_on")
+            and not self.ax.get_autoscalex_on()
+        )
+        if narrowed:
+            # оси заданы вручную (фиксация или приближение): берём только
+            # попавшие в окно точки плюс по одной соседней с каждой стороны
+            left, right = sorted(self.ax.get_xlim())
+            lo = int(np.searchsorted(data.x, left, side="left")) - 1
+            hi = int(np.searchsorted(data.x, right, side="right"))
+            start_idx = max(start_idx, lo)
+            end_idx = min(end_idx, hi)
+            if end_idx < start_idx:
+                end_idx = start_idx
+        x = data.x[start_idx : end_idx + 1]
+        y = data.y[start_idx : end_idx + 1]
+        x, y = _decimate_minmax(x, y, self._pixel_edges())
+        line.set_data(x, y)
+        setattr(line, "_narrowed", narrowed)
+
+    def _pixel_columns(self) -> int:
+        bbox = getattr(self.ax, "bbox", None)
+        if bbox is None:
+            return 0
+        return max(int(bbox.width), 1)
+
+    def _pixel_edges(self) -> Optional[np.ndarray]:
+        """Границы столбцов пикселей осей по X в координатах данных."""
+
+        columns = self._pixel_columns()
+        if columns <= 0 or not hasattr(self.ax, "get_xlim"):
+            return None
+        left, right = sorted(self.ax.get_xlim())
+        if not left < right:
+            return None
+        if getattr(self.ax, "get_xscale", lambda: "linear")() == "log" and left > 0:
+            return np.geomspace(left, right, columns + 1)
+        return np.linspace(left, right, columns + 1)
+
+    def _on_xlim_changed(self, _ax) -> None:
+        if self._rendering:
+            return
+        self._rendering = True
+        try:
+            for curve in self._curves:
+                self._render_line(curve.line)
+        finally:
+            self._rendering = False
         self._redraw_canvas()
 
+    def _range_bounds(self, line) -> Optional[tuple[float, float]]:
+        """Значения X на границах выбранного диапазона (по полным данным)."""
+
+        data = self._curve_data(line)
+        if data is None:
+            x_data = np.asarray(line.get_xdata())
+            if not len(x_data):
+                return None
+            return float(x_data[0]), float(x_data[-1])
+        start_idx, end_idx = getattr(line, "_range_indices", (0, len(data.x) - 1))
+        end_idx = min(end_idx, len(data.x) - 1)
+        return float(data.x[start_idx]), float(data.x[end_idx])
+
     def _update_manual_inputs(self, controls: _RangeWidgets) -> None:
-        x_data = list(controls.line.get_xdata())
-        if not x_data:
+        bounds = self._range_bounds(controls.line)
+        if bounds is None:
             controls.manual_lower.set("")
             controls.manual_upper.set("")
             return
-        controls.manual_lower.set(self._format_x_value(x_data[0]))
-        controls.manual_upper.set(self._format_x_value(x_data[-1]))
+        controls.manual_lower.set(self._format_x_value(bounds[0]))
+        controls.manual_upper.set(self._format_x_value(bounds[1]))
 
     def _format_x_value(self, value: float) -> str:
         return f"{value:.6g}"
@@ -407,26 +719,29 @@ class PlotEditor(ttk.Frame):
     def _manual_values_to_percentages(
         self, controls: _RangeWidgets, lower_val: float, upper_val: float
     ) -> Optional[tuple[float, float]]:
-        full_x = getattr(controls.line, "_full_x", None)
-        if not full_x:
-            full_x = list(controls.line.get_xdata())
-        if not full_x:
+        data = self._curve_data(controls.line)
+        if data is not None:
+            full_x, is_sorted = data.x, data.is_sorted
+        else:
+            full_x = np.asarray(controls.line.get_xdata(), dtype=float)
+            is_sorted = bool(len(full_x) < 2 or np.all(full_x[1:] >= full_x[:-1]))
+        if not len(full_x):
             return None
         if len(full_x) == 1:
             return 0.0, 100.0
         max_index = len(full_x) - 1
-        start_idx = 0
-        for idx, value in enumerate(full_x):
-            if value >= lower_val:
-                start_idx = idx
-                break
+        if is_sorted:
+            start_idx = int(np.searchsorted(full_x, lower_val, side="left"))
+            end_idx = int(np.searchsorted(full_x, upper_val, side="right")) - 1
         else:
+            above = np.flatnonzero(full_x >= lower_val)
+            below = np.flatnonzero(full_x <= upper_val)
+            start_idx = int(above[0]) if len(above) else max_index + 1
+            end_idx = int(below[-1]) if len(below) else -1
+        if start_idx > max_index:
             start_idx = max_index
-        end_idx = max_index
-        for idx in range(max_index, -1, -1):
-            if full_x[idx] <= upper_val:
-                end_idx = idx
-                break
+        if end_idx < 0:
+            end_idx = max_index
         if end_idx < start_idx:
             end_idx = start_idx
         lower_percent = start_idx * 100.0 / max_index
@@ -442,12 +757,23 @@ class PlotEditor(ttk.Frame):
         self._redraw_canvas()
 
     def apply_palette(self, palette_name: str) -> None:
-        colors = PALETTES.get(palette_name, [])
-        for line, color, row in zip(self.ax.lines, colors, self._rows):
-            line.set_color(color)
-            row.colour.config(bg=color)
+        self._apply_palette_to(self._curves, palette_name)
         self._refresh_legend()
 
+    def _apply_palette_to(
+        self, curves: List[_CurveControls], palette_name: Optional[str] = None
+    ) -> None:
+        if palette_name is None:
+            palette_name = self.palette_combo.get()
+        colors = PALETTES.get(palette_name, [])
+        for curve in curves:
+            if curve.index > len(colors):
+                continue
+            color = colors[curve.index - 1]
+            curve.line.set_color(color)
+            if curve.row is not None:
+                curve.row.colour.config(bg=color)
+
     def apply_selected_palette(self) -> None:
         self.apply_palette(self.palette_combo.get())
 
@@ -472,6 +798,7 @@ class PlotEditor(ttk.Frame):
         self._apply_axes_fix_state()
 
     def _apply_axes_fix_state(self) -> None:
+        self._end_blit(redraw=False)
         if self.fix_axes_var.get():
             self._fixed_limits = (self.ax.get_xlim(), self.ax.get_ylim())
             self._apply_fixed_limits()
@@ -483,8 +810,12 @@ class PlotEditor(ttk.Frame):
     def reset_ranges(self) -> None:
         """Возвращает все ползунки диапазона к значениям 0–100%."""
 
-        for controls in self._range_controls:
-            self._apply_range(controls, 0.0, 100.0)
+        for curve in self._curves:
+            if curve.range is not None:
+                self._apply_range(curve.range, 0.0, 100.0)
+            else:
+                self._update_saved_data(curve.index, 0.0, 100.0)
+                self._update_line_range(curve.line, 0.0, 100.0)
 
     def reset_axes_lock(self) -> None:
         """Сбрасывает фиксацию осей и возвращает автоматическое масштабирование."""
@@ -504,6 +835,15 @@ class PlotEditor(ttk.Frame):
     def _autoscale_axes(self) -> None:
         if hasattr(self.ax, "set_autoscale_on"):
             self.ax.set_autoscale_on(True)
+        # кривые, обрезанные по прежнему окну, возвращаются к полному
+        # диапазону до пересчёта пределов
+        was_rendering, self._rendering = self._rendering, True
+        try:
+            for curve in self._curves:
+                if getattr(curve.line, "_narrowed", False):
+                    self._render_line(curve.line)
+        finally:
+            self._rendering = was_rendering
         if hasattr(self.ax, "relim") and hasattr(self.ax, "autoscale_view"):
             self.ax.relim()
             self.ax.autoscale_view()
@@ -517,6 +857,55 @@ class PlotEditor(ttk.Frame):
             self._fixed_limits = None
             self._autoscale_axes()
 
+    # ------------------------------------------------------------------
+    # блиттинг при перетаскивании ползунков с фиксированными осями
+    # ------------------------------------------------------------------
+    def _can_blit(self) -> bool:
+        return (
+            self.fix_axes_var.get()
+            and self._fixed_limits is not None
+            and hasattr(self.canvas, "copy_from_bbox")
+            and hasattr(self.canvas, "restore_region")
+            and hasattr(self.canvas, "blit")
+        )
+
+    def _blit(self, line) -> None:
+        """Перерисовывает только ``line`` поверх сохранённого фона осей.
+
+        При первом вызове для линии она помечается анимированной, холст
+        рисуется целиком без неё и фон запоминается; дальше каждый кадр
+        восстанавливает фон и рисует одну линию.
+        """
+
+        if self._blit_line is not line:
+            self._end_blit(redraw=False)
+            self._blit_line = line
+            line.set_animated(True)
+            self.canvas.draw()
+        if self._blit_background is None:
+            return
+        self.canvas.restore_region(self._blit_background)
+        self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_canvas_draw(self, _event) -> None:
+        if self._blit_line is None:
+            return
+        # полная перерисовка (в том числе при изменении размера окна)
+        # обновляет фон, на котором рисуется перетаскиваемая линия
+        self._blit_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._blit_line)
+
+    def _end_blit(self, redraw: bool = True) -> None:
+        line = self._blit_line
+        if line is None:
+            return
+        self._blit_line = None
+        self._blit_background = None
+        line.set_animated(False)
+        if redraw:
+            self._redraw_canvas()
+
     def _redraw_canvas(self) -> None:
         if hasattr(self.canvas, "draw_idle"):
             self.canvas.draw_idle()
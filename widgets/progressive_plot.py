@@ -0,0 +1,122 @@
+"""Постепенное построение графиков по мере поступления результатов прогона.
+
+``ProgressivePlot`` подписывается на ``sweep.ResultStream`` и по таймеру Tk
+(по умолчанию 5 раз в секунду) забирает накопленные точки, дописывает их в
+кривые и запрашивает ``draw_idle``.  Точки каждой кривой хранятся в заранее
+выделенных массивах, ёмкость которых растёт геометрически, поэтому
+добавление порции не копирует уже накопленные данные, а пределы осей
+расширяются по границам новой порции без пересчёта по всем точкам.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import tkinter as tk
+
+
+class _GrowingSeries:
+    """Массивы X/Y с запасом ёмкости; ``view`` возвращает заполненную часть."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.x = np.empty(capacity)
+        self.y = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        need = self.size + len(xs)
+        if need > len(self.x):
+            capacity = max(need, 2 * len(self.x))
+            for name in ("x", "y"):
+                grown = np.empty(capacity)
+                grown[: self.size] = getattr(self, name)[: self.size]
+                setattr(self, name, grown)
+        self.x[self.size : need] = xs
+        self.y[self.size : need] = ys
+        self.size = need
+
+    def view(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.x[: self.size], self.y[: self.size]
+
+
+class ProgressivePlot:
+    """Достраивает кривые на осях ``ax`` по точкам из потока результатов."""
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        ax,
+        canvas,
+        stream,
+        *,
+        rate_hz: float = 5.0,
+        on_finished: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ) -> None:
+        self.widget = widget
+        self.ax = ax
+        self.canvas = canvas
+        self.stream = stream
+        self.on_finished = on_finished
+        self._interval = max(1, int(1000 / rate_hz))
+        self._series: Dict[str, _GrowingSeries] = {}
+        self._lines: Dict[str, object] = {}
+        self._job: Optional[str] = None
+
+    @property
+    def lines(self) -> Dict[str, object]:
+        return dict(self._lines)
+
+    def start(self) -> None:
+        if self._job is None:
+            self._job = self.widget.after(self._interval, self._poll)
+
+    def stop(self) -> None:
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _poll(self) -> None:
+        self._job = None
+        finished = self.stream.exhausted
+        points = self.stream.drain()
+        if points:
+            self._append(points)
+        if finished:
+            if self.ax.get_legend() is None and self._lines:
+                self.ax.legend()
+            self._redraw_canvas()
+            if self.on_finished is not None:
+                self.on_finished(self.stream.error)
+            return
+        self._job = self.widget.after(self._interval, self._poll)
+
+    def _append(self, points: List) -> None:
+        by_curve: Dict[str, List] = {}
+        for point in points:
+            by_curve.setdefault(point.curve, []).append(point)
+        for curve, chunk in by_curve.items():
+            xs = np.fromiter((p.x for p in chunk), dtype=float, count=len(chunk))
+            ys = np.fromiter((p.y for p in chunk), dtype=float, count=len(chunk))
+            series = self._series.get(curve)
+            if series is None:
+                series = self._series[curve] = _GrowingSeries()
+                (self._lines[curve],) = self.ax.plot([], [], label=curve)
+            series.extend(xs, ys)
+            self._lines[curve].set_data(*series.view())
+            finite = np.isfinite(xs) & np.isfinite(ys)
+            if finite.any():
+                self.ax.update_datalim(
+                    [
+                        (xs[finite].min(), ys[finite].min()),
+                        (xs[finite].max(), ys[finite].max()),
+                    ]
+                )
+        self.ax.autoscale_view()
+        self._redraw_canvas()
+
+    def _redraw_canvas(self) -> None:
+        if hasattr(self.canvas, "draw_idle"):
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
@@ -1,4 +1,5 @@
 # ui/widgets/range_line.py
+import time
 import tkinter as tk
 from tkinter import ttk
 
@@ -14,11 +15,18 @@ class RangeLine(ttk.Frame):
         width=360,
         height=28,
         command=None,
+        release_command=None,
+        frame_interval=16,
     ):
         super().__init__(master)
         self.from_ = float(from_)
         self.to = float(to)
         self.command = command  # callback(lower, upper)
+        self.release_command = release_command  # callback() по отпусканию бегунка
+        # при перетаскивании command вызывается не чаще раза за кадр (мс)
+        self.frame_interval = frame_interval
+        self._pending_notify = None
+        self._last_notify = 0.0
 
         self._width = width
         self._h = height
@@ -116,10 +124,17 @@ class RangeLine(ttk.Frame):
 
     def _on_drag(self, e):
         if self._dragging:
-            self._move_handle(self._dragging, e.x, notify=True)
+            self._move_handle(self._dragging, e.x, notify=False)
+            self._schedule_notify()
 
     def _on_release(self, _e):
+        was_dragging = self._dragging is not None
         self._dragging = None
+        if self._pending_notify is not None:
+            self.after_cancel(self._pending_notify)
+            self._flush_notify()
+        if was_dragging and self.release_command:
+            self.release_command()
 
     def _move_handle(self, which, x, notify=True):
         v = self._quantize(self._x2val(x))
@@ -130,3 +145,25 @@ class RangeLine(ttk.Frame):
         self._draw_dynamic()
         if notify and self.command:
             self.command(self.lower, self.upper)
+
+    # --- объединение событий перетаскивания ---
+    def _schedule_notify(self):
+        """Откладывает вызов command так, чтобы он шёл не чаще раза за кадр.
+
+        Серия событий <B1-Motion> между кадрами сводится к одному вызову с
+        последними значениями бегунков.
+        """
+        if self._pending_notify is not None or not self.command:
+            return
+        elapsed = (time.perf_counter() - self._last_notify) * 1000
+        if elapsed >= self.frame_interval:
+            self._pending_notify = self.after_idle(self._flush_notify)
+        else:
+            delay = max(1, int(self.frame_interval - elapsed))
+            self._pending_notify = self.after(delay, self._flush_notify)
+
+    def _flush_notify(self):
+        self._pending_notify = None
+        self._last_notify = time.perf_counter()
+        if self.command:
+            self.command(self.lower, self.upper)
@@ -3,6 +3,7 @@ from tkinter import ttk
 
 from .context_menu import make_context_menu
 from .hotkeys import add_hotkeys
+from .message_log import text_line_count
 
 
 def create_text(parent, method='text', height=10, wrap='word', state='normal', scrollbar=False, max_lines=0):
@@ -16,9 +17,7 @@ def create_text(parent, method='text', height=10, wrap='word', state='normal', s
             def limit_text_lines(text_widget, max_lines):
                 def check_lines(event):
                     if max_lines > 0:
-                        current_text = text_widget.get("1.0", tk.END)
-                        lines = current_text.splitlines()
-                        if len(lines) > max_lines:
+                        if text_line_count(text_widget) > max_lines:
                             text_widget.delete(f"{max_lines + 1}.0", tk.END)
 
                 text_widget.bind("<KeyRelease>", check_lines)
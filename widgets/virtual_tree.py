@@ -0,0 +1,491 @@
+"""Виртуализированная таблица на основе ``ttk.Treeview``.
+
+Строки хранятся в модели (словарь «ключ → значения»), а в самом
+``Treeview`` создаётся лишь столько элементов, сколько помещается на экране.
+При прокрутке эти элементы получают значения очередного окна данных, поэтому
+стоимость открытия и прокрутки не зависит от числа строк.  Изменения модели
+применяются точечно (вставка, обновление, удаление по ключу), сортировка и
+фильтрация меняют только порядок ключей и не пересоздают элементы.
+Ячейки можно редактировать на месте, а строки — вставлять из буфера обмена
+в виде TSV (формат копирования из Excel).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import tkinter as tk
+from tkinter import ttk
+
+from .hotkeys import add_hotkeys
+
+RowValues = Tuple[object, ...]
+RowFilter = Callable[[Hashable, RowValues], bool]
+CellCommit = Callable[[Hashable, str, str], None]
+CellChoices = Callable[[Hashable, str], Optional[Sequence[str]]]
+
+
+def _sort_value(value: object) -> tuple:
+    """Ключ сортировки ячейки: числа раньше строк, пустые значения в конце."""
+
+    if value is None or value == "":
+        return (2, 0.0, "")
+    if isinstance(value, (int, float)):
+        return (0, float(value), "")
+    return (1, 0.0, str(value).casefold())
+
+
+class VirtualTreeview(ttk.Frame):
+    """Таблица, которая материализует только видимые строки."""
+
+    def __init__(
+        self,
+        parent: tk.Widget,
+        *,
+        columns: Sequence[Tuple[str, str]],
+        height: int = 8,
+        column_width: int = 100,
+        selectmode: str = "browse",
+        sortable: bool = True,
+    ) -> None:
+        super().__init__(parent)
+        self._columns = [col for col, _ in columns]
+        self._headings = dict(columns)
+        self._rows: Dict[Hashable, RowValues] = {}
+        # все ключи в порядке сортировки и отфильтрованное окно поверх них
+        self._sorted: List[Hashable] = []
+        self._order: List[Hashable] = []
+        self._sort_column = 0
+        self._sort_reverse = False
+        self._filter: Optional[RowFilter] = None
+        self._selected: Set[Hashable] = set()
+        # выделение слотов, выставленное _render: <<TreeviewSelect>> от него
+        # приходит позже, уже после выхода из _render
+        self._rendering = False
+        self._rendered_selection: Tuple[str, ...] = ()
+        self._top = 0
+        self._slots: List[str] = []
+        self._sortable = sortable
+        self._editable: Set[str] = set()
+        self._on_commit: Optional[CellCommit] = None
+        self._edit_choices: Optional[CellChoices] = None
+        self._editor: Optional[Tuple[tk.Widget, Hashable, str, tk.StringVar]] = None
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=self._columns,
+            show="headings",
+            height=height,
+            selectmode=selectmode,
+        )
+        for col in self._columns:
+            if sortable:
+                self.tree.heading(col, command=lambda c=col: self._on_heading(c))
+            self.tree.column(col, width=column_width, anchor="center")
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self._resize_slots(height)
+        self._update_headings()
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda _e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda _e: self.scroll(3))
+        self.tree.bind("<Up>", lambda _e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda _e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda _e: self._move_selection(-len(self._slots)))
+        self.tree.bind("<Next>", lambda _e: self._move_selection(len(self._slots)))
+
+    # ------------------------------------------------------------------
+    # модель
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def keys(self) -> List[Hashable]:
+        """Ключи видимых (прошедших фильтр) строк в порядке отображения."""
+
+        return self._order[::-1] if self._sort_reverse else list(self._order)
+
+    def values(self, key: Hashable) -> RowValues:
+        return self._rows[key]
+
+    def set_rows(self, rows: Mapping[Hashable, Sequence[object]]) -> None:
+        """Полностью заменяет содержимое таблицы."""
+
+        self.finish_edit()
+        self._rows = {key: tuple(values) for key, values in rows.items()}
+        self._selected &= self._rows.keys()
+        self._resort()
+
+    def apply(
+        self,
+        upserts: Optional[Mapping[Hashable, Sequence[object]]] = None,
+        deletes: Iterable[Hashable] = (),
+    ) -> None:
+        """Применяет дифф: вставляет/обновляет ``upserts`` и удаляет ``deletes``."""
+
+        self.finish_edit()
+        upserts = upserts or {}
+        deletes = [key for key in deletes if key in self._rows]
+        if not upserts and not deletes:
+            return
+        if len(upserts) + len(deletes) > max(32, len(self._rows) // 8):
+            # крупный дифф дешевле применить одной пересортировкой
+            for key in deletes:
+                del self._rows[key]
+            for key, values in upserts.items():
+                self._rows[key] = tuple(values)
+            self._selected &= self._rows.keys()
+            self._resort()
+            return
+        for key in deletes:
+            self._detach(key)
+            del self._rows[key]
+            self._selected.discard(key)
+        for key, values in upserts.items():
+            if key in self._rows:
+                self._detach(key)
+            self._rows[key] = tuple(values)
+            self._attach(key)
+        self._render()
+
+    def upsert(self, key: Hashable, values: Sequence[object]) -> None:
+        self.apply({key: values})
+
+    def delete(self, key: Hashable) -> None:
+        self.apply(deletes=[key])
+
+    def sort_by(self, column: str, reverse: bool = False) -> None:
+        column_index = self._columns.index(column)
+        resort = column_index != self._sort_column
+        self._sort_column = column_index
+        self._sort_reverse = reverse
+        self._update_headings()
+        if resort:
+            self._resort()
+        else:
+            # смена направления не требует пересортировки: меняется только
+            # порядок чтения списка
+            self._render()
+
+    def set_filter(self, predicate: Optional[RowFilter]) -> None:
+        """Задаёт фильтр строк; ``None`` показывает все строки."""
+
+        self._filter = predicate
+        self._order = [key for key in self._sorted if self._passes(key)]
+        self._top = 0
+        self._render()
+
+    def _sort_key(self, key: Hashable) -> tuple:
+        return (_sort_value(self._rows[key][self._sort_column]), str(key))
+
+    def _passes(self, key: Hashable) -> bool:
+        return self._filter is None or self._filter(key, self._rows[key])
+
+    def _resort(self) -> None:
+        # списки всегда хранятся по возрастанию, обратный порядок учитывается
+        # при отображении
+        self._sorted = sorted(self._rows, key=self._sort_key)
+        self._order = [key for key in self._sorted if self._passes(key)]
+        self._render()
+
+    def _index(self, keys: List[Hashable], key: Hashable) -> int:
+        """Позиция ``key`` в отсортированном списке ``keys`` (или -1)."""
+
+        idx = bisect_left(keys, self._sort_key(key), key=self._sort_key)
+        if idx < len(keys) and keys[idx] == key:
+            return idx
+        return -1
+
+    def _view_index(self, order_index: int) -> int:
+        """Переводит позицию в ``_order`` в позицию на экране."""
+
+        if self._sort_reverse:
+            return len(self._order) - 1 - order_index
+        return order_index
+
+    def _view_key(self, view_index: int) -> Hashable:
+        if self._sort_reverse:
+            return self._order[len(self._order) - 1 - view_index]
+        return self._order[view_index]
+
+    def _detach(self, key: Hashable) -> None:
+        idx = self._index(self._sorted, key)
+        if idx >= 0:
+            del self._sorted[idx]
+        idx = self._index(self._order, key)
+        if idx >= 0:
+            if self._view_index(idx) < self._top:
+                self._top -= 1
+            del self._order[idx]
+
+    def _attach(self, key: Hashable) -> None:
+        insort(self._sorted, key, key=self._sort_key)
+        if not self._passes(key):
+            return
+        insort(self._order, key, key=self._sort_key)
+        if self._view_index(self._index(self._order, key)) < self._top:
+            self._top += 1
+
+    # ------------------------------------------------------------------
+    # выделение
+    # ------------------------------------------------------------------
+    def selection(self) -> List[Hashable]:
+        """Выделенные ключи в порядке отображения."""
+
+        return [key for key in self.keys() if key in self._selected]
+
+    def selection_set(self, keys: Iterable[Hashable]) -> None:
+        self._selected = {key for key in keys if key in self._rows}
+        self._render()
+
+    def see(self, key: Hashable) -> None:
+        """Прокручивает таблицу так, чтобы строка ``key`` была видна."""
+
+        if key not in self._rows:
+            return
+        idx = self._index(self._order, key)
+        if idx < 0:
+            return
+        view_idx = self._view_index(idx)
+        if view_idx < self._top:
+            self._top = view_idx
+        elif view_idx >= self._top + len(self._slots):
+            self._top = view_idx - len(self._slots) + 1
+        self._render()
+
+    def _on_select(self, _event: tk.Event) -> None:
+        slots = tuple(self.tree.selection())
+        if self._rendering or slots == self._rendered_selection:
+            # событие от отрисовки окна, а не от пользователя
+            return
+        self._rendered_selection = slots
+        # выделение меняется только у видимых строк, невидимые остаются выделенными
+        visible = self._visible_keys()
+        chosen = {visible[self._slots.index(slot)] for slot in slots}
+        self._selected = (self._selected - set(visible)) | chosen
+
+    def _move_selection(self, step: int) -> str:
+        if not self._order:
+            return "break"
+        current = [key for key in self._selected if key in self._rows]
+        view_idx = -1
+        if current:
+            idx = self._index(self._order, current[0])
+            if idx >= 0:
+                view_idx = self._view_index(idx)
+        view_idx = max(0, min(view_idx + step, len(self._order) - 1))
+        key = self._view_key(view_idx)
+        self._selected = {key}
+        self.see(key)
+        self.tree.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    # ------------------------------------------------------------------
+    # отрисовка
+    # ------------------------------------------------------------------
+    def _visible_keys(self) -> List[Hashable]:
+        stop = min(self._top + len(self._slots), len(self._order))
+        return [self._view_key(idx) for idx in range(self._top, stop)]
+
+    def _resize_slots(self, count: int) -> None:
+        count = max(1, count)
+        while len(self._slots) < count:
+            self._slots.append(self.tree.insert("", "end", iid=f"slot{len(self._slots)}"))
+        while len(self._slots) > count:
+            self.tree.delete(self._slots.pop())
+
+    def _render(self) -> None:
+        max_top = max(0, len(self._order) - len(self._slots))
+        self._top = max(0, min(self._top, max_top))
+        visible = self._visible_keys()
+        selected_slots = []
+        for pos, slot in enumerate(self._slots):
+            if pos < len(visible):
+                key = visible[pos]
+                self.tree.reattach(slot, "", pos)
+                self.tree.item(slot, values=self._rows[key])
+                if key in self._selected:
+                    selected_slots.append(slot)
+            else:
+                self.tree.detach(slot)
+        self._rendering = True
+        try:
+            self.tree.selection_set(selected_slots)
+        finally:
+            self._rendering = False
+        self._rendered_selection = tuple(selected_slots)
+        total = len(self._order)
+        if total:
+            self.scrollbar.set(self._top / total, (self._top + len(visible)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int) -> None:
+        self.finish_edit()
+        self._top += rows
+        self._render()
+
+    def _on_scrollbar(self, action: str, value: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self.finish_edit()
+            self._top = int(round(float(value) * len(self._order)))
+            self._render()
+        elif action == "scroll":
+            step = len(self._slots) if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_mousewheel(self, event: tk.Event) -> str:
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_configure(self, event: tk.Event) -> None:
+        bbox = self.tree.bbox(self._slots[0]) if self._slots else ""
+        if not bbox:
+            return
+        _x, top, _w, row_height = bbox
+        if row_height <= 0:
+            return
+        count = max(1, (event.height - top) // row_height)
+        if count != len(self._slots):
+            self._resize_slots(count)
+            self._render()
+
+    def _on_heading(self, column: str) -> None:
+        same = self._columns[self._sort_column] == column
+        self.sort_by(column, reverse=not self._sort_reverse if same else False)
+
+    def _update_headings(self) -> None:
+        for idx, col in enumerate(self._columns):
+            text = self._headings[col]
+            if self._sortable and idx == self._sort_column:
+                text += " ▼" if self._sort_reverse else " ▲"
+            self.tree.heading(col, text=text)
+
+    # ------------------------------------------------------------------
+    # редактирование ячеек и вставка из буфера обмена
+    # ------------------------------------------------------------------
+    def enable_editing(
+        self,
+        columns: Iterable[str],
+        on_commit: CellCommit,
+        choices: Optional[CellChoices] = None,
+    ) -> None:
+        """Разрешает редактирование ячеек ``columns`` на месте.
+
+        ``on_commit(key, column, text)`` получает введённый текст и сам
+        обновляет модель (например, через ``upsert``).  ``choices`` может
+        вернуть список значений — тогда вместо поля ввода показывается
+        выпадающий список.
+        """
+
+        self._editable = set(columns)
+        self._on_commit = on_commit
+        self._edit_choices = choices
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<F2>", lambda _e: self._edit_selected())
+        self.tree.bind("<Return>", lambda _e: self._edit_selected())
+
+    def bind_paste(self, callback: Callable[[List[List[str]]], None]) -> None:
+        """Передаёт ``callback`` вставленный текст, разобранный как TSV."""
+
+        def on_paste(_event: tk.Event) -> str:
+            try:
+                text = self.clipboard_get()
+            except tk.TclError:
+                return "break"
+            rows = [line.split("\t") for line in text.splitlines()]
+            while rows and not any(cell.strip() for cell in rows[-1]):
+                rows.pop()
+            if rows:
+                callback(rows)
+            return "break"
+
+        self.tree.bind("<<Paste>>", on_paste)
+        add_hotkeys(self.tree)
+
+    def edit_cell(self, key: Hashable, column: str) -> None:
+        """Открывает редактор поверх ячейки ``column`` строки ``key``."""
+
+        if column not in self._editable or key not in self._rows:
+            return
+        self.finish_edit()
+        self.see(key)
+        visible = self._visible_keys()
+        if key not in visible:
+            return
+        slot = self._slots[visible.index(key)]
+        bbox = self.tree.bbox(slot, column)
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        var = tk.StringVar(value=str(self._rows[key][self._columns.index(column)]))
+        choices = self._edit_choices(key, column) if self._edit_choices else None
+        if choices is None:
+            editor: tk.Widget = ttk.Entry(self.tree, textvariable=var)
+            editor.select_range(0, tk.END)
+            editor.bind("<FocusOut>", lambda _e: self.finish_edit())
+        else:
+            editor = ttk.Combobox(self.tree, textvariable=var, values=list(choices), state="readonly")
+            editor.bind("<<ComboboxSelected>>", lambda _e: self.finish_edit())
+        editor.bind("<Return>", lambda _e: self._finish_and_refocus(True))
+        editor.bind("<Escape>", lambda _e: self._finish_and_refocus(False))
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        self._editor = (editor, key, column, var)
+
+    def finish_edit(self, commit: bool = True) -> None:
+        """Закрывает открытый редактор ячейки, при ``commit`` — сохраняя значение."""
+
+        if self._editor is None:
+            return
+        editor, key, column, var = self._editor
+        self._editor = None
+        text = var.get()
+        editor.destroy()
+        if commit and self._on_commit is not None and key in self._rows:
+            self._on_commit(key, column, text)
+
+    def _finish_and_refocus(self, commit: bool) -> str:
+        self.finish_edit(commit)
+        self.tree.focus_set()
+        return "break"
+
+    def _on_double_click(self, event: tk.Event) -> str:
+        slot = self.tree.identify_row(event.y)
+        column_id = self.tree.identify_column(event.x)
+        if not slot or not column_id:
+            return "break"
+        view_idx = self._top + self._slots.index(slot)
+        if view_idx >= len(self._order):
+            return "break"
+        column = self._columns[int(column_id.lstrip("#")) - 1]
+        self.edit_cell(self._view_key(view_idx), column)
+        return "break"
+
+    def _edit_selected(self) -> str:
+        selection = self.selection()
+        if selection:
+            editable = [col for col in self._columns if col in self._editable]
+            if editable:
+                self.edit_cell(selection[0], editable[0])
+        return "break"